@@ -0,0 +1,57 @@
+"""
+Compare two benchmark result files written by benchmarks.run:
+
+    python -m benchmarks.compare baseline.json results.json --threshold 1.2
+
+Exits with status 1 if any benchmark got slower than threshold x baseline.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+
+def _load(path: str) -> Dict[Tuple[str, int], float]:
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {
+        (result["benchmark"], result["repos"]): result["seconds"]
+        for result in report["results"]
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Ratio current/baseline above which a benchmark counts as a regression.",
+    )
+    args = parser.parse_args()
+
+    baseline = _load(args.baseline)
+    current = _load(args.current)
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys()):
+        name, repos = key
+        if baseline[key]:
+            ratio = current[key] / baseline[key]
+        else:
+            ratio = 1.0 if not current[key] else float("inf")
+        flag = ""
+        if ratio > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{name:<20} {repos:>6} repos  {baseline[key]:8.3f}s -> "
+            f"{current[key]:8.3f}s  x{ratio:.2f}{flag}"
+        )
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
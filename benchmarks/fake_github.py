@@ -0,0 +1,380 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+STAR_MEDIA_TYPE = "application/vnd.github.star+json"
+_LISTING = re.compile(r"^/(users|orgs)/([^/]+)/(starred|repos)$")
+_REPO = re.compile(r"^/repos/([^/]+)/([^/]+)$")
+_OWNER_AFFILIATIONS = re.compile(r"ownerAffiliations:\s*\[([A-Z_,\s]*)\]")
+_PRIVACY = re.compile(r"privacy:\s*(PUBLIC|PRIVATE)")
+# GitHub's default for the ownerAffiliations argument.
+DEFAULT_OWNER_AFFILIATIONS = ["OWNER", "COLLABORATOR"]
+GRAPHQL_PAGE_SIZE = 100
+
+
+@dataclass
+class FakeGitHubConfig:
+    """
+    Behaviour of the fake API. latency is added to every response;
+    rate_limit requests are allowed per rate_window seconds, after which
+    requests are rejected with 403 until the window resets.
+    """
+
+    latency: float = 0.0
+    rate_limit: int = 1_000_000
+    rate_window: float = 3600.0
+    max_per_page: int = 100
+
+
+@dataclass
+class _RateWindow:
+    remaining: int
+    reset: float
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class FakeGitHub:
+    """
+    Local stand-in for the GitHub REST and GraphQL APIs, serving the listing
+    endpoints StarCloner uses from in-memory repository objects. Requests are
+    answered as if made with the token of the listed user, so GraphQL includes
+    their private repositories (unless filtered by privacy) while REST
+    /users/<user>/repos, like the real API, only ever lists public ones:
+      GET /users/<user>/starred   (plain or star+json media type)
+      GET /users/<user>/repos     (type=owner|member|all)
+      GET /orgs/<org>/repos
+      GET /repos/<owner>/<repo>
+      POST /graphql               (the starredRepositories and repositories
+                                   connections, with ownerAffiliations)
+    REST responses are paginated with Link headers, carry X-RateLimit-*
+    headers and an ETag (If-None-Match is answered with 304), like the real
+    API; GraphQL reports an exhausted rate limit as a RATE_LIMITED error.
+    Use as a context manager; base_url is the value for GITHUB_API_URL.
+    """
+
+    def __init__(self, config: Optional[FakeGitHubConfig] = None) -> None:
+        self.config = config or FakeGitHubConfig()
+        self.starred: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        self.owned: Dict[str, List[Dict[str, Any]]] = {}
+        # user -> (affiliation, repo) for repositories owned by someone else
+        self.affiliated: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._window = _RateWindow(
+            self.config.rate_limit, time.time() + self.config.rate_window
+        )
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def rate_limit_remaining(self) -> int:
+        """
+        Requests left in the current rate-limit window.
+        """
+        with self._window.lock:
+            return self._window.remaining
+
+    def __enter__(self) -> "FakeGitHub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_repositories(self, owner: str, repos: List[Dict[str, Any]]) -> None:
+        """
+        Serve repos from /users/<owner>/repos, /orgs/<owner>/repos and /repos/*.
+        """
+        self.owned.setdefault(owner, []).extend(repos)
+        for repo in repos:
+            self._by_name[repo["full_name"]] = repo
+
+    def add_affiliated_repositories(
+        self, user: str, repos: List[Dict[str, Any]], affiliation: str
+    ) -> None:
+        """
+        Serve repos owned by others that user is affiliated with ("COLLABORATOR"
+        or "ORGANIZATION_MEMBER"): /users/<user>/repos lists them with
+        type=member or type=all, GraphQL with the matching ownerAffiliations.
+        """
+        self.affiliated.setdefault(user, []).extend(
+            (affiliation, repo) for repo in repos
+        )
+        for repo in repos:
+            self._by_name[repo["full_name"]] = repo
+
+    def user_repositories(
+        self, user: str, affiliations: List[str]
+    ) -> List[Dict[str, Any]]:
+        repos = list(self.owned.get(user, [])) if "OWNER" in affiliations else []
+        repos.extend(
+            repo
+            for affiliation, repo in self.affiliated.get(user, [])
+            if affiliation in affiliations
+        )
+        return repos
+
+    def public_user_repositories(
+        self, user: str, affiliations: List[str]
+    ) -> List[Dict[str, Any]]:
+        return [
+            repo
+            for repo in self.user_repositories(user, affiliations)
+            if not repo["private"]
+        ]
+
+    def add_stars(self, user: str, stars: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Serve (starred_at, repo) pairs from /users/<user>/starred, in the given
+        order (the real API lists newest stars first with direction=desc).
+        """
+        self.starred.setdefault(user, []).extend(stars)
+        for _, repo in stars:
+            self._by_name[repo["full_name"]] = repo
+
+    def _take_request(self) -> Tuple[bool, int, float]:
+        """
+        Count a request against the rate limit; returns (allowed, remaining, reset).
+        """
+        window = self._window
+        with window.lock:
+            now = time.time()
+            if now >= window.reset:
+                window.remaining = self.config.rate_limit
+                window.reset = now + self.config.rate_window
+            allowed = window.remaining > 0
+            if allowed:
+                window.remaining -= 1
+            return allowed, window.remaining, window.reset
+
+    def _page(
+        self, items: List[Any], path: str, query: Dict[str, List[str]]
+    ) -> Tuple[List[Any], Optional[str]]:
+        per_page = min(int(query.get("per_page", ["30"])[0]), self.config.max_per_page)
+        page = int(query.get("page", ["1"])[0])
+        last_page = max(1, -(-len(items) // per_page))
+        links = []
+        if page < last_page:
+            url = f"{self.base_url}{path}?per_page={per_page}"
+            links.append(f'<{url}&page={page + 1}>; rel="next"')
+            links.append(f'<{url}&page={last_page}>; rel="last"')
+        start = (page - 1) * per_page
+        return items[start:start + per_page], ", ".join(links) or None
+
+    def _graphql(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Answer the listing queries of fetch_repositories_graphql.
+        """
+        query = request["query"]
+        variables = request.get("variables") or {}
+        login = variables["login"]
+        offset = int(variables.get("cursor") or 0)
+        if "starredRepositories" in query:
+            owner_field, connection_field = "user", "starredRepositories"
+            items = list(self.starred.get(login, []))
+        else:
+            if "organization(" in query:
+                owner_field = "organization"
+                repos = self.owned.get(login, [])
+            else:
+                owner_field = "user"
+                match = _OWNER_AFFILIATIONS.search(query)
+                affiliations = (
+                    re.findall(r"[A-Z_]+", match.group(1))
+                    if match
+                    else DEFAULT_OWNER_AFFILIATIONS
+                )
+                repos = self.user_repositories(login, affiliations)
+                privacy = _PRIVACY.search(query)
+                if privacy:
+                    private = privacy.group(1) == "PRIVATE"
+                    repos = [repo for repo in repos if repo["private"] == private]
+            connection_field = "repositories"
+            items = [
+                (None, repo)
+                for repo in repos
+                if variables.get("isFork") in (None, repo["fork"])
+                and variables.get("isArchived") in (None, repo["archived"])
+            ]
+        page = items[offset : offset + GRAPHQL_PAGE_SIZE]
+        end = offset + len(page)
+        connection: Dict[str, Any] = {
+            "pageInfo": {"hasNextPage": end < len(items), "endCursor": str(end)}
+        }
+        if connection_field == "starredRepositories":
+            connection["edges"] = [
+                {"starredAt": at, "node": _graphql_node(repo)} for at, repo in page
+            ]
+        else:
+            connection["nodes"] = [_graphql_node(repo) for _, repo in page]
+        return {owner_field: {connection_field: connection}}
+
+    def _handler_class(self) -> type:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                with fake._count_lock:
+                    fake.request_count += 1
+                if fake.config.latency:
+                    time.sleep(fake.config.latency)
+                allowed, remaining, reset = fake._take_request()
+                headers = {
+                    "X-RateLimit-Limit": str(fake.config.rate_limit),
+                    "X-RateLimit-Remaining": str(remaining),
+                    "X-RateLimit-Reset": str(int(reset)),
+                }
+                if not allowed:
+                    self._send(403, {"message": "API rate limit exceeded"}, headers)
+                    return
+
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                body: Any
+                listing = _LISTING.match(url.path)
+                repo_match = _REPO.match(url.path)
+                if listing:
+                    kind, name, what = listing.groups()
+                    if what == "starred" and kind == "users":
+                        stars = fake.starred.get(name, [])
+                        if self.headers.get("Accept") == STAR_MEDIA_TYPE:
+                            items = [
+                                {"starred_at": at, "repo": repo} for at, repo in stars
+                            ]
+                        else:
+                            items = [repo for _, repo in stars]
+                    elif what == "repos" and kind == "users":
+                        repo_type = query.get("type", ["owner"])[0]
+                        items = fake.public_user_repositories(
+                            name,
+                            {
+                                "owner": ["OWNER"],
+                                "member": ["COLLABORATOR", "ORGANIZATION_MEMBER"],
+                                "all": ["OWNER", "COLLABORATOR", "ORGANIZATION_MEMBER"],
+                            }[repo_type],
+                        )
+                    elif what == "repos":
+                        items = fake.owned.get(name, [])
+                    else:
+                        self._send(404, {"message": "Not Found"}, headers)
+                        return
+                    body, link = fake._page(items, url.path, query)
+                    if link:
+                        headers["Link"] = link
+                elif repo_match:
+                    body = fake._by_name.get("/".join(repo_match.groups()))
+                    if body is None:
+                        self._send(404, {"message": "Not Found"}, headers)
+                        return
+                else:
+                    self._send(404, {"message": "Not Found"}, headers)
+                    return
+                self._send(200, body, headers)
+
+            def do_POST(self) -> None:
+                with fake._count_lock:
+                    fake.request_count += 1
+                if fake.config.latency:
+                    time.sleep(fake.config.latency)
+                allowed, remaining, reset = fake._take_request()
+                headers = {
+                    "X-RateLimit-Limit": str(fake.config.rate_limit),
+                    "X-RateLimit-Remaining": str(remaining),
+                    "X-RateLimit-Reset": str(int(reset)),
+                }
+                if urlparse(self.path).path != "/graphql":
+                    self._send(404, {"message": "Not Found"}, headers)
+                    return
+                length = int(self.headers.get("Content-Length", "0"))
+                request = json.loads(self.rfile.read(length))
+                if not allowed:
+                    error = {
+                        "type": "RATE_LIMITED",
+                        "message": "API rate limit exceeded",
+                    }
+                    self._send(200, {"errors": [error]}, headers)
+                    return
+                self._send(200, {"data": fake._graphql(request)}, headers)
+
+            def _send(self, status: int, body: Any, headers: Dict[str, str]) -> None:
+                data = json.dumps(body).encode("utf-8")
+                etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    status, data = 304, b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                if status in (200, 304):
+                    self.send_header("ETag", etag)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def _graphql_node(repo: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The GraphQL Repository fields StarCloner requests, for a REST repo object.
+    """
+    return {
+        "databaseId": repo["id"],
+        "nameWithOwner": repo["full_name"],
+        "url": repo["clone_url"].removesuffix(".git"),
+        "stargazerCount": repo["stargazers_count"],
+        "owner": {"login": repo["owner"]["login"]},
+        "pushedAt": repo["pushed_at"],
+        "diskUsage": repo["size"],
+        "defaultBranchRef": (
+            {"name": repo["default_branch"]} if repo["default_branch"] else None
+        ),
+        "isFork": repo["fork"],
+    }
+
+
+def repo_object(
+    owner: str,
+    name: str,
+    clone_url: str,
+    repo_id: int,
+    stargazers_count: int = 0,
+    size: int = 0,
+    pushed_at: str = "2024-01-01T00:00:00Z",
+) -> Dict[str, Any]:
+    """
+    A repository object with the fields StarCloner reads from the REST API.
+    """
+    return {
+        "id": repo_id,
+        "full_name": f"{owner}/{name}",
+        "clone_url": clone_url,
+        "stargazers_count": stargazers_count,
+        "owner": {"login": owner},
+        "pushed_at": pushed_at,
+        "size": size,
+        "default_branch": "main",
+        "fork": False,
+        "archived": False,
+        "private": False,
+    }
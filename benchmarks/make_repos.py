@@ -0,0 +1,58 @@
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import List
+
+_GIT_ENV = {
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+}
+
+
+def _git(*args: str, cwd: Path) -> None:
+    subprocess.run(
+        ["git", *args],
+        cwd=str(cwd),
+        env={**os.environ, **_GIT_ENV},
+        check=True,
+        capture_output=True,
+    )
+
+
+def make_template_repo(path: Path, commits: int, file_size: int) -> Path:
+    """
+    Create a bare repository with `commits` commits, each rewriting a file of
+    file_size bytes (of incompressible data, so packs have a realistic size).
+    """
+    work = path.with_name(f"{path.name}.work")
+    work.mkdir(parents=True)
+    _git("init", "-q", "-b", "main", cwd=work)
+    for n in range(commits):
+        (work / "data.bin").write_bytes(os.urandom(file_size))
+        (work / "README").write_text(f"commit {n}\n", encoding="utf-8")
+        _git("add", "-A", cwd=work)
+        _git("commit", "-q", "-m", f"commit {n}", cwd=work)
+    _git("clone", "-q", "--bare", str(work), str(path), cwd=work.parent)
+    shutil.rmtree(work)
+    return path
+
+
+def make_bare_repos(
+    root: Path, count: int, commits: int = 5, file_size: int = 4096
+) -> List[Path]:
+    """
+    Create count bare repositories root/owner<k>/repo<n>.git with the same
+    history. Only one repository is built with git; the rest are file copies
+    of it, so that 10k repositories can be generated in reasonable time.
+    """
+    template = make_template_repo(root / ".template.git", commits, file_size)
+    paths = []
+    for n in range(count):
+        path = root / f"owner{n % 100}" / f"repo{n}.git"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copytree(template, path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,133 @@
+"""
+Memory benchmark of turning listing pages into RepoInfo objects. Usage:
+
+    python -m benchmarks.memory --repos 100000
+
+It compares the previous approach (json.loads of each page, a regular
+dataclass per repository) with the current one (items decoded one at a
+time, slotted RepoInfo with interned owner and branch names) and reports
+the peak and retained Python heap measured with tracemalloc.
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from benchmarks.fake_github import repo_object
+from functions.repo_info_from_api import repo_info_from_api
+from pytypes.api_response import ApiResponse
+
+PER_PAGE = 100
+
+
+@dataclass
+class _DictRepoInfo:
+    """
+    The RepoInfo layout before it used slots and interning.
+    """
+
+    full_name: str
+    clone_url: str
+    stargazers_count: int
+    owner_name: str
+    repo_id: Optional[int] = None
+    pushed_at: Optional[str] = None
+    size: Optional[int] = None
+    default_branch: Optional[str] = None
+    fork: bool = False
+
+
+def _make_pages(repos: int, repos_per_owner: int) -> List[str]:
+    items = [
+        repo_object(
+            owner=f"owner{n // repos_per_owner}",
+            name=f"repo{n}",
+            clone_url=f"https://github.com/owner{n // repos_per_owner}/repo{n}.git",
+            repo_id=n,
+            stargazers_count=n % 1000,
+            size=n % 5000,
+        )
+        for n in range(repos)
+    ]
+    return [
+        json.dumps(items[start : start + PER_PAGE])
+        for start in range(0, repos, PER_PAGE)
+    ]
+
+
+def _previous(pages: List[str]) -> List[Any]:
+    repos = []
+    for page in pages:
+        for item in json.loads(page):
+            repos.append(
+                _DictRepoInfo(
+                    full_name=item["full_name"],
+                    clone_url=item["clone_url"],
+                    stargazers_count=item["stargazers_count"],
+                    owner_name=item["owner"]["login"],
+                    repo_id=item.get("id"),
+                    pushed_at=item.get("pushed_at"),
+                    size=item.get("size"),
+                    default_branch=item.get("default_branch"),
+                    fork=item.get("fork", False),
+                )
+            )
+    return repos
+
+
+def _current(pages: List[str]) -> List[Any]:
+    return [
+        repo_info_from_api(item)
+        for page in pages
+        for item in ApiResponse(page).iter_items()
+    ]
+
+
+def _measure(build: Callable[[List[str]], List[Any]], pages: List[str]) -> Dict:
+    gc.collect()
+    tracemalloc.start()
+    repos = build(pages)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"repos": len(repos), "peak_bytes": peak, "retained_bytes": retained}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the RepoInfo memory benchmark.")
+    parser.add_argument(
+        "--repos", type=int, default=100_000, help="Number of repositories listed."
+    )
+    parser.add_argument(
+        "--repos-per-owner",
+        type=int,
+        default=50,
+        help="Repositories per owner (owner names are shared, so they are interned).",
+    )
+    parser.add_argument(
+        "--output", "-o", default=None, help="Write the results to this JSON file."
+    )
+    args = parser.parse_args()
+
+    pages = _make_pages(args.repos, args.repos_per_owner)
+    results = {
+        "previous": _measure(_previous, pages),
+        "current": _measure(_current, pages),
+    }
+    for name, result in results.items():
+        print(
+            f"  {name:<10} {result['repos']:>7} repos  "
+            f"peak {result['peak_bytes'] / 2**20:8.1f} MiB  "
+            f"retained {result['retained_bytes'] / 2**20:8.1f} MiB  "
+            f"({result['retained_bytes'] / max(result['repos'], 1):.0f} B/repo)"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
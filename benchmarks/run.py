@@ -0,0 +1,203 @@
+"""
+Offline benchmarks of StarCloner against a fake GitHub API and local bare
+repositories. Usage:
+
+    python -m benchmarks.run --sizes 100,1000,10000 --output results.json
+    python -m benchmarks.compare baseline.json results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from argparse import Namespace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+from benchmarks.fake_github import FakeGitHub, FakeGitHubConfig, repo_object
+from benchmarks.make_repos import make_bare_repos
+from functions.fetch_org_repositories import fetch_org_repositories
+from functions.fetch_starred_repositories import fetch_starred_repositories
+from functions.fetch_user_repositories import fetch_user_repositories
+from functions.filter_repositories import filter_repositories
+from functions.github_client import GitHubClient
+from functions.http_cache import HttpCache
+from functions.process_repositories import process_repositories
+from functions.scan_cloned_repositories import INDEX_NAME, scan_cloned_repositories
+from pytypes.repo_result import RepoStatus
+
+BENCHMARKS = [
+    "listing",
+    "listing-cached",
+    "filter",
+    "clone-cold",
+    "pull-warm",
+    "list-cloned",
+]
+
+
+def _timed(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        value = fn()
+    return time.perf_counter() - start, value
+
+
+def _populate(fake: FakeGitHub, bare_repos: List[Path]) -> None:
+    repos = [
+        repo_object(
+            owner=path.parent.name,
+            name=path.name.removesuffix(".git"),
+            clone_url=path.as_uri(),
+            repo_id=n + 1,
+            stargazers_count=n % 1000,
+            size=n % 5000,
+        )
+        for n, path in enumerate(bare_repos)
+    ]
+    fake.add_repositories("bench", repos)
+    fake.add_repositories("bench-org", repos)
+    stars = [(f"2024-01-01T00:00:{n % 60:02d}Z", repo) for n, repo in enumerate(repos)]
+    fake.add_stars("bench", stars)
+
+
+def run_size(
+    args: argparse.Namespace, size: int, work_dir: Path
+) -> List[Dict[str, Any]]:
+    """
+    Run the selected benchmarks for one repository count inside work_dir.
+    """
+    results: List[Dict[str, Any]] = []
+
+    def record(name: str, seconds: float, **extra: Any) -> None:
+        results.append(
+            {"benchmark": name, "repos": size, "seconds": round(seconds, 6), **extra}
+        )
+        print(f"  {name:<20} {size:>6} repos  {seconds:8.3f}s  {extra or ''}")
+
+    selected = set(args.only.split(",")) if args.only else set(BENCHMARKS)
+    bare_repos = make_bare_repos(
+        work_dir / "remote", size, commits=args.commits, file_size=args.file_size
+    )
+    config = FakeGitHubConfig(latency=args.latency, rate_limit=args.rate_limit)
+    with FakeGitHub(config) as fake:
+        _populate(fake, bare_repos)
+
+        repos = []
+        if selected & {"listing", "filter", "clone-cold", "pull-warm", "list-cloned"}:
+            for kind, fetch in (
+                ("star", lambda c: fetch_starred_repositories("bench", c)),
+                ("repo", lambda c: fetch_user_repositories("bench", c, True, True)),
+                ("org", lambda c: fetch_org_repositories("bench-org", c, True, True)),
+            ):
+                with GitHubClient(None, base_url=fake.base_url) as client:
+                    before = fake.request_count
+                    seconds, listed = _timed(lambda: fetch(client))
+                if "listing" in selected:
+                    record(
+                        f"listing-{kind}", seconds, requests=fake.request_count - before
+                    )
+                if kind == "star":
+                    repos = listed
+
+        if "listing-cached" in selected:
+            cache = HttpCache(work_dir / "http-cache")
+            with GitHubClient(None, base_url=fake.base_url, cache=cache) as client:
+                fetch_starred_repositories("bench", client)
+            with GitHubClient(None, base_url=fake.base_url, cache=cache) as client:
+                seconds, _ = _timed(lambda: fetch_starred_repositories("bench", client))
+            record("listing-cached", seconds)
+
+    if "filter" in selected:
+        filter_args = Namespace(
+            command="star", min_stars=100, max_stars=900, owner_filter=None
+        )
+        # Best of several rounds; a single pass is too short to time reliably.
+        seconds = min(
+            _timed(lambda: filter_repositories(filter_args, repos))[0] for _ in range(5)
+        )
+        record("filter", seconds)
+
+    output_dir = work_dir / "clones"
+    if "clone-cold" in selected or "pull-warm" in selected:
+        seconds, cloned = _timed(
+            lambda: process_repositories(repos, output_dir, False, jobs=args.jobs)
+        )
+        failed = sum(1 for r in cloned if r.status is RepoStatus.FAILED)
+        if "clone-cold" in selected:
+            record("clone-cold", seconds, jobs=args.jobs, failed=failed)
+        if "pull-warm" in selected:
+            seconds, pulled = _timed(
+                lambda: process_repositories(repos, output_dir, False, jobs=args.jobs)
+            )
+            failed = sum(1 for r in pulled if r.status is RepoStatus.FAILED)
+            record("pull-warm", seconds, jobs=args.jobs, failed=failed)
+
+    if "list-cloned" in selected and output_dir.is_dir():
+        (output_dir / INDEX_NAME).unlink(missing_ok=True)
+        seconds, _ = _timed(lambda: scan_cloned_repositories(output_dir))
+        record("list-cloned-cold", seconds)
+        seconds, _ = _timed(lambda: scan_cloned_repositories(output_dir))
+        record("list-cloned-indexed", seconds)
+    return results
+
+
+def _git_version() -> str:
+    completed = subprocess.run(["git", "--version"], capture_output=True, text=True)
+    return completed.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the StarCloner benchmarks.")
+    parser.add_argument(
+        "--sizes", default="100,1000,10000", help="Comma-separated repository counts."
+    )
+    parser.add_argument(
+        "--only",
+        default=None,
+        help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}.",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Fake API latency per request (s)."
+    )
+    parser.add_argument(
+        "--rate-limit", type=int, default=5000, help="Fake API requests per hour."
+    )
+    parser.add_argument("--jobs", "-j", type=int, default=8, help="Clone/pull workers.")
+    parser.add_argument("--commits", type=int, default=5, help="Commits per repository.")
+    parser.add_argument(
+        "--file-size", type=int, default=4096, help="Bytes written per commit."
+    )
+    parser.add_argument(
+        "--output", "-o", default=None, help="Write the results to this JSON file."
+    )
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        print(f"{size} repositories:")
+        with tempfile.TemporaryDirectory(prefix="starcloner-bench-") as temp_dir:
+            results.extend(run_size(args, size, Path(temp_dir)))
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git": _git_version(),
+            "params": {
+                key: value for key, value in vars(args).items() if key != "output"
+            },
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Startup benchmark of the StarCloner command line. Usage:
+
+    python -m benchmarks.startup --runs 20 --output startup.json
+    python -m benchmarks.compare baseline.json startup.json
+
+Each command is run in a fresh interpreter. The median wall time is
+reported, together with the number of imported modules and whether the
+network stack (requests) was loaded, which local commands must never do.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+# Runs main() like starcloner.py and reports what it imported.
+_PROBE = """
+import sys
+sys.argv = ["starcloner"] + sys.argv[1:]
+from functions.main import main
+try:
+    main()
+except SystemExit:
+    pass
+print("@@", len(sys.modules), "requests" in sys.modules, file=sys.stderr)
+"""
+NETWORK_FREE = ["list-cloned", "maintenance-optimize", "maintenance-move-temp-files"]
+
+
+def _commands(work_dir: Path) -> Dict[str, List[str]]:
+    return {
+        "import-main": [sys.executable, "-c", "import functions.main"],
+        "help": [sys.executable, "-c", _PROBE, "--help"],
+        "list-cloned": [
+            sys.executable,
+            "-c",
+            _PROBE,
+            "list-cloned",
+            "-o",
+            str(work_dir),
+        ],
+        "maintenance-optimize": [
+            sys.executable,
+            "-c",
+            _PROBE,
+            "maintenance",
+            "optimize",
+            "-o",
+            str(work_dir),
+            "--dry-run",
+        ],
+        "maintenance-move-temp-files": [
+            sys.executable,
+            "-c",
+            _PROBE,
+            "maintenance",
+            "move-temp-files",
+            str(work_dir),
+            "--dry-run",
+        ],
+        "star-help": [sys.executable, "-c", _PROBE, "star", "--help"],
+    }
+
+
+def _run(command: List[str]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    probe = [line for line in completed.stderr.splitlines() if line.startswith("@@")]
+    modules, network = (probe[0].split()[1:] if probe else (None, None))
+    return {
+        "seconds": seconds,
+        "modules": int(modules) if modules else None,
+        "requests_loaded": network == "True" if network else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the startup benchmark.")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command.")
+    parser.add_argument(
+        "--output", "-o", default=None, help="Write the results to this JSON file."
+    )
+    args = parser.parse_args()
+
+    results = []
+    failed = False
+    with tempfile.TemporaryDirectory(prefix="starcloner-startup-") as temp_dir:
+        for name, command in _commands(Path(temp_dir)).items():
+            runs = [_run(command) for _ in range(args.runs)]
+            seconds = statistics.median(run["seconds"] for run in runs)
+            last = runs[-1]
+            results.append(
+                {
+                    "benchmark": f"startup-{name}",
+                    "repos": 0,
+                    "seconds": round(seconds, 6),
+                    "modules": last["modules"],
+                    "requests_loaded": last["requests_loaded"],
+                }
+            )
+            flag = ""
+            if name in NETWORK_FREE and last["requests_loaded"]:
+                flag = "  LOADS requests"
+                failed = True
+            print(
+                f"  {name:<28} {seconds * 1000:8.1f} ms  "
+                f"{last['modules'] or '-':>5} modules{flag}"
+            )
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps({"results": results}, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"Results written to {args.output}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
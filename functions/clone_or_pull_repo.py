@@ -1,37 +1,153 @@
+import shutil
 import subprocess
+import time
 from pathlib import Path
+from typing import List, Optional
+from pytypes.clone_options import CloneOptions
 from pytypes.repo_info import RepoInfo
+from pytypes.repo_result import RepoResult, RepoStatus
+from functions.local_repo_path import local_repo_path
+from functions.trace_recorder import trace_span
 
 
-def clone_or_pull_repo(repo: RepoInfo, target_dir: Path, dry_run: bool) -> None:
+def partial_clone_path(local_path: Path) -> Path:
+    """
+    Temporary directory a new clone is written to before it is renamed into
+    place, e.g. <owner>/.<repo>.partial. A leftover one is an interrupted clone.
+    """
+    return local_path.with_name(f".{local_path.name}.partial")
+
+
+def _clone_args(options: CloneOptions) -> List[str]:
+    args = []
+    if options.mirror:
+        # A mirror carries every ref, so depth and single-branch don't apply.
+        args.append("--mirror")
+    elif options.depth is not None:
+        args.append(f"--depth={options.depth}")
+    if options.filter is not None:
+        args.append(f"--filter={options.filter}")
+    if options.single_branch and not options.mirror:
+        args.append("--single-branch")
+    return args
+
+
+def _update_commands(
+    local_path: Path, options: CloneOptions, branch: Optional[str]
+) -> List[List[str]]:
+    git = ["git", "-C", str(local_path)]
+    if options.mirror:
+        return [[*git, "remote", "update", "--prune"]]
+    # The partial clone filter and single-branch refspec are kept in the
+    # repository's config by git itself.
+    if options.depth is None:
+        return [[*git, "pull"]]
+    # The depth only applies to new clones. Fetching with --depth again would
+    # turn a full clone shallow, and once upstream has moved more than depth
+    # commits the new tip no longer connects to the local history. A plain
+    # fetch of a shallow clone only adds the new commits and never deepens
+    # it past its shallow boundary; the fast-forward refuses to overwrite
+    # local commits.
+    return [
+        [*git, "fetch", "origin", branch or "HEAD"],
+        [*git, "merge", "--ff-only", "FETCH_HEAD"],
+    ]
+
+
+def clone_or_pull_repo(
+    repo: RepoInfo,
+    target_dir: Path,
+    dry_run: bool,
+    capture_output: bool = False,
+    options: Optional[CloneOptions] = None,
+    reference: Optional[Path] = None,
+) -> RepoResult:
     """
     Clone or pull a repository into target_dir.
       - If the directory doesn't exist, perform a clone.
-      - If it exists, perform a 'git pull'.
+      - If it exists, perform a 'git pull' (or 'git remote update --prune'
+        for a bare mirror).
+    When capture_output is True, git's output is collected into the result
+    instead of being written to the terminal (used by the parallel worker pool).
+    options selects shallow (--depth), partial (--filter) and single-branch
+    clones; with a depth, updates fetch the remote branch and fast-forward to
+    it, which adds the new commits without deepening a shallow clone (or
+    making a full clone shallow). With options.mirror, a bare mirror without
+    a working tree is kept in <owner>/<repo>.git.
+    A new clone borrows objects from the reference repository, if given,
+    through git alternates (git clone --reference).
+    New clones are written to a temporary directory and renamed into place
+    once git has finished, so an interrupted clone never looks like a
+    complete one; a leftover temporary directory is removed before cloning.
     """
-    local_repo_dir_name = repo.full_name.split("/")[-1]
-    user_or_org_name = repo.full_name.split("/")[0]
-    local_path = target_dir / user_or_org_name / local_repo_dir_name
+    options = options or CloneOptions()
+    local_path = local_repo_path(repo, target_dir, options.mirror)
+    run_kwargs = {"capture_output": True, "text": True} if capture_output else {}
+    start = time.monotonic()
 
     if local_path.is_dir():
         if dry_run:
             print(
                 f"Dry-run: Would pull in '{local_path}' (Repository: {repo.full_name})"
             )
-        else:
+            return RepoResult(repo.full_name, RepoStatus.SKIPPED, reason="dry-run")
+        if not capture_output:
             print(f"Pulling in '{local_path}' (Repository: {repo.full_name})")
-            subprocess.run(["git", "-C", str(local_path), "pull"], check=False)
+        output = ""
+        for command in _update_commands(local_path, options, repo.default_branch):
+            with trace_span(
+                f"git {command[3]}", "git", repo=repo.full_name
+            ) as span_args:
+                completed = subprocess.run(command, check=False, **run_kwargs)
+                span_args["exit_code"] = completed.returncode
+            if capture_output:
+                output += completed.stderr or ""
+            if completed.returncode != 0:
+                break
+        success_status = RepoStatus.PULLED
     else:
         if dry_run:
             print(
                 f"Dry-run: Would clone {repo.clone_url} into '{target_dir}' "
                 f"(Repository: {repo.full_name})"
             )
-        else:
+            return RepoResult(repo.full_name, RepoStatus.SKIPPED, reason="dry-run")
+        if not capture_output:
             print(
                 f"Cloning {repo.clone_url} into '{target_dir}' (Repository: {repo.full_name})"
             )
-            local_path.parent.mkdir(parents=True, exist_ok=True)
-            subprocess.run(
-                ["git", "clone", repo.clone_url], cwd=str(local_path.parent), check=False
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = partial_clone_path(local_path)
+        if partial_path.exists():
+            shutil.rmtree(partial_path)
+        reference_args = ["--reference", str(reference)] if reference else []
+        with trace_span("git clone", "git", repo=repo.full_name) as span_args:
+            completed = subprocess.run(
+                [
+                    "git",
+                    "clone",
+                    *_clone_args(options),
+                    *reference_args,
+                    repo.clone_url,
+                    partial_path.name,
+                ],
+                cwd=str(local_path.parent),
+                check=False,
+                **run_kwargs,
             )
+            span_args["exit_code"] = completed.returncode
+        output = (completed.stderr or "") if capture_output else ""
+        if completed.returncode == 0:
+            partial_path.rename(local_path)
+        else:
+            shutil.rmtree(partial_path, ignore_errors=True)
+        success_status = RepoStatus.CLONED
+
+    exit_code = completed.returncode
+    return RepoResult(
+        full_name=repo.full_name,
+        status=success_status if exit_code == 0 else RepoStatus.FAILED,
+        exit_code=exit_code,
+        duration=time.monotonic() - start,
+        output=output,
+    )
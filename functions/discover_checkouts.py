@@ -0,0 +1,58 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import List, Optional, Tuple
+from functions.get_github_user_repo_from_config import get_github_user_repo_from_config
+
+Checkout = Tuple[Path, Optional[str], Optional[str]]
+
+
+def _is_bare_repository(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, "HEAD")) and os.path.isdir(
+        os.path.join(path, "objects")
+    )
+
+
+def _scan_dir(path: str) -> Tuple[List[str], List[Checkout]]:
+    subdirs: List[str] = []
+    checkouts: List[Checkout] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # ドットディレクトリ (.objects など) とシンボリックリンクは対象外
+                if entry.name.startswith(".") or not entry.is_dir(follow_symlinks=False):
+                    continue
+                git_dir = os.path.join(entry.path, ".git")
+                if os.path.isdir(git_dir):
+                    config = Path(git_dir) / "config"
+                elif _is_bare_repository(entry.path):
+                    # ベアリポジトリ (ミラーなど) は、ディレクトリ自体が Git ディレクトリ
+                    config = Path(entry.path) / "config"
+                else:
+                    subdirs.append(entry.path)
+                    continue
+                user, repo = get_github_user_repo_from_config(config)
+                checkouts.append((Path(entry.path), user, repo))
+    except OSError as e:
+        print(f"[SKIP] {path} を読み取れませんでした: {e}")
+    return subdirs, checkouts
+
+
+def discover_checkouts(base_dir: Path, jobs: int) -> List[Checkout]:
+    """
+    base_dir 以下を再帰的に走査し、Git チェックアウトを (パス, ユーザー名,
+    リポジトリ名) の一覧で返します。最上位に HEAD と objects/ を持つ
+    ディレクトリはベアリポジトリとして一覧に含めます。
+    ディレクトリの走査と .git/config の解析は jobs 個のスレッドで並列に行い、
+    チェックアウトの中には降りません。
+    """
+    checkouts: List[Checkout] = []
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        pending = {executor.submit(_scan_dir, str(base_dir))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                subdirs, found = future.result()
+                checkouts.extend(found)
+                pending |= {executor.submit(_scan_dir, subdir) for subdir in subdirs}
+    return sorted(checkouts, key=lambda checkout: str(checkout[0]))
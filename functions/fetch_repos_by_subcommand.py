@@ -1,34 +1,125 @@
 import argparse
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from pytypes.repo_info import RepoInfo
-from functions.fetch_starred_repositories import fetch_starred_repositories
-from functions.fetch_user_repositories import fetch_user_repositories
-from functions.fetch_org_repositories import fetch_org_repositories
+from functions.github_client import GitHubClient
+from functions.state_store import StateStore
+from functions.fetch_starred_repositories import (
+    fetch_starred_repositories,
+    iter_starred_repositories,
+)
+from functions.fetch_starred_repositories_incremental import (
+    fetch_starred_repositories_incremental,
+    iter_starred_repositories_incremental,
+)
+from functions.fetch_user_repositories import (
+    fetch_user_repositories,
+    iter_user_repositories,
+)
+from functions.fetch_org_repositories import (
+    fetch_org_repositories,
+    iter_org_repositories,
+)
+from functions.fetch_repositories_graphql import (
+    fetch_repositories_graphql,
+    iter_repositories_graphql,
+)
+
+
+def _use_graphql(args: argparse.Namespace, client: GitHubClient) -> bool:
+    api = getattr(args, "api", "auto")
+    return api == "graphql" or (api == "auto" and client.has_token)
 
 
 def fetch_repos_by_subcommand(
-    args: argparse.Namespace, token: Optional[str]
+    args: argparse.Namespace,
+    client: GitHubClient,
+    state: Optional[StateStore] = None,
 ) -> List[RepoInfo]:
     """
     Fetch the repository list based on the subcommand (star, repo, or org).
+    The GraphQL backend is used when requested with --api graphql, or with
+    --api auto (the default) when an authentication token is available.
+    With a state store, star lists are synced incrementally.
     """
+    use_graphql = _use_graphql(args, client)
+
+    if args.command == "star" and state is not None:
+        return fetch_starred_repositories_incremental(
+            args.username,
+            client,
+            state,
+            use_graphql=use_graphql,
+            full_sync=getattr(args, "full_star_sync", False),
+        )
+    if args.command in ("star", "repo", "org") and use_graphql:
+        return fetch_repositories_graphql(
+            args.command,
+            args.orgname if args.command == "org" else args.username,
+            client,
+            include_forks=getattr(args, "include_forks", True),
+            include_archived=getattr(args, "include_archived", True),
+        )
+
     match args.command:
         case "star":
-            return fetch_starred_repositories(args.username, token)
+            return fetch_starred_repositories(args.username, client)
         case "repo":
             return fetch_user_repositories(
                 username=args.username,
-                token=token,
+                client=client,
                 include_forks=args.include_forks,
                 include_archived=args.include_archived,
             )
         case "org":
             return fetch_org_repositories(
                 orgname=args.orgname,
-                token=token,
+                client=client,
                 include_forks=args.include_forks,
                 include_archived=args.include_archived,
             )
         case _:
             # This should never happen if subcommands are required
             return []
+
+
+def iter_repos_by_subcommand(
+    args: argparse.Namespace,
+    client: GitHubClient,
+    state: Optional[StateStore] = None,
+) -> Iterator[RepoInfo]:
+    """
+    Like fetch_repos_by_subcommand, but yield repositories as each listing page
+    arrives instead of returning the complete list (used by --stream).
+    With a state store, the incremental star sync yields the stars it reads
+    first and the stored ones once the listing has ended.
+    """
+    use_graphql = _use_graphql(args, client)
+
+    if args.command == "star" and state is not None:
+        yield from iter_starred_repositories_incremental(
+            args.username,
+            client,
+            state,
+            use_graphql=use_graphql,
+            full_sync=getattr(args, "full_star_sync", False),
+        )
+    elif args.command in ("star", "repo", "org") and use_graphql:
+        for _, repo in iter_repositories_graphql(
+            args.command,
+            args.orgname if args.command == "org" else args.username,
+            client,
+            include_forks=getattr(args, "include_forks", True),
+            include_archived=getattr(args, "include_archived", True),
+        ):
+            yield repo
+    elif args.command == "star":
+        for _, repo in iter_starred_repositories(args.username, client):
+            yield repo
+    elif args.command == "repo":
+        yield from iter_user_repositories(
+            args.username, client, args.include_forks, args.include_archived
+        )
+    elif args.command == "org":
+        yield from iter_org_repositories(
+            args.orgname, client, args.include_forks, args.include_archived
+        )
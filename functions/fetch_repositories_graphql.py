@@ -0,0 +1,142 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from pytypes.repo_info import RepoInfo
+from functions.github_client import GitHubClient
+
+# Only the fields StarCloner uses are requested, which keeps pages small.
+_REPO_FIELDS = """
+fragment RepoFields on Repository {
+  databaseId
+  nameWithOwner
+  url
+  stargazerCount
+  owner { login }
+  pushedAt
+  diskUsage
+  defaultBranchRef { name }
+  isFork
+}
+"""
+
+_PAGE_INFO = "pageInfo { hasNextPage endCursor } nodes { ...RepoFields }"
+# Stars are read through edges, which carry the time of starring.
+_STAR_PAGE_INFO = (
+    "pageInfo { hasNextPage endCursor } edges { starredAt node { ...RepoFields } }"
+)
+
+_QUERIES = {
+    "star": (
+        "user",
+        "starredRepositories",
+        """
+query($login: String!, $cursor: String) {
+  user(login: $login) {
+    starredRepositories(first: 100, after: $cursor,
+                        orderBy: {field: STARRED_AT, direction: DESC}) { %s }
+  }
+}
+""",
+    ),
+    # The same repositories as REST /users/<user>/repos with type=all, which
+    # never lists private ones, even to their owner.
+    "repo": (
+        "user",
+        "repositories",
+        """
+query($login: String!, $cursor: String, $isFork: Boolean, $isArchived: Boolean) {
+  user(login: $login) {
+    repositories(first: 100, after: $cursor,
+                 ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 privacy: PUBLIC,
+                 isFork: $isFork, isArchived: $isArchived,
+                 orderBy: {field: NAME, direction: ASC}) { %s }
+  }
+}
+""",
+    ),
+    "org": (
+        "organization",
+        "repositories",
+        """
+query($login: String!, $cursor: String, $isFork: Boolean, $isArchived: Boolean) {
+  organization(login: $login) {
+    repositories(first: 100, after: $cursor,
+                 isFork: $isFork, isArchived: $isArchived,
+                 orderBy: {field: NAME, direction: ASC}) { %s }
+  }
+}
+""",
+    ),
+}
+
+
+def _repo_info_from_node(node: Dict[str, Any]) -> RepoInfo:
+    default_branch = node.get("defaultBranchRef") or {}
+    return RepoInfo(
+        full_name=node["nameWithOwner"],
+        clone_url=f"{node['url']}.git",
+        stargazers_count=node["stargazerCount"],
+        owner_name=node["owner"]["login"],
+        repo_id=node.get("databaseId"),
+        pushed_at=node.get("pushedAt"),
+        size=node.get("diskUsage"),
+        default_branch=default_branch.get("name"),
+        fork=node.get("isFork", False),
+    )
+
+
+def iter_repositories_graphql(
+    command: str,
+    login: str,
+    client: GitHubClient,
+    include_forks: bool = True,
+    include_archived: bool = True,
+) -> Iterator[Tuple[Optional[str], RepoInfo]]:
+    """
+    Yield (starred_at, repository) pairs for the star, repo or org subcommand
+    via the GitHub GraphQL API (100 nodes per cursor page). starred_at is only
+    set for stars, which come newest first. Forks and archived repositories are
+    filtered on the server. Requires an authentication token.
+    """
+    owner_field, connection_field, query = _QUERIES[command]
+    page_info = _STAR_PAGE_INFO if command == "star" else _PAGE_INFO
+    query = (query % page_info) + _REPO_FIELDS
+    variables: Dict[str, Any] = {"login": login, "cursor": None}
+    if command != "star":
+        # None means "no filter", i.e. include both.
+        variables["isFork"] = None if include_forks else False
+        variables["isArchived"] = None if include_archived else False
+
+    while True:
+        data = client.graphql(query, variables)
+        owner: Optional[Dict[str, Any]] = data.get(owner_field)
+        if owner is None:
+            return
+        connection = owner[connection_field]
+        if command == "star":
+            for edge in connection["edges"]:
+                yield edge["starredAt"], _repo_info_from_node(edge["node"])
+        else:
+            for node in connection["nodes"]:
+                yield None, _repo_info_from_node(node)
+        if not connection["pageInfo"]["hasNextPage"]:
+            return
+        variables["cursor"] = connection["pageInfo"]["endCursor"]
+
+
+def fetch_repositories_graphql(
+    command: str,
+    login: str,
+    client: GitHubClient,
+    include_forks: bool = True,
+    include_archived: bool = True,
+) -> List[RepoInfo]:
+    """
+    Fetch the repository list for the star, repo or org subcommand via the
+    GitHub GraphQL API.
+    """
+    return [
+        repo
+        for _, repo in iter_repositories_graphql(
+            command, login, client, include_forks, include_archived
+        )
+    ]
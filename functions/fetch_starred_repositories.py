@@ -1,46 +1,32 @@
-import requests
-import sys
-from typing import Dict, List, Optional
+from typing import Iterator, List, Tuple
 from pytypes.repo_info import RepoInfo
+from functions.github_client import GitHubClient
+from functions.repo_info_from_api import repo_info_from_api
 
+# This media type adds the time each repository was starred.
+STAR_MEDIA_TYPE = "application/vnd.github.star+json"
 
-def fetch_starred_repositories(username: str, token: Optional[str]) -> List[RepoInfo]:
+
+def iter_starred_repositories(
+    username: str, client: GitHubClient, concurrent: bool = True
+) -> Iterator[Tuple[str, RepoInfo]]:
     """
-    Fetch all repositories starred by the given user (via GitHub API).
+    Yield (starred_at, repository) pairs for the given user, newest star first.
+    With concurrent=False pages are requested one at a time, so the caller can
+    stop paging as soon as it reaches an already-known star.
     """
-    all_repos: List[RepoInfo] = []
-    page: int = 1
-    headers: Dict[str, str] = {"Accept": "application/vnd.github.v3+json"}
-
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-
-    while True:
-        url = f"https://api.github.com/users/{username}/starred"
-        params = {"page": page, "per_page": 100}
-        response = requests.get(url, headers=headers, params=params)
-
-        if response.status_code != 200:
-            print(
-                f"Error: GitHub API request returned {response.status_code}.",
-                file=sys.stderr,
-            )
-            print("Response body:", response.text, file=sys.stderr)
-            break
+    params = {"per_page": 100, "sort": "created", "direction": "desc"}
+    for item in client.paginate_items(
+        f"/users/{username}/starred",
+        params,
+        headers={"Accept": STAR_MEDIA_TYPE},
+        concurrent=concurrent,
+    ):
+        yield item["starred_at"], repo_info_from_api(item["repo"])
 
-        data = response.json()
-        if not data:
-            break
 
-        for item in data:
-            repo_info = RepoInfo(
-                full_name=item["full_name"],
-                clone_url=item["clone_url"],
-                stargazers_count=item["stargazers_count"],
-                owner_name=item["owner"]["login"],
-            )
-            all_repos.append(repo_info)
-
-        page += 1
-
-    return all_repos
+def fetch_starred_repositories(username: str, client: GitHubClient) -> List[RepoInfo]:
+    """
+    Fetch all repositories starred by the given user (via GitHub API).
+    """
+    return [repo for _, repo in iter_starred_repositories(username, client)]
@@ -0,0 +1,90 @@
+import time
+from typing import Generator, Iterator, List, Optional, Tuple
+from pytypes.repo_info import RepoInfo
+from functions.github_client import GitHubClient
+from functions.fetch_starred_repositories import iter_starred_repositories
+from functions.fetch_repositories_graphql import iter_repositories_graphql
+from functions.state_store import StateStore
+
+# Unstars are only noticed by a full pass, so do one at least this often.
+FULL_STAR_SYNC_INTERVAL = 24 * 60 * 60  # seconds
+
+
+def iter_starred_repositories_incremental(
+    username: str,
+    client: GitHubClient,
+    state: StateStore,
+    use_graphql: bool = False,
+    full_sync: bool = False,
+) -> Iterator[RepoInfo]:
+    """
+    Yield the repositories starred by the given user, reusing the starred list
+    kept in the state store. Stars read from the API are yielded as their
+    listing page arrives, the stored ones after the listing has ended; the
+    state store is only updated once the listing has been read completely.
+    Stars are listed newest first and paging stops at the first star that is
+    already known, so a routine sync costs one or two requests. A full pass,
+    which also drops unstarred repositories, runs on the first sync, when
+    full_sync is set, or once FULL_STAR_SYNC_INTERVAL has passed.
+    Repositories carried over from earlier runs keep the pushed_at stored with
+    them, so they can still be skipped as unchanged upstream. It is refreshed
+    for every star the pass reads and by each full pass, so a push to an older
+    star is noticed by the next full pass at the latest.
+    """
+    star_sync = state.get_star_sync(username)
+    full_pass = (
+        full_sync
+        or star_sync is None
+        or time.time() - star_sync[1] > FULL_STAR_SYNC_INTERVAL
+    )
+
+    stars: Generator[Tuple[Optional[str], RepoInfo], None, None]
+    if use_graphql:
+        stars = iter_repositories_graphql("star", username, client)
+    else:
+        stars = iter_starred_repositories(username, client, concurrent=full_pass)
+
+    if full_pass:
+        starred: List[Tuple[str, RepoInfo]] = []
+        for starred_at, repo in stars:
+            starred.append((starred_at or "", repo))
+            yield repo
+        state.replace_stars(username, starred)
+        return
+
+    newest_known = star_sync[0] or ""
+    known = state.load_stars(username)
+    known_names = {repo.full_name for _, repo in known}
+    read: List[Tuple[str, RepoInfo]] = []
+    for starred_at, repo in stars:
+        starred_at = starred_at or ""
+        if starred_at < newest_known:
+            break
+        read.append((starred_at, repo))
+        if repo.full_name not in known_names:
+            yield repo
+    stars.close()
+    # Known stars that were read are stored again with their current pushed_at.
+    state.add_stars(username, read)
+
+    refreshed = {repo.full_name: repo for _, repo in read}
+    for _, repo in known:
+        yield refreshed.get(repo.full_name, repo)
+
+
+def fetch_starred_repositories_incremental(
+    username: str,
+    client: GitHubClient,
+    state: StateStore,
+    use_graphql: bool = False,
+    full_sync: bool = False,
+) -> List[RepoInfo]:
+    """
+    Fetch the repositories starred by the given user, reusing the starred list
+    kept in the state store (see iter_starred_repositories_incremental).
+    """
+    return list(
+        iter_starred_repositories_incremental(
+            username, client, state, use_graphql, full_sync
+        )
+    )
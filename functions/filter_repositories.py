@@ -1,7 +1,11 @@
 import argparse
-from typing import List
+from typing import Iterable, Iterator, List
 from pytypes.repo_info import RepoInfo
-from functions.filter_star_repositories import filter_star_repositories
+from functions.filter_star_repositories import (
+    filter_star_repositories,
+    iter_filter_star_repositories,
+)
+from functions.trace_recorder import trace_span
 
 
 def filter_repositories(
@@ -13,11 +17,32 @@ def filter_repositories(
       - repo / org: no additional filters needed (forks/archived are handled at fetch time).
     """
     if args.command == "star":
-        return filter_star_repositories(
+        with trace_span("star filter", "filter", repos=len(repos)) as span_args:
+            filtered = filter_star_repositories(
+                repos,
+                min_stars=args.min_stars,
+                max_stars=args.max_stars,
+                owner_filter=args.owner_filter,
+            )
+            span_args["kept"] = len(filtered)
+        return filtered
+    else:
+        return repos
+
+
+def iter_filter_repositories(
+    args: argparse.Namespace, repos: Iterable[RepoInfo]
+) -> Iterator[RepoInfo]:
+    """
+    Generator version of filter_repositories, applied to each repository as it
+    is produced by the fetch stage.
+    """
+    if args.command == "star":
+        return iter_filter_star_repositories(
             repos,
             min_stars=args.min_stars,
             max_stars=args.max_stars,
             owner_filter=args.owner_filter,
         )
     else:
-        return repos
+        return iter(repos)
@@ -1,15 +1,15 @@
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 from pytypes.repo_info import RepoInfo
 
 
-def filter_star_repositories(
-    repos: List[RepoInfo],
+def iter_filter_star_repositories(
+    repos: Iterable[RepoInfo],
     min_stars: Optional[int],
     max_stars: Optional[int],
     owner_filter: Optional[str],
-) -> List[RepoInfo]:
+) -> Iterator[RepoInfo]:
     """
-    Filter starred repositories based on stargazer count and/or owner name.
+    Lazily filter starred repositories based on stargazer count and/or owner name.
     """
 
     def _star_filter(r: RepoInfo) -> bool:
@@ -21,4 +21,16 @@ def filter_star_repositories(
             return False
         return True
 
-    return list(filter(_star_filter, repos))
+    return filter(_star_filter, repos)
+
+
+def filter_star_repositories(
+    repos: List[RepoInfo],
+    min_stars: Optional[int],
+    max_stars: Optional[int],
+    owner_filter: Optional[str],
+) -> List[RepoInfo]:
+    """
+    Filter starred repositories based on stargazer count and/or owner name.
+    """
+    return list(iter_filter_star_repositories(repos, min_stars, max_stars, owner_filter))
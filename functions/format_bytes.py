@@ -0,0 +1,12 @@
+def format_bytes(size: int) -> str:
+    """
+    Format a byte count for humans, e.g. 1536 -> "1.5 KiB". Negative counts
+    (e.g. a repository that grew) keep their sign.
+    """
+    value = float(abs(size))
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            break
+        value /= 1024
+    sign = "-" if size < 0 else ""
+    return f"{sign}{value:.0f} {unit}" if unit == "B" else f"{sign}{value:.1f} {unit}"
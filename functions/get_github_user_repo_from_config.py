@@ -6,39 +6,52 @@ def get_github_user_repo_from_config(config_path: Path):
     """
     .git/config ファイルを読み込み、GitHub 上のユーザー名と
     リポジトリ名を抜き出して返します。
+    [remote "origin"] の url を優先し、なければ最初の url を使います。
     取得できない場合は (None, None) を返します。
     """
-    if not config_path.is_file():
+    try:
+        lines = config_path.read_text(encoding="utf-8").splitlines()
+    except OSError:
         return None, None
 
-    lines = config_path.read_text(encoding="utf-8").splitlines()
+    urls = []
+    section = ""
     for line in lines:
         line_strip = line.strip()
-        if line_strip.startswith("url ="):
+        if line_strip.startswith("["):
+            section = line_strip
+        elif line_strip.startswith("url ="):
             url = line_strip.split("=", 1)[1].strip()
-
-            # GitHub 以外のURLをスキップ
-            if "github.com" not in url:
-                return None, None
-
-            # 例: "git@github.com:username/repo.git" -> ":username/repo.git"
-            #     "https://github.com/username/repo.git" -> "/username/repo.git"
-            parts = url.split("github.com", 1)[-1]
-            parts = parts.lstrip("/").lstrip(
-                ":"
-            )  # ":username/repo.git" 等の先頭記号を除去
-
-            spl = parts.split("/")
-            if len(spl) < 2:
-                return None, None
-
-            user = spl[0]
-            repo_with_dotgit = spl[1]
-            # ".git" を取り除く
-            if repo_with_dotgit.endswith(".git"):
-                repo = repo_with_dotgit[:-4]
+            if section == '[remote "origin"]':
+                urls.insert(0, url)
             else:
-                repo = repo_with_dotgit
+                urls.append(url)
+
+    if not urls:
+        return None, None
+    url = urls[0]
+
+    # GitHub 以外のURLをスキップ
+    if "github.com" not in url:
+        return None, None
+
+    # 例: "git@github.com:username/repo.git" -> ":username/repo.git"
+    #     "https://github.com/username/repo.git" -> "/username/repo.git"
+    parts = url.split("github.com", 1)[-1]
+    parts = parts.lstrip("/").lstrip(
+        ":"
+    )  # ":username/repo.git" 等の先頭記号を除去
+
+    spl = parts.split("/")
+    if len(spl) < 2:
+        return None, None
+
+    user = spl[0]
+    repo_with_dotgit = spl[1]
+    # ".git" を取り除く
+    if repo_with_dotgit.endswith(".git"):
+        repo = repo_with_dotgit[:-4]
+    else:
+        repo = repo_with_dotgit
 
-            return user, repo
-    return None, None
+    return user, repo
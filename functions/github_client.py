@@ -0,0 +1,333 @@
+import hashlib
+import json
+import time
+import requests
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+from requests.adapters import HTTPAdapter
+from pytypes.api_response import ApiResponse
+from pytypes.github_api_error import GitHubApiError
+from pytypes.rate_limit_budget import RateLimitBudget
+from functions.http_cache import HttpCache
+from functions.parse_last_page import parse_last_page
+from functions.rate_limiter import RateLimiter
+from functions.token_pool import TokenPool
+from functions.run_journal import RunJournal
+from functions.sync_metrics import SyncMetrics
+from functions.trace_recorder import trace_span
+
+GITHUB_API_URL = "https://api.github.com"
+MAX_CONCURRENT_PAGES = 8
+MAX_RETRIES = 5
+
+
+def _graphql_rate_limited(response: requests.Response) -> bool:
+    """
+    GraphQL reports an exhausted rate limit as HTTP 200 with an error of type
+    RATE_LIMITED instead of a 403.
+    """
+    if response.status_code != 200 or "RATE_LIMITED" not in response.text:
+        return False
+    try:
+        errors = response.json().get("errors") or []
+    except ValueError:
+        return False
+    return any(error.get("type") == "RATE_LIMITED" for error in errors)
+
+
+class GitHubClient:
+    """
+    Shared client for the GitHub REST and GraphQL APIs.
+    A single pooled keep-alive requests.Session is used for the whole run, so
+    the TCP/TLS handshake happens once per connection instead of once per page.
+    Authentication, media type and compression headers are set up here.
+    If an HttpCache is given, listing pages are requested conditionally and
+    304 Not Modified answers are served from the cache.
+    Every request goes through a RateLimiter, so rate-limit rejections pause
+    and retry instead of truncating a listing.
+    With a RunJournal, every page is recorded in it, and pages that are
+    already recorded (from an interrupted run) are replayed without a request.
+    With SyncMetrics, every request and page is reported to it.
+    With a TokenPool, requests are spread over several tokens by remaining
+    budget instead of using the single token.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str],
+        base_url: str = GITHUB_API_URL,
+        max_concurrent_pages: int = MAX_CONCURRENT_PAGES,
+        cache: Optional[HttpCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        journal: Optional[RunJournal] = None,
+        metrics: Optional[SyncMetrics] = None,
+        token_pool: Optional[TokenPool] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrent_pages = max_concurrent_pages
+        self.cache = cache
+        if token_pool is None:
+            token_pool = TokenPool(
+                [token] if token else [],
+                make_rate_limiter=lambda: rate_limiter or RateLimiter(),
+            )
+        self.token_pool = token_pool
+        self.journal = journal
+        self.metrics = metrics
+        tokens = sorted(t.token for t in token_pool.tokens if t.token)
+        self.has_token = bool(tokens)
+        # Cache entries are scoped per credential without storing the token.
+        self._cache_identity = (
+            hashlib.sha256("\n".join(tokens).encode("utf-8")).hexdigest()
+            if tokens
+            else ""
+        )
+        # With several tokens, each request carries its own Authorization header.
+        token = tokens[0] if len(tokens) == 1 else None
+        self.session = requests.Session()
+        # One pooled connection per concurrent page request.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrent_pages)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {
+                "Accept": "application/vnd.github.v3+json",
+                "Accept-Encoding": "gzip, deflate",
+                "User-Agent": "starcloner",
+            }
+        )
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def __enter__(self) -> "GitHubClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def rate_limit(self) -> RateLimitBudget:
+        """
+        The rate-limit budget last reported by GitHub (summed over the pool).
+        """
+        return self.token_pool.budget
+
+    def close(self) -> None:
+        self.session.close()
+        if self.cache is not None:
+            self.cache.evict()
+
+    def _send(
+        self,
+        send: Callable[..., requests.Response],
+        url: str,
+        is_rate_limited: Optional[Callable[[requests.Response], bool]] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Send a request (self.session.get or .post) with a token from the pool
+        through its rate limiter, retrying rate-limit rejections (with another
+        token, if the pool has one left). is_rate_limited recognizes
+        rejections that don't use a 403/429 status, such as GraphQL's.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            with self.token_pool.use() as pooled:
+                limiter = pooled.rate_limiter
+                limiter.wait()
+                request_kwargs = kwargs
+                if len(self.token_pool) > 1 and pooled.token:
+                    request_kwargs = {
+                        **kwargs,
+                        "headers": {
+                            **kwargs.get("headers", {}),
+                            "Authorization": f"Bearer {pooled.token}",
+                        },
+                    }
+                start = time.monotonic()
+                with trace_span(
+                    url[len(self.base_url):],
+                    "api",
+                    params=kwargs.get("params"),
+                    attempt=attempt,
+                ) as span_args:
+                    response = send(url, **request_kwargs)
+                    span_args["status"] = response.status_code
+            if self.metrics is not None:
+                self.metrics.record_request(
+                    response.status_code,
+                    time.monotonic() - start,
+                    len(response.content),
+                )
+            limiter.update(response.headers)
+            status_code = response.status_code
+            if is_rate_limited is not None and is_rate_limited(response):
+                # Back off exactly like a REST rate-limit rejection.
+                status_code = 429
+            if attempt == MAX_RETRIES or limiter.backoff(
+                status_code, response.headers, response.text, attempt
+            ) is None:
+                break
+            self.token_pool.record_rate_limited(pooled)
+        return response
+
+    def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> ApiResponse:
+        """
+        GET an API path (e.g. "/users/octocat/starred"), optionally with extra
+        request headers such as a different Accept media type.
+        Rate-limited requests are retried after the limiter's pause; any other
+        non-200 answer (except a 304 served from the cache) raises
+        GitHubApiError.
+        """
+        url = f"{self.base_url}{path}"
+        params = params or {}
+        cached = None
+        request_headers = dict(headers or {})
+        key = HttpCache.key(url, {**params, **request_headers}, self._cache_identity)
+        if self.journal is not None:
+            recorded = self.journal.page(key)
+            if recorded is not None:
+                link = {"Link": recorded["link"]} if recorded.get("link") else {}
+                return self._page(ApiResponse(recorded["body"], link, from_cache=True))
+        if self.cache is not None:
+            cached = self.cache.load(key)
+            if cached is not None:
+                if cached.get("etag"):
+                    request_headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    request_headers["If-Modified-Since"] = cached["last_modified"]
+        request_kwargs: Dict[str, Any] = {"params": params}
+        if request_headers:
+            request_kwargs["headers"] = request_headers
+
+        response = self._send(self.session.get, url, **request_kwargs)
+        if response.status_code == 304 and cached is not None:
+            self.cache.touch(key)
+            headers = {"Link": cached["link"]} if cached.get("link") else {}
+            result = ApiResponse(cached["body"], headers, from_cache=True)
+        elif response.status_code != 200:
+            raise GitHubApiError(response.status_code, url, response.text)
+        else:
+            if self.cache is not None:
+                self.cache.store(key, response.text, response.headers)
+            result = ApiResponse(response.text, response.headers)
+
+        if self.journal is not None:
+            self.journal.record_page(key, result.text, result.headers.get("Link"))
+        return self._page(result)
+
+    def _page(self, response: ApiResponse) -> ApiResponse:
+        if self.metrics is not None:
+            self.metrics.record_page(response.from_cache)
+            self.metrics.record_rate_limit(self.rate_limit)
+        return response
+
+    def paginate(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        concurrent: bool = True,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Iterate over the pages of a paginated listing endpoint, in page order.
+        The first page is requested alone; the rel="last" entry of its Link
+        header tells how many pages exist, and the remaining pages are fetched
+        concurrently (at most max_concurrent_pages at a time).
+        With concurrent=False, each page is only requested once the previous
+        one has been consumed, so a caller can stop paging early.
+        """
+        for response in self._pages(path, params, headers, concurrent):
+            yield response.json()
+
+    def paginate_items(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        concurrent: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Like paginate, but yield the items of the pages one by one, decoding
+        each page body incrementally instead of into a full list.
+        """
+        for response in self._pages(path, params, headers, concurrent):
+            yield from response.iter_items()
+
+    def _pages(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        concurrent: bool,
+    ) -> Iterator[ApiResponse]:
+        params = dict(params or {})
+        first = self.get(path, {**params, "page": 1}, headers)
+        yield first
+
+        last_page = parse_last_page(first.headers.get("Link"))
+        if last_page <= 1:
+            return
+
+        if not concurrent:
+            for page in range(2, last_page + 1):
+                yield self.get(path, {**params, "page": page}, headers)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_pages) as executor:
+            # Only a window of pages is requested ahead of the consumer, so a
+            # listing of thousands of pages never sits in memory at once.
+            pages = iter(range(2, last_page + 1))
+            window: Deque[Future] = deque(
+                executor.submit(self.get, path, {**params, "page": page}, headers)
+                for page in islice(pages, self.max_concurrent_pages)
+            )
+            while window:
+                response = window.popleft().result()
+                for page in islice(pages, 1):
+                    window.append(
+                        executor.submit(
+                            self.get, path, {**params, "page": page}, headers
+                        )
+                    )
+                yield response
+
+    def graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a GraphQL query and return its "data" object.
+        Raises GitHubApiError if the request fails or the answer has errors.
+        """
+        url = f"{self.base_url}/graphql"
+        key = HttpCache.key(
+            url,
+            {"query": query, "variables": json.dumps(variables, sort_keys=True)},
+            self._cache_identity,
+        )
+        recorded = self.journal.page(key) if self.journal is not None else None
+        if recorded is not None:
+            self._page(ApiResponse(recorded["body"], {}, from_cache=True))
+            return json.loads(recorded["body"])["data"]
+
+        response = self._send(
+            self.session.post,
+            url,
+            is_rate_limited=_graphql_rate_limited,
+            json={"query": query, "variables": variables},
+        )
+        if response.status_code != 200:
+            raise GitHubApiError(response.status_code, url, response.text)
+        payload = response.json()
+        if payload.get("errors"):
+            raise GitHubApiError(
+                response.status_code, url, json.dumps(payload["errors"])
+            )
+        if self.journal is not None:
+            self.journal.record_page(key, response.text, None)
+        self._page(ApiResponse(response.text, response.headers))
+        return payload["data"]
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60  # seconds
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "starcloner" / "http"
+
+
+class HttpCache:
+    """
+    On-disk cache of GitHub listing pages for conditional requests.
+    Each entry keeps the page body together with its ETag, Last-Modified and
+    Link headers, so the next run can send If-None-Match / If-Modified-Since
+    and reuse the stored body when GitHub answers 304 Not Modified.
+    Entries older than max_age are evicted, and the least recently used
+    entries are dropped when the cache grows beyond max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(url: str, params: Dict[str, Any], identity: str) -> str:
+        """
+        Cache key for a request. identity distinguishes credentials, since the
+        same URL lists different (e.g. private) repositories per token.
+        """
+        raw = json.dumps([url, sorted(params.items()), identity], default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                return None
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def touch(self, key: str) -> None:
+        """
+        Mark an entry as recently used (it was revalidated with a 304).
+        """
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def store(self, key: str, text: str, headers: Mapping[str, str]) -> None:
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "link": headers.get("Link"),
+            "body": text,
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+        tmp_path.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def evict(self) -> None:
+        """
+        Drop expired entries, then the least recently used ones until the
+        cache fits in max_bytes.
+        """
+        if not self.cache_dir.is_dir():
+            return
+        now = time.time()
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                stat = entry.stat()
+                if now - stat.st_mtime > self.max_age:
+                    os.unlink(entry.path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.unlink(path)
+            total -= size
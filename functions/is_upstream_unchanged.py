@@ -0,0 +1,54 @@
+import subprocess
+from pathlib import Path
+from typing import Optional, Tuple
+from functions.read_head import read_head, read_ref
+from functions.trace_recorder import trace_span
+
+
+def _remote_head(local_path: Path) -> Optional[Tuple[str, str]]:
+    """
+    Ask the remote for its default branch and tip with
+    'git ls-remote --symref origin HEAD'. Returns (branch, commit id).
+    """
+    with trace_span("git ls-remote", "git", path=str(local_path)):
+        completed = subprocess.run(
+            ["git", "-C", str(local_path), "ls-remote", "--symref", "origin", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    if completed.returncode != 0:
+        return None
+    branch = None
+    commit = None
+    for line in completed.stdout.splitlines():
+        if line.startswith("ref: "):
+            # "ref: refs/heads/main\tHEAD"
+            branch = line[len("ref: "):].split("\t", 1)[0][len("refs/heads/"):]
+        elif line.endswith("\tHEAD"):
+            commit = line.split("\t", 1)[0]
+    if branch is None or commit is None:
+        return None
+    return branch, commit
+
+
+def is_upstream_unchanged(local_path: Path) -> bool:
+    """
+    Return True if the remote's default-branch tip equals the local one, i.e.
+    a pull would change nothing. In a working-tree clone that is the branch
+    itself (refs/heads/<branch>, or HEAD), not the tracking ref, which a fetch
+    without a merge may already have moved; in a bare repository or mirror it
+    is refs/remotes/origin/<branch>, or refs/heads/<branch>.
+    Any failure to tell returns False, so the repository is pulled.
+    """
+    remote = _remote_head(local_path)
+    if remote is None:
+        return False
+    branch, remote_commit = remote
+    branch_commit = read_ref(local_path, f"refs/heads/{branch}")
+    if (local_path / ".git").exists():
+        local_commit = branch_commit or read_head(local_path)
+    else:
+        tracking_commit = read_ref(local_path, f"refs/remotes/origin/{branch}")
+        local_commit = tracking_commit or branch_commit
+    return local_commit == remote_commit
@@ -1,21 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from pytypes.repo_info import RepoInfo
 from functions.print_repositories import print_repositories
+from functions.print_repository_details import print_repository_details
+from functions.read_repo_details import read_repo_details
+from functions.scan_cloned_repositories import (
+    DEFAULT_SCAN_JOBS,
+    scan_cloned_repositories,
+)
 
-def list_cloned_repositories(target_dir: Path) -> None:
+
+def list_cloned_repositories(
+    target_dir: Path, details: bool = False, jobs: int = DEFAULT_SCAN_JOBS
+) -> None:
     """
     List all cloned repositories in the target directory.
+    Bare mirrors (<owner>/<repo>.git) are listed under their repository name.
+    With details, each repository's branch, HEAD and last commit time are
+    shown as well (read concurrently by jobs workers).
     """
-    cloned_repos = []
-    for user_dir in target_dir.iterdir():
-        if user_dir.is_dir():
-            for repo_dir in user_dir.iterdir():
-                if repo_dir.is_dir():
-                    repo_info = RepoInfo(
-                        full_name=f"{user_dir.name}/{repo_dir.name}",
-                        clone_url="",  # Not needed for listing
-                        stargazers_count=0,  # Not needed for listing
-                        owner_name=user_dir.name
+    found = scan_cloned_repositories(target_dir, jobs)
+    if details:
+        with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+            print_repository_details(
+                list(
+                    executor.map(
+                        lambda entry: read_repo_details(
+                            f"{entry[0]}/{entry[1].removesuffix('.git')}",
+                            target_dir / entry[0] / entry[1],
+                        ),
+                        found,
                     )
-                    cloned_repos.append(repo_info)
+                )
+            )
+        return
+
+    cloned_repos = [
+        RepoInfo(
+            full_name=f"{owner}/{dir_name.removesuffix('.git')}",
+            clone_url="",  # Not needed for listing
+            stargazers_count=0,  # Not needed for listing
+            owner_name=owner,
+        )
+        for owner, dir_name in found
+    ]
     print_repositories(cloned_repos)
@@ -0,0 +1,13 @@
+from pathlib import Path
+from pytypes.repo_info import RepoInfo
+
+
+def local_repo_path(repo: RepoInfo, target_dir: Path, mirror: bool = False) -> Path:
+    """
+    Return the local directory of a repository: <target_dir>/<owner>/<repo>,
+    or <target_dir>/<owner>/<repo>.git for a bare mirror.
+    """
+    user_or_org_name, local_repo_dir_name = repo.full_name.split("/")[:2]
+    if mirror:
+        local_repo_dir_name += ".git"
+    return target_dir / user_or_org_name / local_repo_dir_name
@@ -1,55 +1,96 @@
 #!/usr/bin/env python3
 
-import argparse
+import errno
+import os
+import uuid
 from pathlib import Path
-from functions.get_github_user_repo_from_config import get_github_user_repo_from_config
+from functions.discover_checkouts import discover_checkouts
+from functions.plan_moves import plan_moves
 from functions.safe_move import safe_move
 
-def move_temp_files(dry_run: bool):
-    parser = argparse.ArgumentParser(
-        description='指定ディレクトリ直下の GitHub リポジトリを "<user>/<repo>" ディレクトリ構造に整理するスクリプト。'
-    )
-    parser.add_argument(
-        "target_directory",
-        nargs="?",
-        default=".",
-        help="Git リポジトリが並んでいるディレクトリパス (デフォルト: カレントディレクトリ)。",
-    )
-    parser.add_argument(
-        "--dry-run",
-        action="store_true",
-        help="ファイル移動を実行せず、移動予定のパスだけを表示します。",
-    )
-    args = parser.parse_args()
-
-    base_dir = Path(args.target_directory).resolve()
+
+def _move(src: Path, dst: Path, allow_copy: bool) -> bool:
+    """
+    src を dst にリネームします。別のデバイスへの移動 (EXDEV) は、allow_copy
+    が指定されている場合のみコピーで行います。移動できた場合は True を返します。
+    移動に失敗した場合は、一時ディレクトリを元の名前に戻してから OSError を
+    送出します。
+    """
+    original_src = src
+    if src in dst.parents:
+        # "<user>" ディレクトリ自体が "<user>/<repo>" のチェックアウトである場合は、
+        # いったん一時ディレクトリにリネームしてから移動する
+        src = src.parent / f".tmpmove_{uuid.uuid4().hex}"
+        os.rename(original_src, src)
+    try:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(src, dst)
+            return True
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        if allow_copy:
+            safe_move(src, dst)
+            return True
+    except OSError:
+        _restore(src, original_src)
+        raise
+    _restore(src, original_src)
+    return False
+
+
+def _restore(src: Path, original_src: Path) -> None:
+    """
+    _move が一時ディレクトリにリネームしたチェックアウトを元の名前に戻します。
+    """
+    if src != original_src and src.exists():
+        # 移動先の親として作られた空の original_src は rename で置き換えられる
+        os.rename(src, original_src)
+
+
+def move_temp_files(
+    target_directory: Path, dry_run: bool, jobs: int = 8, allow_copy: bool = False
+):
+    """
+    target_directory 以下の GitHub リポジトリを "<user>/<repo>" ディレクトリ構造に整理します。
+    走査は並列に行い、移動の計画をすべて立ててから (重複などの衝突を検出してから)
+    os.rename で移動します。別のデバイスへの移動はコピーになるため、
+    allow_copy が指定された場合のみ行います。
+    """
+    base_dir = target_directory.resolve()
     if not base_dir.is_dir():
         print(f"指定されたパスはディレクトリではありません: {base_dir}")
         return
 
-    # base_dir 直下のリポジトリを走査
-    for item in base_dir.iterdir():
-        if not item.is_dir():
-            continue  # ディレクトリ以外は無視
-
-        git_dir = item / ".git"
-        if not git_dir.is_dir():
-            continue  # gitリポジトリでなければ無視
-
-        config_path = git_dir / "config"
-        user, repo = get_github_user_repo_from_config(config_path)
-        if not user or not repo:
-            print(f"[SKIP] {item.name} は GitHubリポジトリ情報を取得できませんでした。")
+    plan = plan_moves(base_dir, discover_checkouts(base_dir, jobs))
+    moved = skipped = 0
+    for move in plan:
+        if move.skip_reason:
+            print(f"[SKIP] {move.src}: {move.skip_reason}")
+            skipped += 1
             continue
-
-        target_dir = base_dir / user / repo
-        if target_dir.exists():
-            print(f"[SKIP] すでに {target_dir} が存在します: {item.name}")
+        if dry_run:
+            print(f"[DRY-RUN] {move.src} -> {move.dst}")
             continue
-
-        if args.dry_run:
-            print(f"[DRY-RUN] {item} -> {target_dir}")
+        try:
+            ok = _move(move.src, move.dst, allow_copy)
+        except OSError as e:
+            print(f"[SKIP] {move.src} -> {move.dst} を移動できませんでした: {e}")
+            skipped += 1
+            continue
+        if ok:
+            print(f"[MOVE] {move.src} -> {move.dst}")
+            moved += 1
         else:
-            target_dir.parent.mkdir(parents=True, exist_ok=True)
-            safe_move(item, target_dir)
-            print(f"[MOVE] {item} -> {target_dir}")
+            print(
+                f"[SKIP] {move.src} -> {move.dst} は別のデバイスへの移動 (コピー) になります。"
+                "コピーするには --allow-copy を指定してください。"
+            )
+            skipped += 1
+
+    planned = len(plan) - sum(1 for move in plan if move.skip_reason)
+    if dry_run:
+        print(f"\n移動予定: {planned} 件, スキップ: {skipped} 件")
+    else:
+        print(f"\n移動: {moved} 件, スキップ: {skipped} 件")
@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List
+from pytypes.maintenance_result import MaintenanceResult
+from functions.format_bytes import format_bytes
+from functions.optimize_repository import optimize_repository
+from functions.scan_cloned_repositories import scan_cloned_repositories
+
+
+def optimize_repositories(
+    target_dir: Path, jobs: int, fsck: bool, dry_run: bool
+) -> List[MaintenanceResult]:
+    """
+    Run optimize_repository on every cloned repository under target_dir with a
+    pool of jobs workers, printing each repository's time and reclaimed bytes
+    as it finishes. Shared object pools (.objects) are left alone: their
+    objects are borrowed by other clones and must never be pruned.
+    """
+    found = scan_cloned_repositories(target_dir, jobs)
+    if dry_run:
+        for owner, dir_name in found:
+            print(f"Dry-run: Would optimize '{target_dir / owner / dir_name}'")
+        return []
+
+    results: List[MaintenanceResult] = []
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        futures = [
+            executor.submit(
+                optimize_repository,
+                f"{owner}/{dir_name.removesuffix('.git')}",
+                target_dir / owner / dir_name,
+                fsck,
+            )
+            for owner, dir_name in found
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            status = "ok" if result.ok else "failed"
+            print(
+                f"[{done}/{len(futures)}] {result.full_name}: {status} "
+                f"({result.duration:.1f}s, reclaimed {format_bytes(result.reclaimed)})"
+            )
+            results.append(result)
+    return results
@@ -0,0 +1,84 @@
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import List
+from pytypes.maintenance_result import MaintenanceResult
+
+# Run in this order: repack first, so that the commit-graph and the
+# multi-pack-index are written for the final set of packs.
+OPTIMIZE_STEPS: List[List[str]] = [
+    # Only repacks/prunes once git's own thresholds (gc.auto,
+    # gc.autoPackLimit) are exceeded.
+    ["maintenance", "run", "--auto", "--task=gc"],
+    ["commit-graph", "write", "--reachable", "--changed-paths"],
+    ["multi-pack-index", "write"],
+]
+FSCK_STEP = ["fsck", "--connectivity-only", "--no-progress"]
+
+
+def _objects_dir(repo_dir: Path) -> Path:
+    dot_git = repo_dir / ".git"
+    return (dot_git if dot_git.is_dir() else repo_dir) / "objects"
+
+
+def _has_packs(repo_dir: Path) -> bool:
+    return any((_objects_dir(repo_dir) / "pack").glob("*.pack"))
+
+
+def _objects_size(repo_dir: Path) -> int:
+    objects_dir = _objects_dir(repo_dir)
+    total = 0
+    stack = [str(objects_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            # Removed by a concurrent repack.
+            continue
+    return total
+
+
+def optimize_repository(
+    full_name: str, repo_dir: Path, fsck: bool = False
+) -> MaintenanceResult:
+    """
+    Repack a repository if git considers it necessary, write its commit-graph
+    and multi-pack-index, and optionally check connectivity with git fsck.
+    Stops at the first failing step.
+    """
+    start = time.monotonic()
+    bytes_before = _objects_size(repo_dir)
+    steps = OPTIMIZE_STEPS + ([FSCK_STEP] if fsck else [])
+    for step in steps:
+        # git refuses to write a multi-pack-index without any pack.
+        if step[0] == "multi-pack-index" and not _has_packs(repo_dir):
+            continue
+        completed = subprocess.run(
+            ["git", "-C", str(repo_dir), *step],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if completed.returncode != 0:
+            return MaintenanceResult(
+                full_name,
+                ok=False,
+                duration=time.monotonic() - start,
+                bytes_before=bytes_before,
+                bytes_after=_objects_size(repo_dir),
+                failed_step=" ".join(["git", *step]),
+                output=completed.stderr,
+            )
+    return MaintenanceResult(
+        full_name,
+        ok=True,
+        duration=time.monotonic() - start,
+        bytes_before=bytes_before,
+        bytes_after=_objects_size(repo_dir),
+    )
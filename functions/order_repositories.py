@@ -0,0 +1,32 @@
+from typing import List
+from pytypes.repo_info import RepoInfo
+
+ORDERS = ("listing", "name", "largest-first", "smallest-first", "recent-first")
+
+
+def order_repositories(repos: List[RepoInfo], order: str) -> List[RepoInfo]:
+    """
+    Order the clone/pull queue. The worker pool starts repositories in list
+    order, so with N workers:
+      - listing: keep the order of the API listing.
+      - name: alphabetical by full name.
+      - largest-first: by size, descending (LPT scheduling): big repositories
+        start early instead of one of them starting last and dominating the
+        run's wall time.
+      - smallest-first: by size, ascending, for the earliest first results.
+      - recent-first: by pushed_at, most recent first, so the repositories
+        most likely to have changed are synced first.
+    Repositories without a size (or push time) go last. Sorting is stable.
+    """
+    if order == "name":
+        return sorted(repos, key=lambda r: r.full_name.lower())
+    if order == "largest-first":
+        return sorted(repos, key=lambda r: (r.size is None, -(r.size or 0)))
+    if order == "smallest-first":
+        return sorted(repos, key=lambda r: (r.size is None, r.size or 0))
+    if order == "recent-first":
+        known = sorted(
+            (r for r in repos if r.pushed_at), key=lambda r: r.pushed_at, reverse=True
+        )
+        return known + [r for r in repos if not r.pushed_at]
+    return list(repos)
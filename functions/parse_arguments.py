@@ -1,4 +1,32 @@
 import argparse
+from typing import Tuple
+from functions.order_repositories import ORDERS
+
+
+def _positive_int(value: str) -> int:
+    """
+    Parse an integer of at least 1 (e.g. --depth).
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _shard(value: str) -> Tuple[int, int]:
+    """
+    Parse --shard I/N into (I, N) with 1 <= I <= N.
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N (e.g. 1/3), got '{value}'")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be 1..{count}, got {index}")
+    return index, count
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -49,6 +77,12 @@ def parse_arguments() -> argparse.Namespace:
         default=None,
         help="Only include repositories whose owner's name matches this (case-insensitive).",
     )
+    star_parser.add_argument(
+        "--full-star-sync",
+        action="store_true",
+        help="Re-list all starred repositories instead of stopping at the newest "
+        "already-known star (also drops unstarred repositories).",
+    )
     star_parser.add_argument(
         "--output-dir",
         "-o",
@@ -128,6 +162,139 @@ def parse_arguments() -> argparse.Namespace:
         help="Directory where the repositories will be cloned. Defaults to current dir.",
     )
 
+    # --- options shared by the clone/pull subcommands ---
+    for sync_parser in (star_parser, repo_parser, org_parser):
+        sync_parser.add_argument(
+            "--jobs",
+            "-j",
+            type=int,
+            default=1,
+            help="Number of repositories to clone/pull concurrently. Defaults to 1.",
+        )
+        sync_parser.add_argument(
+            "--depth",
+            type=_positive_int,
+            default=None,
+            help="Create new clones shallow, with this many commits.",
+        )
+        sync_parser.add_argument(
+            "--filter",
+            choices=["blob:none", "tree:0"],
+            default=None,
+            help="Create partial clones: 'blob:none' (blobless) or 'tree:0' (treeless).",
+        )
+        sync_parser.add_argument(
+            "--single-branch",
+            action="store_true",
+            help="Clone only the default branch.",
+        )
+        sync_parser.add_argument(
+            "--mirror",
+            action="store_true",
+            help="Keep bare mirrors in <owner>/<repo>.git (git clone --mirror) and "
+            "update them with 'git remote update --prune'. No working trees are written.",
+        )
+        sync_parser.add_argument(
+            "--share-objects",
+            action="store_true",
+            help="Group forks by fork network and clone them against a shared "
+            "object pool of the network root (git clone --reference).",
+        )
+        sync_parser.add_argument(
+            "--api",
+            choices=["auto", "rest", "graphql"],
+            default="auto",
+            help="GitHub API used for listing. 'auto' (default) uses GraphQL when "
+            "a token is available and REST otherwise.",
+        )
+        sync_parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Do not use the on-disk cache of GitHub API listing pages.",
+        )
+        sync_parser.add_argument(
+            "--check-upstream",
+            action="store_true",
+            help="Before pulling, compare the remote default branch with the local "
+            "tracking ref using 'git ls-remote' and skip repositories that are up to date.",
+        )
+        sync_parser.add_argument(
+            "--no-state",
+            action="store_true",
+            help="Do not use the sync state database in the output directory; "
+            "pull every already-cloned repository.",
+        )
+        sync_parser.add_argument(
+            "--stream",
+            action="store_true",
+            help="Start cloning/pulling while the repository list is still being "
+            "fetched instead of listing everything first. Requires --yes.",
+        )
+        sync_parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted run from its journal in the output "
+            "directory: replay the API pages it fetched and skip the repositories "
+            "it finished.",
+        )
+        sync_parser.add_argument(
+            "--order",
+            choices=ORDERS,
+            default="listing",
+            help="Order in which repositories are queued for clone/pull: 'listing' "
+            "(default, as listed by the API), 'name', 'largest-first' (shortest "
+            "total time with --jobs), 'smallest-first' (earliest first results) or "
+            "'recent-first' (most recently pushed first). Shown in --dry-run output.",
+        )
+        sync_parser.add_argument(
+            "--shard",
+            type=_shard,
+            default=None,
+            metavar="I/N",
+            help="Process only the I-th of N shards of the filtered repository "
+            "list (1 <= I <= N), so that N instances can split the work without "
+            "coordinating. Every instance must use the same N and --shard-mode.",
+        )
+        sync_parser.add_argument(
+            "--shard-mode",
+            choices=["modulo", "consistent"],
+            default="modulo",
+            help="How repositories are assigned to shards: 'modulo' (default) "
+            "hashes them evenly; 'consistent' uses rendezvous hashing, so changing "
+            "N moves as few repositories as possible to another shard.",
+        )
+        sync_parser.add_argument(
+            "--token-file",
+            metavar="PATH",
+            default=None,
+            help="Read GitHub tokens from PATH (one per line) in addition to "
+            "GITHUB_TOKEN / GITHUB_TOKENS. API requests are spread across all "
+            "tokens by remaining rate-limit budget.",
+        )
+        sync_parser.add_argument(
+            "--metrics-json",
+            metavar="PATH",
+            default=None,
+            help="Write a JSON report of the run (API requests, phase timings, "
+            "per-repository results) to PATH.",
+        )
+        sync_parser.add_argument(
+            "--metrics-textfile",
+            metavar="PATH",
+            default=None,
+            help="Write the run's metrics in the Prometheus text format to PATH, "
+            "for node_exporter's textfile collector (use a .prom file in its "
+            "--collector.textfile.directory).",
+        )
+        sync_parser.add_argument(
+            "--trace",
+            metavar="PATH",
+            default=None,
+            help="Record a timeline of the run (API requests, filter stages, git "
+            "commands, worker queue waits) in the Chrome Trace Event format to "
+            "PATH; open it in Perfetto or chrome://tracing.",
+        )
+
     # --- subcommand: maintenance ---
     maintenance_parser = subparsers.add_parser(
         "maintenance", help="Perform maintenance tasks."
@@ -138,12 +305,61 @@ def parse_arguments() -> argparse.Namespace:
     move_temp_files_parser = maintenance_subparsers.add_parser(
         "move-temp-files", help="Move temporary files to a designated directory."
     )
+    move_temp_files_parser.add_argument(
+        "target_directory",
+        nargs="?",
+        default=".",
+        help="Directory containing the loose Git checkouts to organize. Defaults to current dir.",
+    )
     move_temp_files_parser.add_argument(
         "--dry-run",
         "-n",
         action="store_true",
         help="Dry-run: show what files would be moved without making changes.",
     )
+    move_temp_files_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=8,
+        help="Number of directories to scan concurrently. Defaults to 8.",
+    )
+    move_temp_files_parser.add_argument(
+        "--allow-copy",
+        action="store_true",
+        help="Allow moves to another filesystem, which copy the checkout instead "
+        "of renaming it.",
+    )
+
+    optimize_parser = maintenance_subparsers.add_parser(
+        "optimize",
+        help="Repack cloned repositories if needed and write commit-graphs and "
+        "multi-pack-indexes.",
+    )
+    optimize_parser.add_argument(
+        "--output-dir",
+        "-o",
+        default=".",
+        help="Directory where the repositories are cloned. Defaults to current dir.",
+    )
+    optimize_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=4,
+        help="Number of repositories to optimize concurrently. Defaults to 4.",
+    )
+    optimize_parser.add_argument(
+        "--fsck",
+        action="store_true",
+        help="Also check each repository with 'git fsck --connectivity-only'.",
+    )
+    optimize_parser.add_argument(
+        "--dry-run",
+        "-n",
+        action="store_true",
+        help="Dry-run: show which repositories would be optimized.",
+    )
 
     list_cloned_parser = subparsers.add_parser(
         "list-cloned", help="List all cloned repositories in the specified directory."
@@ -154,5 +370,28 @@ def parse_arguments() -> argparse.Namespace:
         default=".",
         help="Directory where the repositories are cloned. Defaults to current dir.",
     )
+    list_cloned_parser.add_argument(
+        "--details",
+        action="store_true",
+        help="Also show each repository's branch, HEAD commit and last commit time.",
+    )
+    list_cloned_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=8,
+        help="Number of directories to scan concurrently. Defaults to 8.",
+    )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if getattr(args, "stream", False):
+        if not args.yes:
+            parser.error("--stream requires --yes (there is no list to confirm)")
+        if args.share_objects:
+            parser.error("--stream cannot be combined with --share-objects")
+        if args.order != "listing":
+            parser.error(
+                "--stream processes repositories as they are listed; "
+                "--order needs the full list"
+            )
+    return args
@@ -0,0 +1,21 @@
+import re
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+_LINK_PATTERN = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
+
+
+def parse_last_page(link_header: Optional[str]) -> int:
+    """
+    Return the page number of the rel="last" entry of a GitHub Link header.
+    GitHub omits the header when everything fits on one page, so a missing
+    header (or one without rel="last") means there is only a single page.
+    """
+    if not link_header:
+        return 1
+    for url, rel in _LINK_PATTERN.findall(link_header):
+        if rel == "last":
+            page = parse_qs(urlparse(url).query).get("page")
+            if page:
+                return int(page[0])
+    return 1
@@ -0,0 +1,49 @@
+from collections import Counter
+from pathlib import Path
+from typing import List
+from pytypes.planned_move import PlannedMove
+from functions.discover_checkouts import Checkout
+
+
+def plan_moves(base_dir: Path, checkouts: List[Checkout]) -> List[PlannedMove]:
+    """
+    チェックアウトの一覧から、すべての移動を実行前にまとめて計画します。
+    次のものは skip_reason 付きで計画に残し、移動しません:
+      - GitHub リポジトリ情報を取得できないもの
+      - ベアリポジトリ (<user>/<repo>.git に置かれているミラーは計画に含めません)
+      - 移動先がすでに存在するもの
+      - 移動先が重複するもの
+      - 移動先が別のチェックアウトの中にあるもの
+    すでに <user>/<repo> に置かれているチェックアウトは計画に含めません。
+    """
+    candidates = []
+    moves: List[PlannedMove] = []
+    for src, user, repo in checkouts:
+        if not user or not repo:
+            moves.append(
+                PlannedMove(src, None, "GitHub リポジトリ情報を取得できませんでした")
+            )
+            continue
+        if not (src / ".git").is_dir():
+            if src != base_dir / user / f"{repo}.git":
+                moves.append(PlannedMove(src, None, "ベアリポジトリは移動しません"))
+            continue
+        dst = base_dir / user / repo
+        if dst != src:
+            candidates.append((src, dst))
+
+    # 移動しないもの (情報を取得できないもの、移動済みのもの) も含めたすべての
+    # チェックアウトの中には移動しない
+    sources = {src for src, _, _ in checkouts}
+    dst_counts = Counter(dst for _, dst in candidates)
+    for src, dst in candidates:
+        if dst_counts[dst] > 1:
+            reason = f"移動先 {dst} が他のチェックアウトと重複しています"
+        elif dst.exists():
+            reason = f"すでに {dst} が存在します"
+        elif any(parent in sources and parent != src for parent in dst.parents):
+            reason = f"移動先 {dst} が別のチェックアウトの中にあります"
+        else:
+            reason = ""
+        moves.append(PlannedMove(src, dst, reason))
+    return moves
@@ -0,0 +1,66 @@
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+from pytypes.repo_info import RepoInfo
+from functions.local_repo_path import local_repo_path
+
+OBJECT_POOL_DIR_NAME = ".objects"
+
+
+def _prepare_pool(root: RepoInfo, pool_path: Path, dry_run: bool) -> Optional[Path]:
+    if dry_run:
+        print(f"Dry-run: Would prepare object pool '{pool_path}' for {root.full_name}")
+        return pool_path
+    if pool_path.is_dir():
+        command = ["git", "-C", str(pool_path), "remote", "update", "--prune"]
+    else:
+        pool_path.parent.mkdir(parents=True, exist_ok=True)
+        command = ["git", "clone", "--mirror", root.clone_url, str(pool_path)]
+    completed = subprocess.run(command, capture_output=True, text=True, check=False)
+    if completed.returncode != 0:
+        print(
+            f"Could not prepare object pool for {root.full_name}; "
+            f"its forks will be cloned without it.\n{completed.stderr.rstrip()}"
+        )
+        return None
+    # Forks borrow objects from the pool through alternates, so the pool must
+    # never prune objects on its own.
+    for key, value in (("gc.auto", "0"), ("gc.pruneExpire", "never")):
+        subprocess.run(
+            ["git", "-C", str(pool_path), "config", key, value],
+            capture_output=True,
+            check=False,
+        )
+    return pool_path
+
+
+def prepare_object_pools(
+    networks: Dict[str, RepoInfo], target_dir: Path, jobs: int, dry_run: bool
+) -> Dict[str, Path]:
+    """
+    Clone (or update) one bare mirror per fork network root under
+    <target_dir>/.objects/<owner>/<repo>.git, concurrently.
+    Returns a mapping from each network member's full name to the pool that
+    its clone should reference (git clone --reference), so objects shared by
+    a network are transferred and stored once.
+    """
+    roots = {root.full_name: root for root in networks.values()}
+    pool_dir = target_dir / OBJECT_POOL_DIR_NAME
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        pools = dict(
+            zip(
+                roots,
+                executor.map(
+                    lambda root: _prepare_pool(
+                        root, local_repo_path(root, pool_dir, mirror=True), dry_run
+                    ),
+                    roots.values(),
+                ),
+            )
+        )
+    return {
+        name: pools[root.full_name]
+        for name, root in networks.items()
+        if pools[root.full_name] is not None
+    }
@@ -0,0 +1,23 @@
+import sys
+from typing import List
+from pytypes.maintenance_result import MaintenanceResult
+from functions.format_bytes import format_bytes
+
+
+def print_maintenance_summary(results: List[MaintenanceResult]) -> None:
+    """
+    Print a summary of a 'maintenance optimize' run: counts, total time and
+    bytes reclaimed, and the error output of failed repositories.
+    """
+    failed = [result for result in results if not result.ok]
+    total_time = sum(result.duration for result in results)
+    reclaimed = sum(result.reclaimed for result in results)
+    print(
+        f"\nSummary: {len(results)} repository(ies) processed - "
+        f"ok: {len(results) - len(failed)}, failed: {len(failed)} "
+        f"(git time {total_time:.1f}s, reclaimed {format_bytes(reclaimed)})"
+    )
+    for result in failed:
+        print(f"  FAILED {result.full_name} ({result.failed_step})", file=sys.stderr)
+        if result.output:
+            print(result.output.rstrip(), file=sys.stderr)
@@ -1,11 +1,24 @@
-from typing import List
+from typing import List, Optional
 from pytypes.repo_info import RepoInfo
+from functions.format_bytes import format_bytes
 
 
-def print_repositories(repos: List[RepoInfo]) -> None:
+def print_repositories(repos: List[RepoInfo], order: Optional[str] = None) -> None:
     """
     Print a sorted list of repositories, showing metadata like stargazer count and owner.
+    With an order (see order_repositories), the list is printed in that
+    processing order instead, with each repository's size and last push.
     """
+    if order is not None:
+        print(f"Repositories to process (total {len(repos)}), in {order} order:")
+        for position, repo in enumerate(repos, start=1):
+            size = format_bytes(repo.size * 1024) if repo.size is not None else "?"
+            print(
+                f"  {position:>4}. {repo.full_name} ("
+                f"Size: {size}, Pushed: {repo.pushed_at or '?'})"
+            )
+        return
+
     repos_sorted = sorted(repos, key=lambda r: r.full_name.lower())
     print(
         f"Repositories to process (total {len(repos_sorted)}), sorted alphabetically:"
@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+from typing import List
+from pytypes.cloned_repo_details import ClonedRepoDetails
+
+
+def print_repository_details(details: List[ClonedRepoDetails]) -> None:
+    """
+    Print cloned repositories sorted alphabetically, with their checked-out
+    branch, HEAD commit and the time of that commit.
+    """
+    details_sorted = sorted(details, key=lambda d: d.full_name.lower())
+    print(f"Cloned repositories (total {len(details_sorted)}), sorted alphabetically:")
+    for d in details_sorted:
+        head = d.head[:12] if d.head else "-"
+        branch = d.branch or "(detached)"
+        committed = (
+            datetime.fromtimestamp(d.committed_at, timezone.utc).strftime(
+                "%Y-%m-%d %H:%M UTC"
+            )
+            if d.committed_at is not None
+            else "-"
+        )
+        print(f"  {d.full_name} ({branch} @ {head}, last commit {committed})")
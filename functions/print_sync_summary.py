@@ -0,0 +1,31 @@
+import sys
+from collections import Counter
+from typing import List
+from pytypes.repo_result import RepoResult, RepoStatus
+
+
+def print_sync_summary(results: List[RepoResult]) -> None:
+    """
+    Print a summary of a clone/pull run: counts per status, total git time,
+    and the captured error output of failed repositories.
+    """
+    counts = Counter(result.status for result in results)
+    total_time = sum(result.duration for result in results)
+    print(
+        f"\nSummary: {len(results)} repository(ies) processed - "
+        + ", ".join(f"{status.value}: {counts[status]}" for status in RepoStatus)
+        + f" (git time {total_time:.1f}s)"
+    )
+    skip_reasons = Counter(
+        result.reason for result in results if result.status is RepoStatus.SKIPPED
+    )
+    for reason, count in sorted(skip_reasons.items()):
+        print(f"  skipped ({reason or 'no reason given'}): {count}")
+    for result in results:
+        if result.status is RepoStatus.FAILED:
+            print(
+                f"  FAILED {result.full_name} (exit code {result.exit_code})",
+                file=sys.stderr,
+            )
+            if result.output:
+                print(result.output.rstrip(), file=sys.stderr)
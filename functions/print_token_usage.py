@@ -0,0 +1,20 @@
+from typing import List
+from pytypes.token_usage import TokenUsage
+
+
+def print_token_usage(usage: List[TokenUsage]) -> None:
+    """
+    Print the API requests sent with each token of the pool and the budget
+    each one has left. Tokens are shown masked.
+    """
+    print("\nAPI usage per token:")
+    for token in usage:
+        remaining = (
+            f"{token.remaining}/{token.limit} left"
+            if token.remaining is not None
+            else "budget unknown"
+        )
+        print(
+            f"  {token.label}: {token.requests} request(s), "
+            f"{token.rate_limited} rate-limited, {remaining}"
+        )
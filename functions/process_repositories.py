@@ -1,15 +1,276 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
+from pytypes.clone_options import CloneOptions
 from pytypes.repo_info import RepoInfo
+from pytypes.repo_result import RepoResult, RepoStatus
 from functions.clone_or_pull_repo import clone_or_pull_repo
+from functions.is_upstream_unchanged import is_upstream_unchanged
+from functions.local_repo_path import local_repo_path
+from functions.run_journal import RunJournal
+from functions.state_store import StateStore
+from functions.trace_recorder import add_trace_span, trace_span
+
+UNCHANGED_REASON = "unchanged upstream"
+UP_TO_DATE_REASON = "up to date"
+RESUMED_REASON = "done before resume"
+# ls-remote is cheap, so the pre-check runs at least this many at a time.
+MIN_CHECK_JOBS = 8
+
+
+def _filter_up_to_date(
+    repos: List[RepoInfo], paths: Dict[str, Path], jobs: int
+) -> Tuple[List[RepoInfo], List[RepoInfo]]:
+    """
+    Split repositories into (to process, already up to date) by comparing the
+    remote default-branch tip with the local tracking ref, concurrently.
+    Repositories that aren't cloned yet are always processed.
+    """
+    cloned = [repo for repo in repos if paths[repo.full_name].is_dir()]
+    with ThreadPoolExecutor(max_workers=max(jobs, MIN_CHECK_JOBS)) as executor:
+        unchanged = executor.map(
+            lambda repo: is_upstream_unchanged(paths[repo.full_name]), cloned
+        )
+        up_to_date = {
+            repo.full_name for repo, same in zip(cloned, unchanged) if same
+        }
+    return (
+        [repo for repo in repos if repo.full_name not in up_to_date],
+        [repo for repo in repos if repo.full_name in up_to_date],
+    )
+
+
+def _clone_options_for(
+    repo: RepoInfo, state: Optional[StateStore], clone_options: CloneOptions
+) -> CloneOptions:
+    """
+    The clone mode recorded for the repository, or clone_options for new ones.
+    """
+    if state is not None and repo.repo_id is not None:
+        recorded = state.get(repo.repo_id)
+        if recorded is not None and recorded.clone_options is not None:
+            return recorded.clone_options
+    return clone_options
 
 
 def process_repositories(
-    repos: List[RepoInfo], target_dir: Path, dry_run: bool
-) -> None:
+    repos: List[RepoInfo],
+    target_dir: Path,
+    dry_run: bool,
+    jobs: int = 1,
+    state: Optional[StateStore] = None,
+    check_upstream: bool = False,
+    clone_options: Optional[CloneOptions] = None,
+    references: Optional[Dict[str, Path]] = None,
+    journal: Optional[RunJournal] = None,
+) -> List[RepoResult]:
     """
     Clone or pull each repository in the list into the specified directory.
+    With jobs > 1, repositories are processed concurrently by a bounded pool of
+    worker threads and git output is captured instead of being interleaved.
+    With a state store, repositories whose upstream pushed_at hasn't moved
+    since their last successful sync are skipped without running git, and
+    every outcome is recorded.
+    With check_upstream, already-cloned repositories are only pulled if
+    'git ls-remote' shows that the remote default branch has moved.
+    clone_options selects the clone mode for new clones; already-cloned
+    repositories keep the mode recorded in the state store.
+    references maps full names to a repository whose objects new clones
+    borrow (see prepare_object_pools).
+    With a run journal, repositories that an interrupted run already finished
+    are skipped, and every finished repository is recorded.
     """
-    target_dir.mkdir(parents=True, exist_ok=True)
+    if not dry_run:
+        target_dir.mkdir(parents=True, exist_ok=True)
+    clone_options = clone_options or CloneOptions()
+    references = references or {}
+
+    options_by_name: Dict[str, CloneOptions] = {}
+    paths: Dict[str, Path] = {}
     for repo in repos:
-        clone_or_pull_repo(repo, target_dir, dry_run)
+        options = _clone_options_for(repo, state, clone_options)
+        options_by_name[repo.full_name] = options
+        paths[repo.full_name] = local_repo_path(repo, target_dir, options.mirror)
+
+    results: List[RepoResult] = []
+    pending: List[RepoInfo] = []
+    with trace_span("skip unchanged", "filter", repos=len(repos)) as span_args:
+        for repo in repos:
+            if journal is not None and journal.is_done(repo.full_name):
+                results.append(
+                    RepoResult(
+                        repo.full_name, RepoStatus.SKIPPED, reason=RESUMED_REASON
+                    )
+                )
+            elif (
+                state is not None
+                and state.is_up_to_date(repo)
+                and paths[repo.full_name].is_dir()
+            ):
+                results.append(
+                    RepoResult(
+                        repo.full_name, RepoStatus.SKIPPED, reason=UNCHANGED_REASON
+                    )
+                )
+            else:
+                pending.append(repo)
+        span_args["pending"] = len(pending)
+
+    def _record(repo: RepoInfo, result: RepoResult) -> None:
+        if state is not None and not dry_run:
+            state.record(
+                repo, result, paths[repo.full_name], options_by_name[repo.full_name]
+            )
+        if journal is not None:
+            journal.record_result(result)
+        results.append(result)
+
+    if check_upstream:
+        with trace_span("check upstream", "filter", repos=len(pending)):
+            pending, up_to_date = _filter_up_to_date(pending, paths, jobs)
+        for repo in up_to_date:
+            _record(
+                repo,
+                RepoResult(repo.full_name, RepoStatus.SKIPPED, reason=UP_TO_DATE_REASON),
+            )
+
+    if jobs <= 1:
+        for repo in pending:
+            _record(
+                repo,
+                clone_or_pull_repo(
+                    repo,
+                    target_dir,
+                    dry_run,
+                    options=options_by_name[repo.full_name],
+                    reference=references.get(repo.full_name),
+                ),
+            )
+        return results
+
+    def _work(repo: RepoInfo, submitted: float) -> RepoResult:
+        add_trace_span(
+            "queue wait", "pool", submitted, time.perf_counter(), repo=repo.full_name
+        )
+        return clone_or_pull_repo(
+            repo,
+            target_dir,
+            dry_run,
+            capture_output=True,
+            options=options_by_name[repo.full_name],
+            reference=references.get(repo.full_name),
+        )
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(_work, repo, time.perf_counter()): repo for repo in pending
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            print(
+                f"[{done}/{len(futures)}] {result.full_name}: {result.status.value} "
+                f"({result.duration:.1f}s)"
+            )
+            _record(futures[future], result)
+    return results
+
+
+def process_repository_stream(
+    repos: Iterable[RepoInfo],
+    target_dir: Path,
+    dry_run: bool,
+    jobs: int = 1,
+    state: Optional[StateStore] = None,
+    check_upstream: bool = False,
+    clone_options: Optional[CloneOptions] = None,
+    journal: Optional[RunJournal] = None,
+) -> List[RepoResult]:
+    """
+    Streaming variant of process_repositories: repositories are handed to the
+    worker pool as soon as they are produced (e.g. while later API pages are
+    still being fetched), so listing and cloning overlap.
+    At most 2 * jobs repositories are queued ahead of the workers, which keeps
+    the producer from running far ahead. The upstream pre-check runs inside
+    the workers, one repository at a time.
+    """
+    if not dry_run:
+        target_dir.mkdir(parents=True, exist_ok=True)
+    clone_options = clone_options or CloneOptions()
+    jobs = max(jobs, 1)
+    results: List[RepoResult] = []
+    results_lock = threading.Lock()
+    slots = threading.BoundedSemaphore(2 * jobs)
+
+    def _finish(
+        repo: RepoInfo, result: RepoResult, path: Path, options: CloneOptions
+    ) -> None:
+        if state is not None and not dry_run:
+            state.record(repo, result, path, options)
+        if journal is not None:
+            journal.record_result(result)
+        with results_lock:
+            results.append(result)
+            print(
+                f"[{len(results)}] {result.full_name}: {result.status.value} "
+                f"({result.duration:.1f}s)"
+            )
+
+    def _work(
+        repo: RepoInfo, path: Path, options: CloneOptions, submitted: float
+    ) -> None:
+        try:
+            add_trace_span(
+                "queue wait",
+                "pool",
+                submitted,
+                time.perf_counter(),
+                repo=repo.full_name,
+            )
+            if check_upstream and path.is_dir() and is_upstream_unchanged(path):
+                result = RepoResult(
+                    repo.full_name, RepoStatus.SKIPPED, reason=UP_TO_DATE_REASON
+                )
+            else:
+                result = clone_or_pull_repo(
+                    repo,
+                    target_dir,
+                    dry_run,
+                    capture_output=jobs > 1,
+                    options=options,
+                )
+            _finish(repo, result, path, options)
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = []
+        for repo in repos:
+            if journal is not None and journal.is_done(repo.full_name):
+                with results_lock:
+                    results.append(
+                        RepoResult(
+                            repo.full_name, RepoStatus.SKIPPED, reason=RESUMED_REASON
+                        )
+                    )
+                continue
+            options = _clone_options_for(repo, state, clone_options)
+            path = local_repo_path(repo, target_dir, options.mirror)
+            if state is not None and state.is_up_to_date(repo) and path.is_dir():
+                with results_lock:
+                    results.append(
+                        RepoResult(
+                            repo.full_name, RepoStatus.SKIPPED, reason=UNCHANGED_REASON
+                        )
+                    )
+                continue
+            with trace_span("backpressure wait", "pool", repo=repo.full_name):
+                slots.acquire()
+            futures.append(
+                executor.submit(_work, repo, path, options, time.perf_counter())
+            )
+        for future in futures:
+            # Surface exceptions raised in the workers.
+            future.result()
+    return results
@@ -0,0 +1,133 @@
+import sys
+import threading
+import time
+from typing import Callable, Mapping, Optional
+from pytypes.rate_limit_budget import RateLimitBudget
+
+# Below this many remaining requests, requests are spread evenly until reset.
+PACE_THRESHOLD = 100
+SECONDARY_LIMIT_BACKOFF = 60.0  # seconds, doubled on every retry
+MAX_BACKOFF = 15 * 60.0
+
+
+class RateLimiter:
+    """
+    Schedules GitHub API requests against the rate-limit budget.
+      - Tracks X-RateLimit-Limit / -Remaining / -Reset from every response.
+      - Paces requests when the budget runs low, and waits for the reset when
+        it is exhausted instead of failing.
+      - Turns 403/429 rate-limit answers (primary, secondary and Retry-After)
+        into a pause after which the request is retried.
+    All methods are thread-safe; the concurrent page fetchers share one limiter.
+    """
+
+    def __init__(
+        self,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._budget = RateLimitBudget()
+        self._paused_until = 0.0
+        # While pacing, the time of the last handed-out request slot.
+        self._next_slot = 0.0
+
+    @property
+    def budget(self) -> RateLimitBudget:
+        """
+        The current rate-limit budget, for callers that want to throttle
+        themselves.
+        """
+        return self._budget
+
+    def ready_at(self) -> float:
+        """
+        The time from which wait() no longer blocks for a rate-limit pause or
+        an exhausted budget (0.0 if it doesn't). Pacing is not included.
+        """
+        with self._lock:
+            ready = self._paused_until
+            budget = self._budget
+            if budget.remaining is not None and budget.remaining <= 0 and budget.reset:
+                ready = max(ready, budget.reset + 1)
+            return ready
+
+    def wait(self) -> None:
+        """
+        Block until the next request may be sent. While pacing, every caller
+        gets its own slot, one interval after the previous one, so concurrent
+        fetchers are spread out instead of all waking at the same moment.
+        """
+        with self._lock:
+            now = self._clock()
+            delay = self._paused_until - now
+            budget = self._budget
+            if delay <= 0 and budget.remaining is not None and budget.reset:
+                until_reset = budget.reset - now
+                if until_reset > 0:
+                    if budget.remaining <= 0:
+                        delay = until_reset + 1
+                    elif budget.remaining < PACE_THRESHOLD:
+                        interval = until_reset / budget.remaining
+                        self._next_slot = max(self._next_slot, now) + interval
+                        delay = self._next_slot - now
+        if delay <= 0:
+            return
+        # Sleep without the lock, so that other threads can still record
+        # responses and compute their own delay meanwhile.
+        self._sleep(delay)
+        if budget.remaining is not None and budget.remaining <= 0:
+            with self._lock:
+                # The window has reset; let the next response report the new
+                # budget (unless one already has).
+                if self._budget is budget:
+                    self._budget = RateLimitBudget(limit=budget.limit)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """
+        Record the budget reported by a response.
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        limit = headers.get("X-RateLimit-Limit")
+        reset = headers.get("X-RateLimit-Reset")
+        with self._lock:
+            self._budget = RateLimitBudget(
+                limit=int(limit) if limit is not None else self._budget.limit,
+                remaining=int(remaining),
+                reset=float(reset) if reset is not None else self._budget.reset,
+            )
+
+    def backoff(
+        self, status_code: int, headers: Mapping[str, str], body: str, attempt: int
+    ) -> Optional[float]:
+        """
+        If the response is a rate-limit rejection, pause all requests and
+        return the pause in seconds; return None for any other response.
+        """
+        if status_code not in (403, 429):
+            return None
+        now = self._clock()
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            delay = float(retry_after)
+        elif headers.get("X-RateLimit-Remaining") == "0" and headers.get(
+            "X-RateLimit-Reset"
+        ):
+            delay = float(headers["X-RateLimit-Reset"]) - now + 1
+        elif status_code == 429 or "secondary rate limit" in body.lower():
+            delay = min(SECONDARY_LIMIT_BACKOFF * 2**attempt, MAX_BACKOFF)
+        else:
+            return None
+        delay = max(delay, 1.0)
+        with self._lock:
+            self._paused_until = max(self._paused_until, now + delay)
+        print(
+            f"GitHub API rate limit hit (HTTP {status_code}); "
+            f"pausing for {delay:.0f}s before retrying.",
+            file=sys.stderr,
+        )
+        return delay
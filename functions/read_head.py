@@ -0,0 +1,44 @@
+from pathlib import Path
+from typing import Optional
+
+
+def _git_dir(repo_dir: Path) -> Path:
+    dot_git = repo_dir / ".git"
+    return dot_git if dot_git.is_dir() else repo_dir
+
+
+def read_ref(repo_dir: Path, ref: str) -> Optional[str]:
+    """
+    Return the commit id of a full ref name (e.g. "refs/remotes/origin/main"),
+    read from the loose ref file or packed-refs without spawning git.
+    Returns None if the ref doesn't exist.
+    """
+    git_dir = _git_dir(repo_dir)
+    try:
+        return (git_dir / ref).read_text(encoding="utf-8").strip() or None
+    except OSError:
+        pass
+    try:
+        packed_refs = (git_dir / "packed-refs").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    for line in packed_refs.splitlines():
+        if line.endswith(f" {ref}"):
+            return line.split(" ", 1)[0]
+    return None
+
+
+def read_head(repo_dir: Path) -> Optional[str]:
+    """
+    Return the commit id HEAD points to, read directly from the git files
+    (HEAD, loose refs and packed-refs) without spawning git.
+    Works for both working-tree and bare repositories; returns None if it
+    cannot be determined (e.g. an empty repository).
+    """
+    try:
+        head = (_git_dir(repo_dir) / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not head.startswith("ref:"):
+        return head or None
+    return read_ref(repo_dir, head[len("ref:"):].strip())
@@ -0,0 +1,34 @@
+import subprocess
+from pathlib import Path
+from pytypes.cloned_repo_details import ClonedRepoDetails
+from functions.read_head import read_head
+
+
+def read_repo_details(full_name: str, repo_dir: Path) -> ClonedRepoDetails:
+    """
+    Read HEAD and the checked-out branch from the git files, and the HEAD
+    commit time with a single 'git log -1'.
+    """
+    head = read_head(repo_dir)
+    branch = None
+    dot_git = repo_dir / ".git"
+    try:
+        head_ref = (
+            (dot_git if dot_git.is_dir() else repo_dir) / "HEAD"
+        ).read_text(encoding="utf-8").strip()
+    except OSError:
+        head_ref = ""
+    if head_ref.startswith("ref: refs/heads/"):
+        branch = head_ref[len("ref: refs/heads/"):]
+
+    committed_at = None
+    if head is not None:
+        completed = subprocess.run(
+            ["git", "-C", str(repo_dir), "log", "-1", "--format=%ct"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if completed.returncode == 0 and completed.stdout.strip().isdigit():
+            committed_at = int(completed.stdout.strip())
+    return ClonedRepoDetails(full_name, head, branch, committed_at)
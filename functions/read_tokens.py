@@ -0,0 +1,23 @@
+import os
+import re
+from pathlib import Path
+from typing import List, Optional
+
+
+def read_tokens(token_file: Optional[str] = None) -> List[str]:
+    """
+    Collect the GitHub tokens to use, in order and without duplicates:
+      - GITHUB_TOKEN (a single token)
+      - GITHUB_TOKENS (several tokens separated by commas or whitespace)
+      - token_file: one token per line; blank lines and '#' comments are ignored
+    """
+    tokens = []
+    if os.environ.get("GITHUB_TOKEN"):
+        tokens.append(os.environ["GITHUB_TOKEN"].strip())
+    tokens.extend(re.split(r"[,\s]+", os.environ.get("GITHUB_TOKENS", "")))
+    if token_file is not None:
+        for line in Path(token_file).read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                tokens.append(line)
+    return list(dict.fromkeys(token for token in tokens if token))
@@ -0,0 +1,19 @@
+from typing import Any, Dict
+from pytypes.repo_info import RepoInfo
+
+
+def repo_info_from_api(item: Dict[str, Any]) -> RepoInfo:
+    """
+    Build a RepoInfo from a repository object returned by the GitHub REST API.
+    """
+    return RepoInfo(
+        full_name=item["full_name"],
+        clone_url=item["clone_url"],
+        stargazers_count=item["stargazers_count"],
+        owner_name=item["owner"]["login"],
+        repo_id=item.get("id"),
+        pushed_at=item.get("pushed_at"),
+        size=item.get("size"),
+        default_branch=item.get("default_branch"),
+        fork=item.get("fork", False),
+    )
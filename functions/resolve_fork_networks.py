@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from pytypes.repo_info import RepoInfo
+from functions.github_client import GitHubClient
+from functions.repo_info_from_api import repo_info_from_api
+
+
+def resolve_fork_networks(
+    repos: List[RepoInfo], client: GitHubClient
+) -> Dict[str, RepoInfo]:
+    """
+    Group repositories by fork network.
+    Listing endpoints don't say which repository a fork belongs to, so each
+    fork is looked up (concurrently) and its "source" field gives the root of
+    its network. Returns a mapping from the full name of every repository in
+    a network that has at least one fork in the list (including the root
+    itself, if listed) to the network's root repository.
+    """
+    forks = [repo for repo in repos if repo.fork]
+    with ThreadPoolExecutor(max_workers=client.max_concurrent_pages) as executor:
+        details = list(
+            executor.map(lambda repo: client.get(f"/repos/{repo.full_name}").json(), forks)
+        )
+
+    networks: Dict[str, RepoInfo] = {}
+    roots: Dict[str, RepoInfo] = {}
+    for fork, detail in zip(forks, details):
+        source = detail.get("source")
+        if source is None:
+            continue
+        root = roots.setdefault(source["full_name"], repo_info_from_api(source))
+        networks[fork.full_name] = root
+    for repo in repos:
+        if repo.full_name in roots:
+            networks[repo.full_name] = roots[repo.full_name]
+    return networks
@@ -0,0 +1,147 @@
+import dataclasses
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+from pytypes.repo_info import RepoInfo
+from pytypes.repo_result import RepoResult, RepoStatus
+
+JOURNAL_NAME = ".starcloner-journal.jsonl"
+
+
+def journal_name(shard: Optional[Tuple[int, int]] = None) -> str:
+    """
+    File name of the journal; each --shard I/N instance keeps its own
+    (.starcloner-journal.IofN.jsonl), so shards can share an output directory.
+    """
+    if shard is None:
+        return JOURNAL_NAME
+    return f".starcloner-journal.{shard[0]}of{shard[1]}.jsonl"
+
+
+class RunJournal:
+    """
+    Append-only JSONL journal of a sync run, kept in the output directory so
+    that an interrupted run can be continued with --resume. Entries:
+      {"event": "start", "run": {...}}       command and target of the run
+      {"event": "page", "key": ..., ...}     an API page fetched during listing
+      {"event": "plan", "repos": [...]}      the repositories to sync, in order
+      {"event": "done", "repo": ..., ...}    a repository that finished
+    Every entry is flushed and fsynced, so after a crash the journal is
+    complete up to the last finished step. On resume, a recorded plan is
+    synced as it is, without listing again; before the plan was recorded,
+    recorded pages are replayed instead of requested again. Finished
+    repositories are skipped. The journal is deleted when a run completes.
+    """
+
+    def __init__(self, path: Path, run: Dict[str, Any], resume: bool = False) -> None:
+        self.path = path
+        self.resumed = False
+        self.planned: Optional[List[RepoInfo]] = None
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        self._done: Set[str] = set()
+        self._lock = threading.Lock()
+        if resume:
+            self._load(run)
+        self._file = open(path, "a" if self.resumed else "w", encoding="utf-8")
+        if not self.resumed:
+            self._append({"event": "start", "run": run})
+
+    @classmethod
+    def for_output_dir(
+        cls,
+        target_dir: Path,
+        run: Dict[str, Any],
+        resume: bool = False,
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> "RunJournal":
+        target_dir.mkdir(parents=True, exist_ok=True)
+        return cls(target_dir / journal_name(shard), run, resume)
+
+    def _load(self, run: Dict[str, Any]) -> None:
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return
+        entries = []
+        valid_bytes = 0
+        for line in data.splitlines(keepends=True):
+            # A crash can leave a torn last line behind; it's dropped.
+            if not line.endswith(b"\n"):
+                break
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break
+            valid_bytes += len(line)
+        if not entries or entries[0] != {"event": "start", "run": run}:
+            # Missing, or written by a different command: start over.
+            return
+        os.truncate(self.path, valid_bytes)
+        self.resumed = True
+        for entry in entries[1:]:
+            if entry["event"] == "page":
+                self._pages[entry["key"]] = entry
+            elif entry["event"] == "plan":
+                self.planned = [RepoInfo(**repo) for repo in entry["repos"]]
+            elif entry["event"] == "done":
+                self._done.add(entry["repo"])
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    @property
+    def done_count(self) -> int:
+        return len(self._done)
+
+    def page(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        The recorded page ({"body": ..., "link": ...}) for a request key, if any.
+        """
+        return self._pages.get(key)
+
+    def record_page(self, key: str, body: str, link: Optional[str]) -> None:
+        entry = {"event": "page", "key": key, "body": body, "link": link}
+        self._pages[key] = entry
+        self._append(entry)
+
+    def record_plan(self, repos: List[RepoInfo]) -> None:
+        """
+        Record the filtered repositories to sync, in processing order.
+        """
+        self.planned = list(repos)
+        self._append(
+            {"event": "plan", "repos": [dataclasses.asdict(repo) for repo in repos]}
+        )
+
+    def is_done(self, full_name: str) -> bool:
+        return full_name in self._done
+
+    def record_result(self, result: RepoResult) -> None:
+        """
+        Record a finished repository. Failures aren't recorded, so that a
+        resumed run retries them.
+        """
+        if result.status is RepoStatus.FAILED:
+            return
+        self._done.add(result.full_name)
+        self._append(
+            {"event": "done", "repo": result.full_name, "status": result.status.value}
+        )
+
+    def close(self) -> None:
+        """
+        Close the journal but keep it on disk for --resume.
+        """
+        self._file.close()
+
+    def finish(self) -> None:
+        """
+        Close and delete the journal after a completed run.
+        """
+        self._file.close()
+        self.path.unlink(missing_ok=True)
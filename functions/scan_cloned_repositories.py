@@ -0,0 +1,100 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+INDEX_NAME = ".starcloner-index.json"
+INDEX_VERSION = 1
+DEFAULT_SCAN_JOBS = 8
+# A directory modified this recently may change again within the same mtime
+# tick, so its scan result isn't trusted on the next listing.
+RACY_MTIME_NS = 2 * 1_000_000_000
+
+
+def _is_git_repository(path: str, name: str) -> bool:
+    # ".git" is a directory, or a file for worktrees and submodules.
+    if os.path.exists(os.path.join(path, ".git")):
+        return True
+    # Bare mirrors (<repo>.git) keep HEAD at the top level.
+    return name.endswith(".git") and os.path.isfile(os.path.join(path, "HEAD"))
+
+
+def _scan_owner(owner_path: str) -> List[str]:
+    repos = []
+    with os.scandir(owner_path) as entries:
+        for entry in entries:
+            # Dot-entries are unfinished clones (.<repo>.partial).
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            if _is_git_repository(entry.path, entry.name):
+                repos.append(entry.name)
+    return sorted(repos)
+
+
+def _load_index(path: Path) -> Dict[str, Any]:
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return index if index.get("version") == INDEX_VERSION else {}
+
+
+def _write_index(path: Path, owners: Dict[str, Dict[str, Any]]) -> None:
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        tmp_path.write_text(
+            json.dumps({"version": INDEX_VERSION, "owners": owners}), encoding="utf-8"
+        )
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only output directory just means there is no index.
+        pass
+
+
+def scan_cloned_repositories(
+    target_dir: Path, jobs: int = DEFAULT_SCAN_JOBS, use_index: bool = True
+) -> List[Tuple[str, str]]:
+    """
+    Return (owner, directory name) pairs of the git repositories in
+    target_dir/<owner>/<repo>, sorted by owner and name.
+    Owner directories are scanned concurrently with os.scandir, and only
+    directories with a .git entry (or bare repositories named <repo>.git) are
+    reported. The result of each owner scan is kept in an index file in
+    target_dir together with the owner directory's mtime; an owner is only
+    rescanned when its mtime changed, i.e. a repository was added, removed or
+    renamed. Dot-directories (StarCloner's own data) are skipped.
+    """
+    index_path = target_dir / INDEX_NAME
+    cached_owners = _load_index(index_path).get("owners", {}) if use_index else {}
+    with os.scandir(target_dir) as entries:
+        owners = [
+            entry.name
+            for entry in entries
+            if not entry.name.startswith(".") and entry.is_dir()
+        ]
+
+    def _owner_entry(owner: str) -> Tuple[str, Optional[Dict[str, Any]], bool]:
+        owner_path = os.path.join(target_dir, owner)
+        try:
+            mtime_ns = os.stat(owner_path).st_mtime_ns
+            cached = cached_owners.get(owner)
+            if cached is not None and cached["mtime_ns"] == mtime_ns:
+                return owner, cached, False
+            repos = _scan_owner(owner_path)
+            if time.time_ns() - mtime_ns < RACY_MTIME_NS:
+                mtime_ns = -1
+            return owner, {"mtime_ns": mtime_ns, "repos": repos}, True
+        except FileNotFoundError:
+            # Removed while scanning.
+            return owner, None, True
+
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        scanned = list(executor.map(_owner_entry, owners))
+
+    index = {owner: entry for owner, entry, _ in scanned if entry is not None}
+    changed = any(rescanned for _, _, rescanned in scanned)
+    if use_index and (changed or index.keys() != cached_owners.keys()):
+        _write_index(index_path, index)
+    return [(owner, name) for owner in sorted(index) for name in index[owner]["repos"]]
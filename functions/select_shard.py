@@ -0,0 +1,51 @@
+import hashlib
+from typing import Iterable, Iterator, List
+from pytypes.repo_info import RepoInfo
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big")
+
+
+def _shard_key(repo: RepoInfo) -> str:
+    # The numeric id survives renames and transfers; the name is the fallback.
+    if repo.repo_id is not None:
+        return f"id:{repo.repo_id}"
+    return f"name:{repo.full_name.lower()}"
+
+
+def shard_of(repo: RepoInfo, count: int, mode: str = "modulo") -> int:
+    """
+    The shard (1..count) a repository belongs to. The assignment only
+    depends on the repository, so independent instances agree on it.
+      - modulo: hash mod count. Evenly balanced, but changing count moves
+        almost every repository to another shard.
+      - consistent: rendezvous (highest random weight) hashing. Each shard
+        draws a weight per repository and the highest wins, so going from N
+        to N + 1 shards only moves the ~1/(N + 1) repositories the new shard
+        wins, and removing a shard only moves that shard's repositories.
+    """
+    key = _shard_key(repo)
+    if mode == "consistent":
+        return max(range(1, count + 1), key=lambda shard: _hash(f"{shard}:{key}"))
+    return _hash(key) % count + 1
+
+
+def iter_select_shard(
+    repos: Iterable[RepoInfo], index: int, count: int, mode: str = "modulo"
+) -> Iterator[RepoInfo]:
+    """
+    Lazily keep the repositories of shard index (1..count).
+    """
+    return (repo for repo in repos if shard_of(repo, count, mode) == index)
+
+
+def select_shard(
+    repos: List[RepoInfo], index: int, count: int, mode: str = "modulo"
+) -> List[RepoInfo]:
+    """
+    Keep the repositories of shard index (1..count), so that count instances
+    started with --shard 1/count ... count/count split the list between them
+    without coordinating.
+    """
+    return list(iter_select_shard(repos, index, count, mode))
@@ -0,0 +1,233 @@
+import dataclasses
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+from pytypes.clone_options import CloneOptions
+from pytypes.repo_info import RepoInfo
+from pytypes.repo_result import RepoResult, RepoStatus
+from pytypes.repo_state import RepoState
+from functions.read_head import read_head
+
+STATE_DB_NAME = ".starcloner.db"
+
+
+def state_db_name(shard: Optional[Tuple[int, int]] = None) -> str:
+    """
+    File name of the state database; each --shard I/N instance keeps its own
+    (.starcloner.IofN.db), so that shards sharing an output directory, possibly
+    on a network filesystem, never open the same SQLite database.
+    """
+    if shard is None:
+        return STATE_DB_NAME
+    return f".starcloner.{shard[0]}of{shard[1]}.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    repo_id INTEGER PRIMARY KEY,
+    full_name TEXT NOT NULL,
+    clone_url TEXT NOT NULL,
+    local_path TEXT NOT NULL,
+    pushed_at TEXT,
+    head TEXT,
+    synced_at REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    clone_options TEXT
+);
+CREATE TABLE IF NOT EXISTS stars (
+    username TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    starred_at TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    PRIMARY KEY (username, full_name)
+);
+CREATE TABLE IF NOT EXISTS star_sync (
+    username TEXT PRIMARY KEY,
+    newest_starred_at TEXT,
+    full_sync_at REAL NOT NULL
+);
+"""
+
+# A skip is only ever recorded after the local copy was verified up to date.
+_SUCCESS_OUTCOMES = (
+    RepoStatus.CLONED.value,
+    RepoStatus.PULLED.value,
+    RepoStatus.SKIPPED.value,
+)
+
+
+class StateStore:
+    """
+    SQLite database of synced repositories, kept in the output directory and
+    keyed by GitHub repository id. It remembers each repository's last seen
+    pushed_at, the HEAD after the last sync and the last outcome, so that
+    repositories that haven't changed upstream can be skipped without
+    spawning git. It also keeps each user's starred list, so that star syncs
+    can stop paging at the newest already-known star.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        # WAL keeps the per-repository commits cheap on large runs.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._conn.commit()
+
+    @classmethod
+    def for_output_dir(
+        cls, target_dir: Path, shard: Optional[Tuple[int, int]] = None
+    ) -> "StateStore":
+        target_dir.mkdir(parents=True, exist_ok=True)
+        return cls(target_dir / state_db_name(shard))
+
+    def __enter__(self) -> "StateStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _migrate(self) -> None:
+        """
+        Add columns introduced after a database was created.
+        """
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(repos)")}
+        if "clone_options" not in columns:
+            self._conn.execute("ALTER TABLE repos ADD COLUMN clone_options TEXT")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, repo_id: int) -> Optional[RepoState]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT repo_id, full_name, clone_url, local_path, pushed_at, head, "
+                "synced_at, outcome, clone_options FROM repos WHERE repo_id = ?",
+                (repo_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        clone_options = CloneOptions(**json.loads(row[8])) if row[8] else None
+        return RepoState(*row[:8], clone_options=clone_options)
+
+    def is_up_to_date(self, repo: RepoInfo) -> bool:
+        """
+        True if the last sync of the repository succeeded and its upstream
+        pushed_at hasn't moved since.
+        """
+        if repo.repo_id is None or repo.pushed_at is None:
+            return False
+        state = self.get(repo.repo_id)
+        return (
+            state is not None
+            and state.outcome in _SUCCESS_OUTCOMES
+            and state.pushed_at == repo.pushed_at
+        )
+
+    def record(
+        self,
+        repo: RepoInfo,
+        result: RepoResult,
+        local_path: Path,
+        clone_options: Optional[CloneOptions] = None,
+    ) -> None:
+        """
+        Remember the outcome of a clone/pull, and the clone mode used.
+        """
+        if repo.repo_id is None:
+            return
+        head = read_head(local_path) if result.status != RepoStatus.FAILED else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO repos (repo_id, full_name, clone_url, "
+                "local_path, pushed_at, head, synced_at, outcome, clone_options) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    repo.repo_id,
+                    repo.full_name,
+                    repo.clone_url,
+                    str(local_path),
+                    repo.pushed_at,
+                    head,
+                    time.time(),
+                    result.status.value,
+                    json.dumps(dataclasses.asdict(clone_options))
+                    if clone_options is not None
+                    else None,
+                ),
+            )
+            self._conn.commit()
+
+    def get_star_sync(self, username: str) -> Optional[Tuple[Optional[str], float]]:
+        """
+        Return (newest known starred_at, time of the last full star sync) for
+        a user, or None if their stars were never synced.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT newest_starred_at, full_sync_at FROM star_sync "
+                "WHERE username = ?",
+                (username,),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def replace_stars(
+        self, username: str, stars: List[Tuple[str, RepoInfo]]
+    ) -> None:
+        """
+        Store the complete starred list of a user (a full pass), dropping
+        repositories that have been unstarred since.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM stars WHERE username = ?", (username,))
+            self._insert_stars(username, stars)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO star_sync "
+                "(username, newest_starred_at, full_sync_at) VALUES (?, ?, ?)",
+                (username, max((s for s, _ in stars), default=None), time.time()),
+            )
+            self._conn.commit()
+
+    def add_stars(self, username: str, stars: List[Tuple[str, RepoInfo]]) -> None:
+        """
+        Add newly starred repositories found by an incremental pass, or store
+        the current data of already known ones.
+        """
+        if not stars:
+            return
+        with self._lock:
+            self._insert_stars(username, stars)
+            self._conn.execute(
+                "UPDATE star_sync SET newest_starred_at = "
+                "MAX(COALESCE(newest_starred_at, ''), ?) WHERE username = ?",
+                (max(s for s, _ in stars), username),
+            )
+            self._conn.commit()
+
+    def load_stars(self, username: str) -> List[Tuple[str, RepoInfo]]:
+        """
+        Return the stored starred list of a user, newest star first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT starred_at, repo FROM stars WHERE username = ? "
+                "ORDER BY starred_at DESC",
+                (username,),
+            ).fetchall()
+        return [(starred_at, RepoInfo(**json.loads(repo))) for starred_at, repo in rows]
+
+    def _insert_stars(self, username: str, stars: List[Tuple[str, RepoInfo]]) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO stars (username, full_name, starred_at, repo) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (username, repo.full_name, starred_at, json.dumps(dataclasses.asdict(repo)))
+                for starred_at, repo in stars
+            ],
+        )
@@ -0,0 +1,234 @@
+import dataclasses
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+from pytypes.rate_limit_budget import RateLimitBudget
+from pytypes.repo_result import RepoResult, RepoStatus
+from pytypes.token_usage import TokenUsage
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def _write_atomically(path: Path, text: str) -> None:
+    # node_exporter may read the file at any time, so never expose a partial one.
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+class SyncMetrics:
+    """
+    Collects the metrics of one sync run: GitHub API requests (count,
+    latency, pages, bytes, remaining rate limit), wall time per phase
+    (fetch, filter, process, ...) and per-repository outcomes and git
+    durations. GitHubClient reports every request here; the phases and
+    results are recorded by main.
+    The collected metrics are written as a JSON report and/or as a
+    Prometheus textfile for node_exporter's textfile collector.
+    All methods are thread-safe.
+    """
+
+    def __init__(self, command: str) -> None:
+        self.command = command
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._request_seconds: List[float] = []
+        self._request_statuses: Counter = Counter()
+        self._pages = 0
+        self._cached_pages = 0
+        self._bytes = 0
+        self._rate_limit = RateLimitBudget()
+        self._phases: Dict[str, float] = {}
+        self._results: List[RepoResult] = []
+        self._tokens: List[TokenUsage] = []
+
+    def record_request(self, status_code: int, seconds: float, size: int) -> None:
+        """
+        Record one HTTP request sent to the API (including retries).
+        """
+        with self._lock:
+            self._request_seconds.append(seconds)
+            self._request_statuses[status_code] += 1
+            self._bytes += size
+
+    def record_page(self, from_cache: bool) -> None:
+        """
+        Record one API page handed to a fetcher.
+        """
+        with self._lock:
+            self._pages += 1
+            if from_cache:
+                self._cached_pages += 1
+
+    def record_rate_limit(self, budget: RateLimitBudget) -> None:
+        with self._lock:
+            self._rate_limit = budget
+
+    def record_token_usage(self, usage: List[TokenUsage]) -> None:
+        with self._lock:
+            self._tokens = list(usage)
+
+    def record_results(self, results: List[RepoResult]) -> None:
+        with self._lock:
+            self._results.extend(results)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measure the wall time of a phase; repeated phases add up.
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._phases[name] = (
+                    self._phases.get(name, 0.0) + time.monotonic() - start
+                )
+
+    def report(self) -> Dict[str, Any]:
+        """
+        The metrics as a JSON-serializable dict.
+        """
+        with self._lock:
+            latencies = sorted(self._request_seconds)
+            counts = Counter(result.status for result in self._results)
+            return {
+                "command": self.command,
+                "started_at": self.started_at,
+                "wall_seconds": time.time() - self.started_at,
+                "phases": dict(self._phases),
+                "api": {
+                    "requests": len(latencies),
+                    "statuses": {
+                        str(code): n
+                        for code, n in sorted(self._request_statuses.items())
+                    },
+                    "seconds_total": sum(latencies),
+                    "seconds_p50": _percentile(latencies, 0.5),
+                    "seconds_p95": _percentile(latencies, 0.95),
+                    "seconds_max": latencies[-1] if latencies else 0.0,
+                    "pages": self._pages,
+                    "pages_from_cache": self._cached_pages,
+                    "bytes": self._bytes,
+                    "rate_limit_remaining": self._rate_limit.remaining,
+                    "rate_limit_limit": self._rate_limit.limit,
+                    "tokens": [dataclasses.asdict(usage) for usage in self._tokens],
+                },
+                "repos": {status.value: counts[status] for status in RepoStatus},
+                "git_seconds_total": sum(r.duration for r in self._results),
+                "repo_results": [
+                    {
+                        "full_name": r.full_name,
+                        "status": r.status.value,
+                        "seconds": r.duration,
+                        "reason": r.reason,
+                    }
+                    for r in self._results
+                ],
+            }
+
+    def write_json(self, path: Path) -> None:
+        _write_atomically(path, json.dumps(self.report(), indent=2) + "\n")
+
+    def write_textfile(self, path: Path) -> None:
+        """
+        Write the metrics in the Prometheus text format (for node_exporter's
+        --collector.textfile.directory). Per-repository results are
+        aggregated; only the JSON report lists them individually.
+        """
+        report = self.report()
+        api = report["api"]
+        label = f'command="{self.command}"'
+        lines = []
+
+        def metric(
+            name: str, kind: str, help_text: str, samples: Dict[str, Any]
+        ) -> None:
+            lines.append(f"# HELP starcloner_{name} {help_text}")
+            lines.append(f"# TYPE starcloner_{name} {kind}")
+            for labels, value in samples.items():
+                lines.append(f"starcloner_{name}{{{labels}}} {value}")
+
+        metric(
+            "last_run_timestamp_seconds",
+            "gauge",
+            "Start time of the last sync run.",
+            {label: report["started_at"]},
+        )
+        metric(
+            "run_seconds",
+            "gauge",
+            "Wall time of the last sync run.",
+            {label: report["wall_seconds"]},
+        )
+        metric(
+            "phase_seconds",
+            "gauge",
+            "Wall time per phase of the last sync run.",
+            {f'{label},phase="{name}"': s for name, s in report["phases"].items()},
+        )
+        metric(
+            "api_requests",
+            "gauge",
+            "GitHub API requests sent in the last run, by HTTP status.",
+            {f'{label},code="{code}"': n for code, n in api["statuses"].items()},
+        )
+        metric(
+            "api_request_seconds",
+            "gauge",
+            "Total GitHub API request latency in the last run.",
+            {label: api["seconds_total"]},
+        )
+        metric(
+            "api_pages",
+            "gauge",
+            "API pages listed in the last run.",
+            {label: api["pages"]},
+        )
+        metric(
+            "api_response_bytes",
+            "gauge",
+            "Bytes of API responses received in the last run.",
+            {label: api["bytes"]},
+        )
+        if api["rate_limit_remaining"] is not None:
+            metric(
+                "api_rate_limit_remaining",
+                "gauge",
+                "Remaining GitHub API requests at the end of the last run.",
+                {label: api["rate_limit_remaining"]},
+            )
+        if len(api["tokens"]) > 1:
+            metric(
+                "api_token_requests",
+                "gauge",
+                "GitHub API requests sent with each pooled token in the last run.",
+                {
+                    f'{label},token="{usage["label"]}"': usage["requests"]
+                    for usage in api["tokens"]
+                },
+            )
+        metric(
+            "repos",
+            "gauge",
+            "Repositories per outcome in the last run.",
+            {f'{label},status="{s}"': n for s, n in report["repos"].items()},
+        )
+        metric(
+            "git_seconds",
+            "gauge",
+            "Total git time over all repositories in the last run.",
+            {label: report["git_seconds_total"]},
+        )
+        _write_atomically(path, "\n".join(lines) + "\n")
@@ -0,0 +1,318 @@
+import argparse
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+from functions.filter_repositories import filter_repositories, iter_filter_repositories
+from functions.print_repositories import print_repositories
+from functions.confirm_action_message import confirm_action_message
+from functions.process_repositories import (
+    process_repositories,
+    process_repository_stream,
+)
+from functions.print_sync_summary import print_sync_summary
+from functions.get_user_confirmation import get_user_confirmation
+from functions.fetch_repos_by_subcommand import (
+    fetch_repos_by_subcommand,
+    iter_repos_by_subcommand,
+)
+from functions.github_client import GitHubClient
+from functions.http_cache import HttpCache
+from functions.state_store import StateStore
+from functions.run_journal import RunJournal
+from functions.sync_metrics import SyncMetrics
+from functions.trace_recorder import start_tracing, stop_tracing, trace_span
+from functions.order_repositories import order_repositories
+from functions.read_tokens import read_tokens
+from functions.select_shard import iter_select_shard, select_shard
+from functions.print_token_usage import print_token_usage
+from functions.token_pool import TokenPool
+from functions.resolve_fork_networks import resolve_fork_networks
+from functions.local_repo_path import local_repo_path
+from functions.prepare_object_pools import prepare_object_pools
+from pytypes.clone_options import CloneOptions
+from pytypes.repo_info import RepoInfo
+from pytypes.github_api_error import GitHubApiError
+
+
+def sync_repositories(args: argparse.Namespace) -> None:
+    """
+    Run the star, repo and org subcommands: fetch, filter, confirm and
+    clone/pull, with the state store, run journal, metrics and trace of the
+    run set up around it.
+    """
+    # Read GitHub tokens from the environment / token file (if present)
+    tokens = read_tokens(args.token_file)
+    if len(tokens) > 1:
+        print(
+            f"{len(tokens)} authentication tokens loaded; "
+            "API requests are spread across them."
+        )
+    elif tokens and args.token_file:
+        print(f"Authentication token loaded from {args.token_file}.")
+    elif tokens:
+        print("Authentication token loaded from environment variable.")
+    else:
+        print("No authentication token found. Proceeding without authentication.")
+    token_pool = TokenPool(tokens)
+
+    target_dir = Path(args.output_dir).resolve()
+    # A dry run must leave the output directory untouched, so it neither
+    # creates nor updates the state database (nor the stored star list).
+    state = (
+        None
+        if args.no_state or args.dry_run
+        else StateStore.for_output_dir(target_dir, shard=args.shard)
+    )
+    metrics = None
+    if args.metrics_json or args.metrics_textfile:
+        metrics = SyncMetrics(args.command)
+    tracer = start_tracing() if args.trace else None
+    journal = None
+    if not args.dry_run:
+        run = {
+            "command": args.command,
+            "name": args.orgname if args.command == "org" else args.username,
+        }
+        if args.shard is not None:
+            run["shard"] = f"{args.shard[0]}/{args.shard[1]} {args.shard_mode}"
+        journal = RunJournal.for_output_dir(
+            target_dir, run=run, resume=args.resume, shard=args.shard
+        )
+        if journal.resumed:
+            print(
+                f"Resuming interrupted run: {journal.done_count} repositories "
+                "already done."
+            )
+        elif args.resume:
+            print("No interrupted run to resume; starting a new run.")
+    try:
+        _sync_with_client(args, token_pool, target_dir, state, journal, metrics)
+    except SystemExit as e:
+        # Exiting with 0 ("no repositories match", a canceled prompt) ends the
+        # run; there is nothing to resume.
+        if journal is not None:
+            if e.code in (0, None):
+                journal.finish()
+            else:
+                journal.close()
+        raise
+    except BaseException:
+        # Keep the journal so that the run can be continued with --resume.
+        if journal is not None:
+            journal.close()
+        raise
+    else:
+        if journal is not None:
+            journal.finish()
+    finally:
+        if state is not None:
+            state.close()
+        if len(token_pool) > 1:
+            print_token_usage(token_pool.usage())
+        if metrics is not None:
+            metrics.record_token_usage(token_pool.usage())
+            _write_metrics(args, metrics)
+        if tracer is not None:
+            stop_tracing()
+            tracer.write(Path(args.trace))
+
+
+def _sync_with_client(
+    args: argparse.Namespace,
+    token_pool: TokenPool,
+    target_dir: Path,
+    state: Optional[StateStore],
+    journal: Optional[RunJournal],
+    metrics: Optional[SyncMetrics],
+) -> None:
+    """
+    Fetch, filter, confirm and clone/pull for the star, repo and org subcommands.
+    """
+    cache = None if args.no_cache else HttpCache()
+    with GitHubClient(
+        None, cache=cache, journal=journal, metrics=metrics, token_pool=token_pool
+    ) as client:
+        try:
+            if args.stream:
+                _stream_and_process(args, client, target_dir, state, journal, metrics)
+            else:
+                _fetch_and_process(args, client, target_dir, state, journal, metrics)
+        except GitHubApiError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            print("Response body:", e.body, file=sys.stderr)
+            sys.exit(1)
+
+
+def _write_metrics(args: argparse.Namespace, metrics: SyncMetrics) -> None:
+    if args.metrics_json:
+        metrics.write_json(Path(args.metrics_json))
+    if args.metrics_textfile:
+        metrics.write_textfile(Path(args.metrics_textfile))
+
+
+@contextmanager
+def _phase(metrics: Optional[SyncMetrics], name: str) -> Iterator[None]:
+    with trace_span(name, "phase"):
+        if metrics is None:
+            yield
+        else:
+            with metrics.phase(name):
+                yield
+
+
+def _clone_options(args: argparse.Namespace) -> CloneOptions:
+    return CloneOptions(
+        depth=args.depth,
+        filter=args.filter,
+        single_branch=args.single_branch,
+        mirror=args.mirror,
+    )
+
+
+def _fetch_and_plan(
+    args: argparse.Namespace,
+    client: GitHubClient,
+    state: Optional[StateStore],
+    journal: Optional[RunJournal],
+    metrics: Optional[SyncMetrics],
+) -> List[RepoInfo]:
+    """
+    Fetch, filter and order the repositories to sync, and record them as the
+    run's plan in the journal.
+    """
+    # 1) Fetch repositories
+    with _phase(metrics, "fetch"):
+        all_repos = fetch_repos_by_subcommand(args, client, state)
+    if not all_repos:
+        print("No repositories found or an error occurred.")
+        sys.exit(0)
+
+    # 2) Filter repositories
+    with _phase(metrics, "filter"):
+        filtered_repos = filter_repositories(args, all_repos)
+        if args.shard is not None:
+            index, count = args.shard
+            filtered_repos = select_shard(
+                filtered_repos, index, count, args.shard_mode
+            )
+            print(
+                f"Shard {index}/{count} ({args.shard_mode}): "
+                f"{len(filtered_repos)} repositories."
+            )
+    if not filtered_repos:
+        print("No repositories match the specified criteria.")
+        sys.exit(0)
+
+    filtered_repos = order_repositories(filtered_repos, args.order)
+    if journal is not None:
+        journal.record_plan(filtered_repos)
+    return filtered_repos
+
+
+def _fetch_and_process(
+    args: argparse.Namespace,
+    client: GitHubClient,
+    target_dir: Path,
+    state: Optional[StateStore],
+    journal: Optional[RunJournal],
+    metrics: Optional[SyncMetrics],
+) -> None:
+    if journal is not None and journal.planned is not None:
+        # The interrupted run got as far as its plan: sync exactly that, so a
+        # changed listing can't add or drop repositories halfway through.
+        filtered_repos = journal.planned
+        print(
+            f"Resuming the recorded plan of {len(filtered_repos)} repositories "
+            "without listing again."
+        )
+    else:
+        filtered_repos = _fetch_and_plan(args, client, state, journal, metrics)
+
+    # 3) Print repository list (in processing order, if one was chosen)
+    print_repositories(
+        filtered_repos, order=args.order if args.order != "listing" else None
+    )
+
+    # 4) Confirm action unless --yes is specified
+    if not args.yes:
+        print(confirm_action_message(len(filtered_repos), args.dry_run))
+        if not get_user_confirmation():
+            print("Process canceled.")
+            sys.exit(0)
+    else:
+        print("\n'--yes' specified; skipping confirmation prompt.\n")
+
+    # 5) Prepare shared object pools for fork networks
+    references = None
+    if args.share_objects:
+        # Only new clones can borrow objects, so networks are resolved and
+        # pools prepared just for repositories that aren't cloned yet.
+        to_clone = [
+            repo
+            for repo in filtered_repos
+            if not local_repo_path(repo, target_dir, args.mirror).is_dir()
+        ]
+        if to_clone:
+            with _phase(metrics, "share-objects"):
+                references = prepare_object_pools(
+                    resolve_fork_networks(to_clone, client),
+                    target_dir,
+                    jobs=args.jobs,
+                    dry_run=args.dry_run,
+                )
+
+    # 6) Perform clone or pull operations
+    with _phase(metrics, "process"):
+        results = process_repositories(
+            filtered_repos,
+            target_dir=target_dir,
+            dry_run=args.dry_run,
+            jobs=args.jobs,
+            state=state,
+            check_upstream=args.check_upstream,
+            clone_options=_clone_options(args),
+            references=references,
+            journal=journal,
+        )
+    if metrics is not None:
+        metrics.record_results(results)
+    print_sync_summary(results)
+
+
+def _stream_and_process(
+    args: argparse.Namespace,
+    client: GitHubClient,
+    target_dir: Path,
+    state: Optional[StateStore],
+    journal: Optional[RunJournal],
+    metrics: Optional[SyncMetrics],
+) -> None:
+    """
+    --stream: fetch, filter and clone/pull as one pipeline. Repositories are
+    queued for cloning as soon as their listing page arrives.
+    """
+    print("\n'--stream' specified; processing repositories as they are listed.\n")
+    repos = iter_filter_repositories(
+        args, iter_repos_by_subcommand(args, client, state)
+    )
+    if args.shard is not None:
+        repos = iter_select_shard(repos, *args.shard, args.shard_mode)
+    # Listing and cloning overlap, so the pipeline is timed as one phase.
+    with _phase(metrics, "stream"):
+        results = process_repository_stream(
+            repos,
+            target_dir=target_dir,
+            dry_run=args.dry_run,
+            jobs=args.jobs,
+            state=state,
+            check_upstream=args.check_upstream,
+            clone_options=_clone_options(args),
+            journal=journal,
+        )
+    if metrics is not None:
+        metrics.record_results(results)
+    if not results:
+        print("No repositories match the specified criteria.")
+        return
+    print_sync_summary(results)
@@ -0,0 +1,125 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+from pytypes.rate_limit_budget import RateLimitBudget
+from pytypes.token_usage import TokenUsage
+from functions.rate_limiter import RateLimiter
+
+
+def mask_token(token: Optional[str]) -> str:
+    """
+    A label that identifies a token in output without revealing it.
+    """
+    if not token:
+        return "anonymous"
+    return f"...{token[-4:]}" if len(token) > 8 else "..."
+
+
+class PooledToken:
+    """
+    One credential of a TokenPool with its own rate-limit budget.
+    """
+
+    def __init__(self, token: Optional[str], rate_limiter: RateLimiter) -> None:
+        self.token = token
+        self.rate_limiter = rate_limiter
+        self.requests = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+
+
+class TokenPool:
+    """
+    Spreads GitHub API requests over several tokens (e.g. service accounts),
+    each with its own rate-limit budget and RateLimiter.
+    Every request goes to the token with the most remaining budget (minus the
+    requests already in flight on it) whose limiter isn't paused; when a token
+    runs out or is rate-limited, the next requests move on to the others. Only
+    when every token is exhausted do requests wait, for the earliest reset.
+    Without tokens, the pool holds a single anonymous entry.
+    All methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        tokens: Sequence[str],
+        make_rate_limiter: Callable[[], RateLimiter] = RateLimiter,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.tokens = [
+            PooledToken(token, make_rate_limiter()) for token in (tokens or [None])
+        ]
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def _pick(self) -> PooledToken:
+        now = self._clock()
+        ready = [t for t in self.tokens if t.rate_limiter.ready_at() <= now]
+        if not ready:
+            # Everything is exhausted: wait for whichever token resets first.
+            return min(self.tokens, key=lambda t: t.rate_limiter.ready_at())
+
+        def available(t: PooledToken) -> Tuple[float, int]:
+            remaining = t.rate_limiter.budget.remaining
+            # A token that hasn't answered yet is assumed to have its full budget.
+            if remaining is None:
+                return float("inf"), -t.in_flight
+            return remaining - t.in_flight, -t.in_flight
+
+        return max(ready, key=available)
+
+    @contextmanager
+    def use(self) -> Iterator[PooledToken]:
+        """
+        Pick the token for one request and count it as in flight meanwhile.
+        """
+        with self._lock:
+            token = self._pick()
+            token.in_flight += 1
+            token.requests += 1
+        try:
+            yield token
+        finally:
+            with self._lock:
+                token.in_flight -= 1
+
+    def record_rate_limited(self, token: PooledToken) -> None:
+        with self._lock:
+            token.rate_limited += 1
+
+    @property
+    def budget(self) -> RateLimitBudget:
+        """
+        The combined budget of the tokens that have reported one: remaining
+        and limit add up, reset is the earliest.
+        """
+        budgets = [
+            t.rate_limiter.budget
+            for t in self.tokens
+            if t.rate_limiter.budget.remaining is not None
+        ]
+        if not budgets:
+            return RateLimitBudget()
+        resets = [b.reset for b in budgets if b.reset is not None]
+        return RateLimitBudget(
+            limit=sum(b.limit or 0 for b in budgets),
+            remaining=sum(b.remaining for b in budgets),
+            reset=min(resets) if resets else None,
+        )
+
+    def usage(self) -> List[TokenUsage]:
+        with self._lock:
+            return [
+                TokenUsage(
+                    label=mask_token(t.token),
+                    requests=t.requests,
+                    rate_limited=t.rate_limited,
+                    remaining=t.rate_limiter.budget.remaining,
+                    limit=t.rate_limiter.budget.limit,
+                )
+                for t in self.tokens
+            ]
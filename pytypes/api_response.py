@@ -0,0 +1,45 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Mapping
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+@dataclass
+class ApiResponse:
+    """
+    Holds a successful GitHub API response, either fresh from the network or
+    served from the on-disk HTTP cache.
+    """
+
+    text: str
+    headers: Mapping[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def iter_items(self) -> Iterator[Any]:
+        """
+        Decode a JSON array body one element at a time, so a page of a listing
+        never exists as a whole list of dicts: each item can be converted and
+        dropped before the next one is decoded.
+        """
+        text = self.text
+        pos = _WHITESPACE.match(text).end()
+        if not text.startswith("[", pos):
+            raise json.JSONDecodeError("Expecting '['", text, pos)
+        pos = _WHITESPACE.match(text, pos + 1).end()
+        if text.startswith("]", pos):
+            return
+        while True:
+            item, pos = _DECODER.raw_decode(text, pos)
+            yield item
+            pos = _WHITESPACE.match(text, pos).end()
+            if text.startswith("]", pos):
+                return
+            if not text.startswith(",", pos):
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+            pos = _WHITESPACE.match(text, pos + 1).end()
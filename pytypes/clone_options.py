@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class CloneOptions:
+    """
+    How a repository is cloned and pulled. Recorded per repository so that
+    later runs keep using the mode it was cloned with.
+    """
+
+    depth: Optional[int] = None  # shallow clone with this many commits
+    filter: Optional[str] = None  # partial clone filter, e.g. "blob:none"
+    single_branch: bool = False
+    mirror: bool = False  # bare mirror in <owner>/<repo>.git
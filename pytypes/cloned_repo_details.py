@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ClonedRepoDetails:
+    """
+    State of a local clone, as shown by 'list-cloned --details'.
+    Fields are None when they cannot be determined (e.g. an empty repository
+    or a detached HEAD for branch).
+    """
+
+    full_name: str
+    head: Optional[str] = None
+    branch: Optional[str] = None
+    committed_at: Optional[int] = None  # epoch seconds of the HEAD commit
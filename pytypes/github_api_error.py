@@ -0,0 +1,11 @@
+class GitHubApiError(Exception):
+    """
+    Raised when a GitHub API request fails in a way that retrying won't fix,
+    so that a listing is never silently truncated.
+    """
+
+    def __init__(self, status_code: int, url: str, body: str) -> None:
+        super().__init__(f"GitHub API request to {url} returned {status_code}.")
+        self.status_code = status_code
+        self.url = url
+        self.body = body
@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class MaintenanceResult:
+    """
+    Holds the result of 'maintenance optimize' for one repository.
+    Sizes are the bytes under the repository's objects directory before and
+    after the run.
+    """
+
+    full_name: str
+    ok: bool
+    duration: float = 0.0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    failed_step: Optional[str] = None  # the git command that failed
+    output: str = ""
+
+    @property
+    def reclaimed(self) -> int:
+        return self.bytes_before - self.bytes_after
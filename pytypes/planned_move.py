@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class PlannedMove:
+    """
+    One entry of the move-temp-files plan: move the checkout at src to dst
+    (<base>/<user>/<repo>), unless skip_reason says why it can't be moved.
+    """
+
+    src: Path
+    dst: Optional[Path]
+    skip_reason: str = ""
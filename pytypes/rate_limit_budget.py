@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class RateLimitBudget:
+    """
+    Snapshot of the GitHub API rate-limit budget, as last reported by the
+    X-RateLimit-* response headers. Fields are None until a response is seen.
+    """
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset: Optional[float] = None  # epoch seconds
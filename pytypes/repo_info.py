@@ -1,13 +1,30 @@
+import sys
 from dataclasses import dataclass
+from typing import Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RepoInfo:
     """
     Holds information about a GitHub repository.
+    The optional fields are filled in when the API provides them.
+    Listings can hold hundreds of thousands of these, so the class uses slots
+    instead of a per-instance __dict__, and the strings shared by many
+    repositories (owner names, default branches) are interned. Instances are
+    immutable; use dataclasses.replace to derive a modified copy.
     """
 
     full_name: str
     clone_url: str
     stargazers_count: int
     owner_name: str
+    repo_id: Optional[int] = None  # GitHub's numeric repository id
+    pushed_at: Optional[str] = None  # ISO 8601 timestamp of the last push
+    size: Optional[int] = None  # kilobytes (REST "size", GraphQL "diskUsage")
+    default_branch: Optional[str] = None
+    fork: bool = False
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "owner_name", sys.intern(self.owner_name))
+        if self.default_branch is not None:
+            object.__setattr__(self, "default_branch", sys.intern(self.default_branch))
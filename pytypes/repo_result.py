@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+class RepoStatus(str, Enum):
+    """
+    Outcome of processing a single repository.
+    """
+
+    CLONED = "cloned"
+    PULLED = "pulled"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+@dataclass
+class RepoResult:
+    """
+    Holds the result of a clone/pull operation for one repository.
+    """
+
+    full_name: str
+    status: RepoStatus
+    exit_code: Optional[int] = None
+    duration: float = 0.0
+    output: str = ""
+    reason: str = ""  # why a repository was skipped
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from typing import Optional
+from pytypes.clone_options import CloneOptions
+
+
+@dataclass
+class RepoState:
+    """
+    What StarCloner remembers about a repository from previous runs.
+    """
+
+    repo_id: int
+    full_name: str
+    clone_url: str
+    local_path: str
+    pushed_at: Optional[str]
+    head: Optional[str]
+    synced_at: float
+    outcome: str
+    clone_options: Optional[CloneOptions] = None
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class TokenUsage:
+    """
+    API usage of one token of a TokenPool during a run. The label is the
+    masked token (only its last characters), never the token itself.
+    """
+
+    label: str
+    requests: int = 0
+    rate_limited: int = 0  # 403/429 rate-limit answers
+    remaining: Optional[int] = None
+    limit: Optional[int] = None
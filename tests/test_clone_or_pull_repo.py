@@ -1,8 +1,23 @@
+import subprocess
+import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import call, patch
 from pathlib import Path
 from functions.clone_or_pull_repo import clone_or_pull_repo
+from pytypes.clone_options import CloneOptions
 from pytypes.repo_info import RepoInfo
+from pytypes.repo_result import RepoStatus
+
+
+def _git(*args: str, cwd: Path) -> str:
+    completed = subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=str(cwd),
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return completed.stdout.strip()
 
 
 class TestCloneOrPullRepo(unittest.TestCase):
@@ -23,7 +38,9 @@ class TestCloneOrPullRepo(unittest.TestCase):
         expected_path = target_dir / user_or_org_name / "repo1"
         mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
         mock_run.assert_called_with(
-            ["git", "clone", repo.clone_url], cwd=str(expected_path.parent), check=False
+            ["git", "clone", repo.clone_url, ".repo1.partial"],
+            cwd=str(expected_path.parent),
+            check=False,
         )
 
     @patch("functions.clone_or_pull_repo.subprocess.run")
@@ -43,7 +60,9 @@ class TestCloneOrPullRepo(unittest.TestCase):
         expected_path = target_dir / user_or_org_name / "repo1"
         mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
         mock_run.assert_called_with(
-            ["git", "clone", repo.clone_url], cwd=str(expected_path.parent), check=False
+            ["git", "clone", repo.clone_url, ".repo1.partial"],
+            cwd=str(expected_path.parent),
+            check=False,
         )
 
     @patch("functions.clone_or_pull_repo.subprocess.run")
@@ -64,6 +83,194 @@ class TestCloneOrPullRepo(unittest.TestCase):
             ["git", "-C", str(expected_path), "pull"], check=False
         )
 
+    @patch("functions.clone_or_pull_repo.subprocess.run")
+    @patch("functions.clone_or_pull_repo.Path.is_dir")
+    @patch("functions.clone_or_pull_repo.Path.mkdir")
+    def test_clone_or_pull_repo_shallow(self, mock_mkdir, mock_is_dir, mock_run):
+        repo = RepoInfo(
+            full_name="octocat/repo1",
+            clone_url="https://github.com/octocat/repo1.git",
+            stargazers_count=50,
+            owner_name="octocat",
+        )
+        options = CloneOptions(depth=1, filter="blob:none", single_branch=True)
+
+        mock_is_dir.return_value = False
+        clone_or_pull_repo(repo, Path("/fake/dir"), dry_run=False, options=options)
+        mock_run.assert_called_with(
+            [
+                "git",
+                "clone",
+                "--depth=1",
+                "--filter=blob:none",
+                "--single-branch",
+                repo.clone_url,
+                ".repo1.partial",
+            ],
+            cwd=str(Path("/fake/dir/octocat")),
+            check=False,
+        )
+
+        mock_is_dir.return_value = True
+        mock_run.reset_mock()
+        mock_run.return_value.returncode = 0
+        clone_or_pull_repo(repo, Path("/fake/dir"), dry_run=False, options=options)
+        git = ["git", "-C", str(Path("/fake/dir/octocat/repo1"))]
+        self.assertEqual(
+            mock_run.call_args_list,
+            [
+                call([*git, "fetch", "origin", "HEAD"], check=False),
+                call([*git, "merge", "--ff-only", "FETCH_HEAD"], check=False),
+            ],
+        )
+
+    def _upstream(self, root: Path) -> RepoInfo:
+        upstream = root / "upstream"
+        upstream.mkdir()
+        _git("init", "-b", "main", cwd=upstream)
+        for n in range(3):
+            _git("commit", "--allow-empty", "-m", f"commit {n}", cwd=upstream)
+        return RepoInfo(
+            full_name="octocat/repo1",
+            clone_url=upstream.as_uri(),
+            stargazers_count=0,
+            owner_name="octocat",
+            default_branch="main",
+        )
+
+    def _sync(self, repo: RepoInfo, target_dir: Path, depth=None):
+        return clone_or_pull_repo(
+            repo,
+            target_dir,
+            dry_run=False,
+            capture_output=True,
+            options=CloneOptions(depth=depth),
+        )
+
+    def test_shallow_pull_after_upstream_advanced(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            repo = self._upstream(root)
+            target_dir = root / "target"
+            self.assertEqual(self._sync(repo, target_dir, 1).status, RepoStatus.CLONED)
+
+            _git("commit", "--allow-empty", "-m", "advanced", cwd=root / "upstream")
+            result = self._sync(repo, target_dir, 1)
+
+            self.assertEqual(result.status, RepoStatus.PULLED, result.output)
+            clone = target_dir / "octocat" / "repo1"
+            self.assertEqual(
+                _git("rev-parse", "HEAD", cwd=clone),
+                _git("rev-parse", "HEAD", cwd=root / "upstream"),
+            )
+            # Only the new commit was added; history wasn't deepened.
+            self.assertEqual(_git("rev-list", "--count", "HEAD", cwd=clone), "2")
+
+    def test_depth_pull_keeps_full_clone_and_local_commits(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            repo = self._upstream(root)
+            target_dir = root / "target"
+            self.assertEqual(self._sync(repo, target_dir).status, RepoStatus.CLONED)
+            clone = target_dir / "octocat" / "repo1"
+
+            _git("commit", "--allow-empty", "-m", "advanced", cwd=root / "upstream")
+            self.assertEqual(self._sync(repo, target_dir, 1).status, RepoStatus.PULLED)
+            self.assertEqual(
+                _git("rev-parse", "--is-shallow-repository", cwd=clone), "false"
+            )
+
+            _git("commit", "--allow-empty", "-m", "local", cwd=clone)
+            _git("commit", "--allow-empty", "-m", "diverged", cwd=root / "upstream")
+            local_head = _git("rev-parse", "HEAD", cwd=clone)
+            self.assertEqual(self._sync(repo, target_dir, 1).status, RepoStatus.FAILED)
+            self.assertEqual(_git("rev-parse", "HEAD", cwd=clone), local_head)
+
+    @patch("functions.clone_or_pull_repo.subprocess.run")
+    @patch("functions.clone_or_pull_repo.Path.is_dir")
+    @patch("functions.clone_or_pull_repo.Path.mkdir")
+    def test_clone_or_pull_repo_mirror(self, mock_mkdir, mock_is_dir, mock_run):
+        repo = RepoInfo(
+            full_name="octocat/repo1",
+            clone_url="https://github.com/octocat/repo1.git",
+            stargazers_count=50,
+            owner_name="octocat",
+        )
+        options = CloneOptions(mirror=True)
+
+        mock_is_dir.return_value = False
+        clone_or_pull_repo(repo, Path("/fake/dir"), dry_run=False, options=options)
+        mock_run.assert_called_with(
+            ["git", "clone", "--mirror", repo.clone_url, ".repo1.git.partial"],
+            cwd=str(Path("/fake/dir/octocat")),
+            check=False,
+        )
+
+        mock_is_dir.return_value = True
+        clone_or_pull_repo(repo, Path("/fake/dir"), dry_run=False, options=options)
+        mock_run.assert_called_with(
+            [
+                "git",
+                "-C",
+                str(Path("/fake/dir/octocat/repo1.git")),
+                "remote",
+                "update",
+                "--prune",
+            ],
+            check=False,
+        )
+
+    @patch("functions.clone_or_pull_repo.subprocess.run")
+    @patch("functions.clone_or_pull_repo.Path.is_dir")
+    def test_clone_or_pull_repo_pull_captured(self, mock_is_dir, mock_run):
+        mock_is_dir.return_value = True
+        mock_run.return_value.returncode = 1
+        mock_run.return_value.stderr = "fatal: not a git repository"
+        repo = RepoInfo(
+            full_name="octocat/repo1",
+            clone_url="https://github.com/octocat/repo1.git",
+            stargazers_count=50,
+            owner_name="octocat",
+        )
+        result = clone_or_pull_repo(
+            repo, Path("/fake/dir"), dry_run=False, capture_output=True
+        )
+        mock_run.assert_called_with(
+            ["git", "-C", str(Path("/fake/dir/octocat/repo1")), "pull"],
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.status, RepoStatus.FAILED)
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output, "fatal: not a git repository")
+
+    @patch("functions.clone_or_pull_repo.subprocess.run")
+    @patch("functions.clone_or_pull_repo.shutil.rmtree")
+    def test_clone_or_pull_repo_clones_into_partial_dir(self, mock_rmtree, mock_run):
+        repo = RepoInfo(
+            full_name="octocat/repo1",
+            clone_url="https://github.com/octocat/repo1.git",
+            stargazers_count=50,
+            owner_name="octocat",
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target_dir = Path(temp_dir)
+            leftover = target_dir / "octocat" / ".repo1.partial"
+            leftover.mkdir(parents=True)
+
+            def fake_clone(args, cwd, check):
+                # The leftover of an interrupted clone was removed first.
+                mock_rmtree.assert_called_once_with(leftover)
+                (Path(cwd) / args[-1]).mkdir(exist_ok=True)
+                return subprocess.CompletedProcess(args, 0)
+
+            mock_run.side_effect = fake_clone
+            result = clone_or_pull_repo(repo, target_dir, dry_run=False)
+            self.assertEqual(result.status, RepoStatus.CLONED)
+            self.assertTrue((target_dir / "octocat" / "repo1").is_dir())
+            self.assertFalse(leftover.exists())
+
 
 if __name__ == "__main__":
     unittest.main()
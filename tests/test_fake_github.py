@@ -0,0 +1,29 @@
+import unittest
+from benchmarks.fake_github import FakeGitHub, FakeGitHubConfig, repo_object
+from functions.fetch_starred_repositories import fetch_starred_repositories
+from functions.fetch_org_repositories import fetch_org_repositories
+from functions.github_client import GitHubClient
+
+
+class TestFakeGitHub(unittest.TestCase):
+    def test_listing_through_fake_api(self):
+        repos = [
+            repo_object("octocat", f"repo{n}", f"file:///repos/repo{n}.git", n)
+            for n in range(250)
+        ]
+        with FakeGitHub(FakeGitHubConfig(rate_limit=1000)) as fake:
+            fake.add_repositories("github", repos)
+            fake.add_stars("octocat", [("2024-01-01T00:00:00Z", r) for r in repos])
+            with GitHubClient(None, base_url=fake.base_url) as client:
+                starred = fetch_starred_repositories("octocat", client)
+                owned = fetch_org_repositories("github", client, True, True)
+
+        self.assertEqual([r.full_name for r in starred], [r["full_name"] for r in repos])
+        self.assertEqual(len(owned), 250)
+        self.assertEqual(fake.request_count, 6)
+        # Concurrent pages may arrive out of order, so check the server's window.
+        self.assertEqual(fake.rate_limit_remaining, 994)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,20 @@
+import json
 import unittest
 from unittest.mock import patch, Mock
 from functions.fetch_org_repositories import fetch_org_repositories
+from functions.github_client import GitHubClient
 from pytypes.repo_info import RepoInfo
 
 
 class TestFetchOrgRepositories(unittest.TestCase):
     @patch(
-        "functions.fetch_org_repositories.requests.get",
+        "functions.github_client.requests.Session.get",
     )
     def test_fetch_org_repositories(self, mock_get):
         mock_response_page_1 = Mock()
         mock_response_page_1.status_code = 200
-        mock_response_page_1.json.return_value = [
+        mock_response_page_1.headers = {}
+        mock_response_page_1.text = json.dumps([
             {
                 "full_name": "github/repo1",
                 "clone_url": "https://github.com/github/repo1.git",
@@ -20,15 +23,11 @@ class TestFetchOrgRepositories(unittest.TestCase):
                 "fork": False,
                 "archived": False,
             }
-        ]
-
-        mock_response_page_2 = Mock()
-        mock_response_page_2.status_code = 200
-        mock_response_page_2.json.return_value = []
+        ])
 
-        mock_get.side_effect = [mock_response_page_1, mock_response_page_2]
+        mock_get.side_effect = [mock_response_page_1]
         result = fetch_org_repositories(
-            "github", None, include_forks=False, include_archived=False
+            "github", GitHubClient(None), include_forks=False, include_archived=False
         )
         expected = [
             RepoInfo(
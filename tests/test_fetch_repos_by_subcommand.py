@@ -3,6 +3,7 @@ from unittest.mock import patch
 from functions.fetch_repos_by_subcommand import fetch_repos_by_subcommand
 from argparse import Namespace
 from pytypes.repo_info import RepoInfo
+from functions.github_client import GitHubClient
 
 class TestFetchReposBySubcommand(unittest.TestCase):
     @patch('functions.fetch_repos_by_subcommand.fetch_user_repositories')
@@ -17,25 +18,25 @@ class TestFetchReposBySubcommand(unittest.TestCase):
             )
         ]
 
-        args = Namespace(command="repo", username="user", include_forks=False, include_archived=False)
-        token = "fake-token"
+        args = Namespace(command="repo", username="user", include_forks=False, include_archived=False, api="rest")
+        client = GitHubClient("fake-token")
 
-        repos = fetch_repos_by_subcommand(args, token)
+        repos = fetch_repos_by_subcommand(args, client)
 
         # Assert that the function returns a non-empty list
         self.assertTrue(repos)
         self.assertEqual(len(repos), 1)
         self.assertEqual(repos[0].full_name, "user/repo1")
 
-    @patch('functions.fetch_user_repositories.fetch_user_repositories')
+    @patch('functions.fetch_repos_by_subcommand.fetch_user_repositories')
     def test_fetch_user_repositories_failure(self, mock_fetch_user_repositories):
         # Mock the return value of fetch_user_repositories to simulate an error
         mock_fetch_user_repositories.return_value = []
 
-        args = Namespace(command="repo", username="user", include_forks=False, include_archived=False)
-        token = "fake-token"
+        args = Namespace(command="repo", username="user", include_forks=False, include_archived=False, api="rest")
+        client = GitHubClient("fake-token")
 
-        repos = fetch_repos_by_subcommand(args, token)
+        repos = fetch_repos_by_subcommand(args, client)
 
         # Assert that the function returns an empty list
         self.assertFalse(repos)
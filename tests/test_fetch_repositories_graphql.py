@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import patch, Mock
+from benchmarks.fake_github import FakeGitHub, FakeGitHubConfig, repo_object
+from functions.fetch_repositories_graphql import fetch_repositories_graphql
+from functions.fetch_user_repositories import fetch_user_repositories
+from functions.github_client import GitHubClient
+from pytypes.repo_info import RepoInfo
+
+
+def _page(nodes, has_next, cursor=None) -> Mock:
+    response = Mock(status_code=200, text="", headers={})
+    response.json.return_value = {
+        "data": {
+            "organization": {
+                "repositories": {
+                    "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+                    "nodes": nodes,
+                }
+            }
+        }
+    }
+    return response
+
+
+class TestFetchRepositoriesGraphql(unittest.TestCase):
+    @patch("functions.github_client.requests.Session.post")
+    def test_fetch_org_repositories_graphql(self, mock_post):
+        node = {
+            "nameWithOwner": "github/repo1",
+            "url": "https://github.com/github/repo1",
+            "stargazerCount": 50,
+            "owner": {"login": "github"},
+            "pushedAt": "2024-01-01T00:00:00Z",
+            "diskUsage": 1234,
+            "defaultBranchRef": {"name": "main"},
+        }
+        empty_repo = dict(node, nameWithOwner="github/repo2",
+                          url="https://github.com/github/repo2", defaultBranchRef=None)
+        mock_post.side_effect = [_page([node], True, "c1"), _page([empty_repo], False)]
+
+        result = fetch_repositories_graphql(
+            "org", "github", GitHubClient("token"), include_forks=False, include_archived=True
+        )
+
+        self.assertEqual(
+            result[0],
+            RepoInfo(
+                full_name="github/repo1",
+                clone_url="https://github.com/github/repo1.git",
+                stargazers_count=50,
+                owner_name="github",
+                pushed_at="2024-01-01T00:00:00Z",
+                size=1234,
+                default_branch="main",
+            ),
+        )
+        self.assertIsNone(result[1].default_branch)
+        first_variables = mock_post.call_args_list[0].kwargs["json"]["variables"]
+        self.assertFalse(first_variables["isFork"])
+        self.assertIsNone(first_variables["isArchived"])
+        second_variables = mock_post.call_args_list[1].kwargs["json"]["variables"]
+        self.assertEqual(second_variables["cursor"], "c1")
+
+    def test_user_repositories_match_rest_listing(self):
+        owned = [
+            repo_object("octocat", f"repo{n}", f"file:///repos/repo{n}.git", n)
+            for n in range(150)
+        ]
+        owned[3]["fork"] = True
+        owned[4]["archived"] = True
+        # Listed by GraphQL to the token's owner unless filtered; never by REST.
+        owned[5]["private"] = True
+        collaborated = [repo_object("hubot", "shared", "file:///repos/shared.git", 500)]
+        member = [repo_object("github", "internal", "file:///repos/internal.git", 501)]
+        with FakeGitHub(FakeGitHubConfig(rate_limit=1000)) as fake:
+            fake.add_repositories("octocat", owned)
+            fake.add_affiliated_repositories("octocat", collaborated, "COLLABORATOR")
+            fake.add_affiliated_repositories("octocat", member, "ORGANIZATION_MEMBER")
+            with GitHubClient("token", base_url=fake.base_url) as client:
+                for include_forks, include_archived in [(True, True), (False, False)]:
+                    rest = fetch_user_repositories(
+                        "octocat", client, include_forks, include_archived
+                    )
+                    graphql = fetch_repositories_graphql(
+                        "repo", "octocat", client, include_forks, include_archived
+                    )
+                    self.assertEqual(set(graphql), set(rest))
+                    self.assertIn("hubot/shared", {r.full_name for r in graphql})
+                    self.assertIn("github/internal", {r.full_name for r in graphql})
+        self.assertEqual(len(rest), 149)
+        self.assertNotIn("octocat/repo5", {r.full_name for r in graphql})
+
+
+if __name__ == "__main__":
+    unittest.main()
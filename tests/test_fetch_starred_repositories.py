@@ -1,31 +1,33 @@
+import json
 import unittest
 from unittest.mock import patch, Mock
 from functions.fetch_starred_repositories import fetch_starred_repositories
+from functions.github_client import GitHubClient
 from pytypes.repo_info import RepoInfo
 
 
 class TestFetchStarredRepositories(unittest.TestCase):
     @patch(
-        "functions.fetch_starred_repositories.requests.get",
+        "functions.github_client.requests.Session.get",
     )
     def test_fetch_starred_repositories(self, mock_get):
         mock_response_page_1 = Mock()
         mock_response_page_1.status_code = 200
-        mock_response_page_1.json.return_value = [
+        mock_response_page_1.headers = {}
+        mock_response_page_1.text = json.dumps([
             {
-                "full_name": "octocat/repo1",
-                "clone_url": "https://github.com/octocat/repo1.git",
-                "stargazers_count": 50,
-                "owner": {"login": "octocat"},
+                "starred_at": "2024-01-01T00:00:00Z",
+                "repo": {
+                    "full_name": "octocat/repo1",
+                    "clone_url": "https://github.com/octocat/repo1.git",
+                    "stargazers_count": 50,
+                    "owner": {"login": "octocat"},
+                },
             }
-        ]
-
-        mock_response_page_2 = Mock()
-        mock_response_page_2.status_code = 200
-        mock_response_page_2.json.return_value = []
+        ])
 
-        mock_get.side_effect = [mock_response_page_1, mock_response_page_2]
-        result = fetch_starred_repositories("octocat", None)
+        mock_get.side_effect = [mock_response_page_1]
+        result = fetch_starred_repositories("octocat", GitHubClient(None))
         expected = [
             RepoInfo(
                 full_name="octocat/repo1",
@@ -0,0 +1,107 @@
+import tempfile
+import unittest
+from argparse import Namespace
+from pathlib import Path
+from unittest.mock import patch
+from functions.fetch_starred_repositories_incremental import (
+    fetch_starred_repositories_incremental,
+)
+from functions.fetch_repos_by_subcommand import iter_repos_by_subcommand
+from functions.github_client import GitHubClient
+from functions.state_store import StateStore
+from pytypes.repo_info import RepoInfo
+
+
+def _star(name: str, starred_at: str, pushed_at: str = "2024-01-01T00:00:00Z"):
+    return starred_at, RepoInfo(
+        full_name=f"octocat/{name}",
+        clone_url=f"https://github.com/octocat/{name}.git",
+        stargazers_count=1,
+        owner_name="octocat",
+        pushed_at=pushed_at,
+    )
+
+
+class TestFetchStarredRepositoriesIncremental(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.state = StateStore.for_output_dir(Path(self._tmp.name))
+        self.client = GitHubClient(None)
+
+    def tearDown(self):
+        self.state.close()
+        self._tmp.cleanup()
+
+    @patch("functions.fetch_starred_repositories_incremental.iter_starred_repositories")
+    def test_first_run_is_a_full_pass(self, mock_iter):
+        mock_iter.return_value = iter([_star("b", "2024-02-01"), _star("a", "2024-01-01")])
+        repos = fetch_starred_repositories_incremental("octocat", self.client, self.state)
+        self.assertEqual([r.full_name for r in repos], ["octocat/b", "octocat/a"])
+        mock_iter.assert_called_once_with("octocat", self.client, concurrent=True)
+        self.assertEqual(self.state.get_star_sync("octocat")[0], "2024-02-01")
+
+    @patch("functions.fetch_starred_repositories_incremental.iter_starred_repositories")
+    def test_later_run_stops_at_known_star(self, mock_iter):
+        self.state.replace_stars("octocat", [_star("b", "2024-02-01"), _star("a", "2024-01-01")])
+        consumed = []
+
+        def stars():
+            for star in [
+                _star("c", "2024-03-01"),
+                _star("b", "2024-02-01", pushed_at="2024-04-01T00:00:00Z"),
+                _star("a", "2024-01-01", pushed_at="2024-04-01T00:00:00Z"),
+                _star("z", "2023-12-01"),
+            ]:
+                consumed.append(star[1].full_name)
+                yield star
+
+        mock_iter.return_value = stars()
+        repos = fetch_starred_repositories_incremental("octocat", self.client, self.state)
+
+        mock_iter.assert_called_once_with("octocat", self.client, concurrent=False)
+        self.assertEqual(
+            [r.full_name for r in repos], ["octocat/c", "octocat/b", "octocat/a"]
+        )
+        # Iteration stopped at the first star older than the newest known one.
+        self.assertEqual(consumed, ["octocat/c", "octocat/b", "octocat/a"])
+        # Known stars keep their stored pushed_at, refreshed where they were read.
+        self.assertEqual(
+            [r.pushed_at for r in repos],
+            ["2024-01-01T00:00:00Z", "2024-04-01T00:00:00Z", "2024-01-01T00:00:00Z"],
+        )
+        stored = {repo.full_name: repo for _, repo in self.state.load_stars("octocat")}
+        self.assertEqual(stored["octocat/b"].pushed_at, "2024-04-01T00:00:00Z")
+        self.assertEqual(self.state.get_star_sync("octocat")[0], "2024-03-01")
+
+    @patch("functions.fetch_starred_repositories_incremental.iter_starred_repositories")
+    def test_full_sync_drops_unstarred(self, mock_iter):
+        self.state.replace_stars("octocat", [_star("b", "2024-02-01"), _star("a", "2024-01-01")])
+        mock_iter.return_value = iter([_star("b", "2024-02-01")])
+        repos = fetch_starred_repositories_incremental(
+            "octocat", self.client, self.state, full_sync=True
+        )
+        self.assertEqual([r.full_name for r in repos], ["octocat/b"])
+        self.assertEqual(len(self.state.load_stars("octocat")), 1)
+
+    @patch("functions.fetch_starred_repositories_incremental.iter_starred_repositories")
+    def test_stream_yields_stars_as_they_are_read(self, mock_iter):
+        self.state.replace_stars("octocat", [_star("a", "2024-01-01")])
+        consumed = []
+
+        def stars():
+            for star in [_star("c", "2024-03-01"), _star("b", "2024-02-01")]:
+                consumed.append(star[1].full_name)
+                yield star
+
+        mock_iter.return_value = stars()
+        args = Namespace(command="star", username="octocat", api="rest")
+        repos = iter_repos_by_subcommand(args, self.client, self.state)
+
+        self.assertEqual(next(repos).full_name, "octocat/c")
+        self.assertEqual(consumed, ["octocat/c"])
+        self.assertEqual([r.full_name for r in repos], ["octocat/b", "octocat/a"])
+        self.assertEqual(len(self.state.load_stars("octocat")), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,22 @@
+import dataclasses
+import json
+import sys
 import unittest
 from unittest.mock import patch, Mock
 from functions.fetch_user_repositories import fetch_user_repositories
+from functions.github_client import GitHubClient
 from pytypes.repo_info import RepoInfo
 
 
 class TestFetchUserRepositories(unittest.TestCase):
     @patch(
-        "functions.fetch_user_repositories.requests.get",
+        "functions.github_client.requests.Session.get",
     )
     def test_fetch_user_repositories(self, mock_get):
         mock_response_page_1 = Mock()
         mock_response_page_1.status_code = 200
-        mock_response_page_1.json.return_value = [
+        mock_response_page_1.headers = {}
+        mock_response_page_1.text = json.dumps([
             {
                 "full_name": "octocat/repo1",
                 "clone_url": "https://github.com/octocat/repo1.git",
@@ -20,15 +25,11 @@ class TestFetchUserRepositories(unittest.TestCase):
                 "fork": False,
                 "archived": False,
             }
-        ]
-
-        mock_response_page_2 = Mock()
-        mock_response_page_2.status_code = 200
-        mock_response_page_2.json.return_value = []
+        ])
 
-        mock_get.side_effect = [mock_response_page_1, mock_response_page_2]
+        mock_get.side_effect = [mock_response_page_1]
         result = fetch_user_repositories(
-            "octocat", None, include_forks=False, include_archived=False
+            "octocat", GitHubClient(None), include_forks=False, include_archived=False
         )
         expected = [
             RepoInfo(
@@ -40,6 +41,14 @@ class TestFetchUserRepositories(unittest.TestCase):
         ]
         self.assertEqual(result, expected)
 
+    def test_repo_info_is_compact_and_immutable(self):
+        owner = "".join(["octo", "cat"])  # not a compile-time constant
+        repo = RepoInfo("octocat/a", "url", 0, owner, default_branch="main")
+        self.assertIs(repo.owner_name, sys.intern("octocat"))
+        self.assertFalse(hasattr(repo, "__dict__"))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            repo.pushed_at = "2024-01-01T00:00:00Z"
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,166 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch, Mock
+from functions.github_client import GitHubClient
+from functions.parse_last_page import parse_last_page
+from functions.rate_limiter import RateLimiter
+from functions.run_journal import RunJournal
+from pytypes.api_response import ApiResponse
+from pytypes.github_api_error import GitHubApiError
+
+
+def _response(page: int, last_page: int) -> Mock:
+    response = Mock()
+    response.status_code = 200
+    response.text = json.dumps([{"page": page}])
+    response.headers = {}
+    if page == 1:
+        response.headers = {
+            "Link": (
+                '<https://api.github.com/users/octocat/starred?per_page=100&page=2>; rel="next", '
+                f'<https://api.github.com/users/octocat/starred?per_page=100&page={last_page}>; rel="last"'
+            )
+        }
+    return response
+
+
+class TestGitHubClient(unittest.TestCase):
+    def test_parse_last_page(self):
+        self.assertEqual(parse_last_page(None), 1)
+        self.assertEqual(parse_last_page(""), 1)
+        self.assertEqual(
+            parse_last_page(
+                '<https://api.github.com/orgs/github/repos?page=2>; rel="next", '
+                '<https://api.github.com/orgs/github/repos?page=37>; rel="last"'
+            ),
+            37,
+        )
+
+    def test_session_headers(self):
+        client = GitHubClient("secret")
+        self.assertEqual(client.session.headers["Authorization"], "Bearer secret")
+        self.assertIn("gzip", client.session.headers["Accept-Encoding"])
+        self.assertNotIn("Authorization", GitHubClient(None).session.headers)
+
+    @patch("functions.github_client.requests.Session.get")
+    def test_paginate_in_order(self, mock_get):
+        mock_get.side_effect = lambda url, params: _response(params["page"], 5)
+        with GitHubClient(None) as client:
+            pages = list(client.paginate("/users/octocat/starred", {"per_page": 100}))
+        self.assertEqual(pages, [[{"page": n}] for n in range(1, 6)])
+        # No extra request for an empty page after the last one.
+        self.assertEqual(mock_get.call_count, 5)
+        mock_get.assert_any_call(
+            "https://api.github.com/users/octocat/starred",
+            params={"per_page": 100, "page": 1},
+        )
+
+    @patch("functions.github_client.requests.Session.get")
+    def test_paginate_items_keeps_page_order_with_bounded_window(self, mock_get):
+        in_flight = []
+        lock = threading.Lock()
+
+        def fake_get(url, params):
+            with lock:
+                in_flight.append(params["page"])
+            return _response(params["page"], 30)
+
+        mock_get.side_effect = fake_get
+        with GitHubClient(None, max_concurrent_pages=4) as client:
+            items = client.paginate_items("/users/octocat/starred")
+            self.assertEqual(next(items), {"page": 1})
+            self.assertEqual(next(items), {"page": 2})
+            # Only a window of pages is requested ahead of the consumer.
+            self.assertLessEqual(len(in_flight), 1 + 4 + 1)
+            rest = list(items)
+        self.assertEqual(rest, [{"page": n} for n in range(3, 31)])
+
+    def test_iter_items_decodes_array_incrementally(self):
+        response = ApiResponse(' [ {"a": [1, 2]} ,\n 3, "x" ] ')
+        self.assertEqual(list(response.iter_items()), [{"a": [1, 2]}, 3, "x"])
+        self.assertEqual(list(ApiResponse("[ ]").iter_items()), [])
+        with self.assertRaises(json.JSONDecodeError):
+            list(ApiResponse("[1 2]").iter_items())
+
+    @patch("functions.github_client.requests.Session.get")
+    def test_paginate_raises_on_failed_page(self, mock_get):
+        def fake_get(url, params):
+            if params["page"] == 3:
+                return Mock(status_code=500, text="boom", headers={})
+            return _response(params["page"], 4)
+
+        mock_get.side_effect = fake_get
+        with self.assertRaises(GitHubApiError) as ctx:
+            list(GitHubClient(None).paginate("/users/octocat/starred"))
+        self.assertEqual(ctx.exception.status_code, 500)
+
+    @patch("functions.github_client.requests.Session.get")
+    def test_get_retries_after_rate_limit(self, mock_get):
+        sleeps = []
+        limited = Mock(
+            status_code=403,
+            text="",
+            headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1030"},
+        )
+        ok = _response(2, 2)
+        ok.headers = {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "4600"}
+        mock_get.side_effect = [limited, ok]
+        limiter = RateLimiter(sleep=sleeps.append, clock=lambda: 1000.0)
+        client = GitHubClient("token", rate_limiter=limiter)
+
+        response = client.get("/orgs/github/repos", {"page": 2})
+
+        self.assertEqual(response.json(), [{"page": 2}])
+        self.assertEqual(sleeps, [31.0])
+        self.assertEqual(client.rate_limit.remaining, 4999)
+
+    @patch("functions.github_client.requests.Session.post")
+    def test_graphql_retries_after_rate_limited_error(self, mock_post):
+        def _graphql_response(payload, headers):
+            response = Mock(status_code=200, text=json.dumps(payload), headers=headers)
+            response.json.return_value = payload
+            return response
+
+        limited = _graphql_response(
+            {"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]},
+            {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1030"},
+        )
+        ok = _graphql_response(
+            {"data": {"viewer": {"login": "octocat"}}},
+            {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "4600"},
+        )
+        mock_post.side_effect = [limited, ok]
+        sleeps = []
+        limiter = RateLimiter(sleep=sleeps.append, clock=lambda: 1000.0)
+        client = GitHubClient("token", rate_limiter=limiter)
+
+        data = client.graphql("query { viewer { login } }", {})
+
+        self.assertEqual(data, {"viewer": {"login": "octocat"}})
+        self.assertEqual(sleeps, [31.0])
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch("functions.github_client.requests.Session.get")
+    def test_paginate_replays_journaled_pages(self, mock_get):
+        mock_get.side_effect = lambda url, params: _response(params["page"], 3)
+        run = {"command": "star", "name": "octocat"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            journal = RunJournal.for_output_dir(Path(temp_dir), run)
+            with GitHubClient(None, journal=journal) as client:
+                first = list(client.paginate("/users/octocat/starred"))
+            journal.close()
+            self.assertEqual(mock_get.call_count, 3)
+
+            journal = RunJournal.for_output_dir(Path(temp_dir), run, resume=True)
+            with GitHubClient(None, journal=journal) as client:
+                replayed = list(client.paginate("/users/octocat/starred"))
+            journal.close()
+        self.assertEqual(replayed, first)
+        self.assertEqual(mock_get.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch, Mock
+from functions.github_client import GitHubClient
+from functions.http_cache import HttpCache
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    @patch("functions.github_client.requests.Session.get")
+    def test_conditional_request_served_from_cache(self, mock_get):
+        body = json.dumps([{"full_name": "octocat/repo1"}])
+        fresh = Mock(status_code=200, text=body, headers={"ETag": '"abc"'})
+        not_modified = Mock(status_code=304, text="", headers={})
+        mock_get.side_effect = [fresh, not_modified]
+
+        client = GitHubClient("token", cache=HttpCache(self.cache_dir))
+        first = client.get("/users/octocat/starred", {"page": 1})
+        second = client.get("/users/octocat/starred", {"page": 1})
+
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), [{"full_name": "octocat/repo1"}])
+        self.assertEqual(
+            mock_get.call_args.kwargs["headers"], {"If-None-Match": '"abc"'}
+        )
+
+    def test_entries_without_validators_are_not_stored(self):
+        cache = HttpCache(self.cache_dir)
+        cache.store("key", "[]", {})
+        self.assertIsNone(cache.load("key"))
+
+    def test_evict_by_age_and_size(self):
+        cache = HttpCache(self.cache_dir, max_age=60)
+        for name in ("old", "a", "b"):
+            cache.store(name, "x" * 50, {"ETag": name})
+        now = time.time()
+        os.utime(self.cache_dir / "old.json", (now - 120, now - 120))
+        os.utime(self.cache_dir / "a.json", (now - 30, now - 30))
+        cache.max_bytes = (self.cache_dir / "b.json").stat().st_size
+        cache.evict()
+        self.assertEqual(sorted(p.name for p in self.cache_dir.iterdir()), ["b.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from functions.is_upstream_unchanged import is_upstream_unchanged
+
+
+def _git(*args: str, cwd: Path) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=str(cwd),
+        check=True,
+        capture_output=True,
+    )
+
+
+class TestIsUpstreamUnchanged(unittest.TestCase):
+    def test_is_upstream_unchanged(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            work = root / "work"
+            work.mkdir()
+            _git("init", "-b", "main", cwd=work)
+            _git("commit", "--allow-empty", "-m", "first", cwd=work)
+            _git("clone", "--bare", str(work), str(root / "upstream.git"), cwd=root)
+            _git("clone", str(root / "upstream.git"), str(root / "clone"), cwd=root)
+
+            self.assertTrue(is_upstream_unchanged(root / "clone"))
+
+            _git("commit", "--allow-empty", "-m", "second", cwd=work)
+            _git("push", str(root / "upstream.git"), "main", cwd=work)
+            self.assertFalse(is_upstream_unchanged(root / "clone"))
+
+    def test_fetched_but_not_merged(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            upstream = root / "upstream"
+            upstream.mkdir()
+            _git("init", "-b", "main", cwd=upstream)
+            _git("commit", "--allow-empty", "-m", "first", cwd=upstream)
+            _git("clone", str(upstream), str(root / "clone"), cwd=root)
+            _git("clone", "--mirror", str(upstream), str(root / "mirror.git"), cwd=root)
+
+            _git("commit", "--allow-empty", "-m", "second", cwd=upstream)
+            _git("fetch", cwd=root / "clone")
+            _git("remote", "update", cwd=root / "mirror.git")
+            # The tracking ref has the new tip, but the branch hasn't moved.
+            self.assertFalse(is_upstream_unchanged(root / "clone"))
+            self.assertTrue(is_upstream_unchanged(root / "mirror.git"))
+
+            _git("merge", "--ff-only", "origin/main", cwd=root / "clone")
+            self.assertTrue(is_upstream_unchanged(root / "clone"))
+
+    def test_not_a_repository(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertFalse(is_upstream_unchanged(Path(temp_dir)))
+
+
+if __name__ == "__main__":
+    unittest.main()
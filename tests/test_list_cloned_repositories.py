@@ -1,6 +1,9 @@
+import os
+import subprocess
 import tempfile
 from pathlib import Path
 from functions.list_cloned_repositories import list_cloned_repositories
+from functions.scan_cloned_repositories import scan_cloned_repositories
 from pytypes.repo_info import RepoInfo
 from unittest.mock import patch
 
@@ -13,7 +16,9 @@ def test_list_cloned_repositories(capsys):
         user_dir = temp_path / "user1"
         user_dir.mkdir()
         repo_dir = user_dir / "repo1"
-        repo_dir.mkdir()
+        (repo_dir / ".git").mkdir(parents=True)
+        # Not a git repository, so not listed.
+        (user_dir / "notes").mkdir()
 
         # Expected output
         expected_repo_info = RepoInfo(
@@ -29,3 +34,76 @@ def test_list_cloned_repositories(capsys):
         ) as mock_print:
             list_cloned_repositories(temp_path)
             mock_print.assert_called_once_with([expected_repo_info])
+
+
+def test_list_cloned_repositories_mirror():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        (temp_path / "user1" / "repo1.git").mkdir(parents=True)
+        (temp_path / "user1" / "repo1.git" / "HEAD").write_text("ref: refs/heads/main\n")
+
+        with patch(
+            "functions.list_cloned_repositories.print_repositories"
+        ) as mock_print:
+            list_cloned_repositories(temp_path)
+            mock_print.assert_called_once_with(
+                [
+                    RepoInfo(
+                        full_name="user1/repo1",
+                        clone_url="",
+                        stargazers_count=0,
+                        owner_name="user1",
+                    )
+                ]
+            )
+
+
+def test_scan_cloned_repositories_uses_index():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        (temp_path / "user1" / "repo1" / ".git").mkdir(parents=True)
+        (temp_path / "user2" / "repo2" / ".git").mkdir(parents=True)
+        # Backdate the owner directories so their mtimes are trusted.
+        for owner in ("user1", "user2"):
+            os.utime(temp_path / owner, ns=(0, 0))
+        assert scan_cloned_repositories(temp_path) == [
+            ("user1", "repo1"),
+            ("user2", "repo2"),
+        ]
+
+        with patch(
+            "functions.scan_cloned_repositories._scan_owner",
+            side_effect=lambda path: ["repo3"],
+        ) as mock_scan:
+            assert scan_cloned_repositories(temp_path) == [
+                ("user1", "repo1"),
+                ("user2", "repo2"),
+            ]
+            mock_scan.assert_not_called()
+
+            # Only the owner directory that changed is rescanned.
+            os.utime(temp_path / "user2", ns=(10**9, 10**9))
+            assert scan_cloned_repositories(temp_path) == [
+                ("user1", "repo1"),
+                ("user2", "repo3"),
+            ]
+            mock_scan.assert_called_once_with(str(temp_path / "user2"))
+
+
+def test_list_cloned_repositories_details(capsys):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        repo_dir = temp_path / "user1" / "repo1"
+        repo_dir.mkdir(parents=True)
+        git = ["git", "-C", str(repo_dir), "-c", "user.name=t", "-c", "user.email=t@t"]
+        subprocess.run(["git", "init", "-q", "-b", "main", str(repo_dir)], check=True)
+        subprocess.run(
+            [*git, "commit", "-q", "--allow-empty", "-m", "init"],
+            check=True,
+            env={**os.environ, "GIT_COMMITTER_DATE": "2024-01-02T03:04:05Z"},
+        )
+
+        list_cloned_repositories(temp_path, details=True)
+        out = capsys.readouterr().out
+        assert "user1/repo1 (main @ " in out
+        assert "last commit 2024-01-02 03:04 UTC" in out
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _loads_requests(*argv: str) -> bool:
+    code = (
+        "import sys\n"
+        "from functions.main import main\n"
+        f"sys.argv = ['starcloner', *{list(argv)!r}]\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('requests' in sys.modules)\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True
+    )
+    return completed.stdout.strip().splitlines()[-1] == "True"
+
+
+class TestMain(unittest.TestCase):
+    def test_local_commands_do_not_import_network_stack(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertFalse(_loads_requests("list-cloned", "-o", temp_dir))
+            self.assertFalse(
+                _loads_requests("maintenance", "optimize", "-o", temp_dir, "-n")
+            )
+            self.assertFalse(
+                _loads_requests("maintenance", "move-temp-files", temp_dir, "-n")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
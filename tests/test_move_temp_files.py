@@ -1,45 +1,128 @@
-from unittest.mock import patch, MagicMock
+import errno
+import os
+from pathlib import Path
+from unittest.mock import patch
 from functions.move_temp_files import move_temp_files
 
 
+def _checkout(path: Path, url: str) -> None:
+    (path / ".git").mkdir(parents=True)
+    (path / ".git" / "config").write_text(
+        f'[remote "origin"]\n\turl = {url}\n', encoding="utf-8"
+    )
+
+
 class TestMoveTempFiles:
-    @patch("argparse.ArgumentParser.parse_args")
-    @patch("functions.move_temp_files.Path")
-    @patch("functions.move_temp_files.safe_move")
-    @patch("functions.move_temp_files.get_github_user_repo_from_config")
-    def test_move_temp_files(
-        self,
-        mock_get_github_user_repo_from_config,
-        mock_safe_move,
-        mock_path,
-        mock_parse_args,
-        tmpdir,
-    ):
-        # Mock the arguments
-        mock_parse_args.return_value = MagicMock(
-            target_directory=str(tmpdir), dry_run=False
+    def test_move_temp_files(self, tmpdir):
+        base = Path(tmpdir)
+        _checkout(base / "repo1", "https://github.com/user/repo1.git")
+        # Found recursively, not only directly under the base directory.
+        _checkout(base / "work" / "nested", "git@github.com:user/repo2.git")
+        # Two checkouts of the same repository collide; neither is moved.
+        _checkout(base / "a" / "dup", "https://github.com/other/dup.git")
+        _checkout(base / "b" / "dup", "https://github.com/other/dup.git")
+        # Already in place.
+        _checkout(base / "user" / "repo3", "https://github.com/user/repo3.git")
+
+        move_temp_files(base, dry_run=False)
+
+        assert (base / "user" / "repo1" / ".git").is_dir()
+        assert (base / "user" / "repo2" / ".git").is_dir()
+        assert (base / "user" / "repo3" / ".git").is_dir()
+        assert not (base / "repo1").exists()
+        assert (base / "a" / "dup").is_dir() and (base / "b" / "dup").is_dir()
+        assert not (base / "other").exists()
+
+    def test_move_temp_files_dry_run(self, tmpdir, capsys):
+        base = Path(tmpdir)
+        _checkout(base / "repo1", "https://github.com/user/repo1.git")
+
+        move_temp_files(base, dry_run=True)
+
+        assert (base / "repo1").is_dir()
+        assert not (base / "user").exists()
+        assert f"[DRY-RUN] {base / 'repo1'} -> {base / 'user' / 'repo1'}" in (
+            capsys.readouterr().out
         )
 
-        # Mock the Path object and its methods
-        mock_base_dir = MagicMock()
-        mock_path.return_value.resolve.return_value = mock_base_dir
-        mock_base_dir.is_dir.return_value = True
-        mock_repo = MagicMock(is_dir=MagicMock(return_value=True), name="repo1")
-        mock_base_dir.iterdir.return_value = [mock_repo]
-        mock_target_dir = mock_base_dir / "user" / "repo"
-        mock_target_dir.exists.return_value = False
-
-        # Mock the .git directory and config path
-        mock_git_dir = mock_base_dir.iterdir.return_value[0] / ".git"
-        mock_git_dir.is_dir.return_value = True
-        mock_config_path = mock_git_dir / "config"
-
-        # Mock the get_github_user_repo_from_config function
-        mock_get_github_user_repo_from_config.return_value = ("user", "repo")
-
-        # Call the function
-        move_temp_files(dry_run=False)
-
-        # Assertions
-        mock_get_github_user_repo_from_config.assert_called_once_with(mock_config_path)
-        mock_safe_move.assert_called_once()
+    def test_move_temp_files_into_itself(self, tmpdir):
+        base = Path(tmpdir)
+        _checkout(base / "user", "https://github.com/user/user.git")
+
+        move_temp_files(base, dry_run=False)
+
+        assert (base / "user" / "user" / ".git").is_dir()
+        assert not (base / "user" / ".git").exists()
+
+    @patch("functions.move_temp_files.safe_move")
+    def test_move_temp_files_copy_requires_allow_copy(self, mock_safe_move, tmpdir):
+        base = Path(tmpdir)
+        _checkout(base / "repo1", "https://github.com/user/repo1.git")
+
+        def cross_device(src, dst):
+            raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+        with patch("functions.move_temp_files.os.rename", side_effect=cross_device):
+            move_temp_files(base, dry_run=False)
+            mock_safe_move.assert_not_called()
+
+            move_temp_files(base, dry_run=False, allow_copy=True)
+            mock_safe_move.assert_called_once_with(
+                base / "repo1", base / "user" / "repo1"
+            )
+
+    def test_move_temp_files_failed_move_is_skipped(self, tmpdir, capsys):
+        base = Path(tmpdir)
+        _checkout(base / "user", "https://github.com/user/user.git")
+        _checkout(base / "repo1", "https://github.com/other/repo1.git")
+        real_rename = os.rename
+
+        def fail_into_place(src, dst):
+            if Path(dst) == base / "user" / "user":
+                raise OSError(errno.EACCES, os.strerror(errno.EACCES))
+            real_rename(src, dst)
+
+        with patch("functions.move_temp_files.os.rename", side_effect=fail_into_place):
+            move_temp_files(base, dry_run=False)
+
+        # The checkout renamed aside for the move is back under its own name.
+        assert (base / "user" / ".git").is_dir()
+        assert not any(path.name.startswith(".tmpmove_") for path in base.iterdir())
+        out = capsys.readouterr().out
+        assert f"[SKIP] {base / 'user'} -> {base / 'user' / 'user'}" in out
+        # The remaining moves still ran and the summary was printed.
+        assert (base / "other" / "repo1" / ".git").is_dir()
+        assert "移動: 1 件, スキップ: 1 件" in out
+
+    def test_move_temp_files_not_into_unparsable_checkout(self, tmpdir):
+        base = Path(tmpdir)
+        _checkout(base / "user", "https://gitlab.com/someone/user.git")
+        _checkout(base / "repo1", "https://github.com/user/repo1.git")
+
+        move_temp_files(base, dry_run=False)
+
+        assert (base / "repo1" / ".git").is_dir()
+        assert not (base / "user" / "repo1").exists()
+
+    def test_move_temp_files_leaves_bare_repositories_alone(self, tmpdir, capsys):
+        base = Path(tmpdir)
+        for bare in (base / "user" / "mirror.git", base / "backup"):
+            (bare / "objects").mkdir(parents=True)
+            (bare / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+            (bare / "config").write_text(
+                '[remote "origin"]\n\turl = https://github.com/user/mirror.git\n',
+                encoding="utf-8",
+            )
+        # Looks like a checkout, but lies inside a bare repository.
+        nested = base / "backup" / "refs" / "repo1"
+        _checkout(nested, "https://github.com/user/repo1.git")
+
+        move_temp_files(base, dry_run=False)
+
+        assert (base / "user" / "mirror.git" / "HEAD").is_file()
+        assert (base / "backup" / "HEAD").is_file()
+        assert (nested / ".git").is_dir()
+        assert not (base / "user" / "repo1").exists()
+        out = capsys.readouterr().out
+        assert f"[SKIP] {base / 'backup'}: ベアリポジトリは移動しません" in out
+        assert "mirror.git:" not in out
@@ -0,0 +1,46 @@
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from functions.format_bytes import format_bytes
+from functions.optimize_repositories import optimize_repositories
+
+
+def _git(*args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+class TestOptimizeRepositories(unittest.TestCase):
+    def test_optimize_repositories(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target_dir = Path(temp_dir)
+            repo_dir = target_dir / "octocat" / "repo1"
+            _git("init", "-q", "-b", "main", str(repo_dir))
+            for n in range(3):
+                (repo_dir / "file.txt").write_text(f"{n}\n")
+                _git("-C", str(repo_dir), "add", "file.txt")
+                _git("-C", str(repo_dir), "commit", "-q", "-m", f"commit {n}")
+            _git("-C", str(repo_dir), "repack", "-q")
+            # Not a git repository, so it's not touched.
+            (target_dir / "octocat" / "notes").mkdir()
+
+            results = optimize_repositories(target_dir, jobs=2, fsck=True, dry_run=False)
+
+            self.assertEqual([r.full_name for r in results], ["octocat/repo1"])
+            self.assertTrue(results[0].ok, results[0].output)
+            objects_dir = repo_dir / ".git" / "objects"
+            self.assertTrue((objects_dir / "info" / "commit-graph").exists())
+            self.assertTrue((objects_dir / "pack" / "multi-pack-index").exists())
+
+    def test_format_bytes(self):
+        self.assertEqual(format_bytes(512), "512 B")
+        self.assertEqual(format_bytes(1536), "1.5 KiB")
+        self.assertEqual(format_bytes(-3 * 1024 * 1024), "-3.0 MiB")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from functions.order_repositories import order_repositories
+from functions.print_repositories import print_repositories
+from pytypes.repo_info import RepoInfo
+
+
+def _repo(name: str, size=None, pushed_at=None) -> RepoInfo:
+    return RepoInfo(
+        full_name=f"octocat/{name}",
+        clone_url=f"https://github.com/octocat/{name}.git",
+        stargazers_count=0,
+        owner_name="octocat",
+        size=size,
+        pushed_at=pushed_at,
+    )
+
+
+class TestOrderRepositories(unittest.TestCase):
+    def setUp(self):
+        self.repos = [
+            _repo("small", size=10, pushed_at="2024-03-01T00:00:00Z"),
+            _repo("unknown"),
+            _repo("huge", size=5_000_000, pushed_at="2023-01-01T00:00:00Z"),
+            _repo("medium", size=2048, pushed_at="2024-06-01T00:00:00Z"),
+        ]
+
+    def _names(self, order: str):
+        ordered = order_repositories(self.repos, order)
+        return [repo.full_name.split("/")[1] for repo in ordered]
+
+    def test_orders(self):
+        self.assertEqual(self._names("listing"), ["small", "unknown", "huge", "medium"])
+        self.assertEqual(self._names("name"), ["huge", "medium", "small", "unknown"])
+        self.assertEqual(
+            self._names("largest-first"), ["huge", "medium", "small", "unknown"]
+        )
+        self.assertEqual(
+            self._names("smallest-first"), ["small", "medium", "huge", "unknown"]
+        )
+        self.assertEqual(
+            self._names("recent-first"), ["medium", "small", "huge", "unknown"]
+        )
+
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_print_in_processing_order(self, mock_stdout):
+        print_repositories(
+            order_repositories(self.repos, "largest-first"), order="largest-first"
+        )
+        lines = mock_stdout.getvalue().splitlines()
+        self.assertEqual(
+            lines[0], "Repositories to process (total 4), in largest-first order:"
+        )
+        self.assertEqual(
+            lines[1], "     1. octocat/huge (Size: 4.8 GiB, Pushed: 2023-01-01T00:00:00Z)"
+        )
+        self.assertEqual(lines[4], "     4. octocat/unknown (Size: ?, Pushed: ?)")
+
+
+if __name__ == "__main__":
+    unittest.main()
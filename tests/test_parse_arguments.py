@@ -27,7 +27,27 @@ class TestParseArguments(unittest.TestCase):
             min_stars=10,
             max_stars=100,
             owner_filter="owner",
+            full_star_sync=False,
             output_dir="./output",
+            jobs=1,
+            depth=None,
+            filter=None,
+            single_branch=False,
+            mirror=False,
+            share_objects=False,
+            api="auto",
+            no_cache=False,
+            check_upstream=False,
+            no_state=False,
+            stream=False,
+            resume=False,
+            order="listing",
+            shard=None,
+            shard_mode="modulo",
+            token_file=None,
+            metrics_json=None,
+            metrics_textfile=None,
+            trace=None,
         )
         self.assertEqual(args, expected)
 
@@ -52,6 +72,25 @@ class TestParseArguments(unittest.TestCase):
             include_forks=True,
             include_archived=True,
             output_dir="./output",
+            jobs=1,
+            depth=None,
+            filter=None,
+            single_branch=False,
+            mirror=False,
+            share_objects=False,
+            api="auto",
+            no_cache=False,
+            check_upstream=False,
+            no_state=False,
+            stream=False,
+            resume=False,
+            order="listing",
+            shard=None,
+            shard_mode="modulo",
+            token_file=None,
+            metrics_json=None,
+            metrics_textfile=None,
+            trace=None,
         )
         self.assertEqual(args, expected)
 
@@ -76,9 +115,54 @@ class TestParseArguments(unittest.TestCase):
             include_forks=True,
             include_archived=True,
             output_dir="./output",
+            jobs=1,
+            depth=None,
+            filter=None,
+            single_branch=False,
+            mirror=False,
+            share_objects=False,
+            api="auto",
+            no_cache=False,
+            check_upstream=False,
+            no_state=False,
+            stream=False,
+            resume=False,
+            order="listing",
+            shard=None,
+            shard_mode="modulo",
+            token_file=None,
+            metrics_json=None,
+            metrics_textfile=None,
+            trace=None,
         )
         self.assertEqual(args, expected)
 
+    def test_parse_arguments_stream_requires_yes(self):
+        sys.argv = ["starcloner", "org", "github", "--stream"]
+        with self.assertRaises(SystemExit):
+            parse_arguments()
+
+        sys.argv = ["starcloner", "org", "github", "--stream", "--yes"]
+        self.assertTrue(parse_arguments().stream)
+
+    def test_parse_arguments_shard(self):
+        sys.argv = ["starcloner", "org", "github", "--shard", "2/3"]
+        self.assertEqual(parse_arguments().shard, (2, 3))
+
+        for value in ("0/3", "4/3", "two/3", "2"):
+            sys.argv = ["starcloner", "org", "github", "--shard", value]
+            with self.assertRaises(SystemExit):
+                parse_arguments()
+
+    def test_parse_arguments_depth_must_be_positive(self):
+        sys.argv = ["starcloner", "org", "github", "--depth", "1"]
+        self.assertEqual(parse_arguments().depth, 1)
+
+        for value in ("0", "-1", "one"):
+            sys.argv = ["starcloner", "org", "github", "--depth", value]
+            with self.assertRaises(SystemExit):
+                parse_arguments()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,25 @@ class TestParseMaintenanceArguments(unittest.TestCase):
             self.assertEqual(args.command, "maintenance")
             self.assertEqual(args.maintenance_command, "move-temp-files")
             self.assertTrue(args.dry_run)
+            self.assertEqual(args.target_directory, ".")
+            self.assertFalse(args.allow_copy)
+
+    def test_maintenance_optimize(self):
+        test_args = [
+            "starcloner.py",
+            "maintenance",
+            "optimize",
+            "--output-dir=./output",
+            "--jobs=8",
+            "--fsck",
+        ]
+        with patch.object(sys, 'argv', test_args):
+            args = parse_arguments()
+            self.assertEqual(args.maintenance_command, "optimize")
+            self.assertEqual(args.output_dir, "./output")
+            self.assertEqual(args.jobs, 8)
+            self.assertTrue(args.fsck)
+            self.assertFalse(args.dry_run)
 
 if __name__ == "__main__":
     unittest.main()
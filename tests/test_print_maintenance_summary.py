@@ -0,0 +1,25 @@
+import io
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from functions.print_maintenance_summary import print_maintenance_summary
+from pytypes.maintenance_result import MaintenanceResult
+
+
+class TestPrintMaintenanceSummary(unittest.TestCase):
+    def test_counts_failed_repositories_as_processed(self):
+        results = [
+            MaintenanceResult("octocat/a", ok=True, duration=1.0),
+            MaintenanceResult(
+                "octocat/b", ok=False, failed_step="git fsck", output="error: bad"
+            ),
+        ]
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            print_maintenance_summary(results)
+
+        self.assertIn("2 repository(ies) processed - ok: 1, failed: 1", out.getvalue())
+        self.assertIn("FAILED octocat/b (git fsck)", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+from functions.process_repositories import (
+    process_repositories,
+    process_repository_stream,
+    UNCHANGED_REASON,
+)
+from functions.state_store import StateStore
+from pytypes.clone_options import CloneOptions
+from pytypes.repo_info import RepoInfo
+from pytypes.repo_result import RepoResult, RepoStatus
+
+
+def _repo(name: str, repo_id=None, pushed_at=None) -> RepoInfo:
+    return RepoInfo(
+        full_name=f"octocat/{name}",
+        clone_url=f"https://github.com/octocat/{name}.git",
+        stargazers_count=0,
+        owner_name="octocat",
+        repo_id=repo_id,
+        pushed_at=pushed_at,
+    )
+
+
+class TestProcessRepositories(unittest.TestCase):
+    @patch("functions.process_repositories.clone_or_pull_repo")
+    @patch("functions.process_repositories.Path.mkdir")
+    def test_process_repositories_sequential(self, mock_mkdir, mock_clone):
+        mock_clone.side_effect = lambda repo, target_dir, dry_run, options, reference: RepoResult(
+            repo.full_name, RepoStatus.PULLED, exit_code=0
+        )
+        repos = [_repo("repo1"), _repo("repo2")]
+        results = process_repositories(repos, Path("/fake/dir"), dry_run=False)
+        self.assertEqual(
+            [r.full_name for r in results], ["octocat/repo1", "octocat/repo2"]
+        )
+        mock_clone.assert_any_call(
+            repos[0], Path("/fake/dir"), False, options=CloneOptions(), reference=None
+        )
+
+    @patch("functions.process_repositories.clone_or_pull_repo")
+    @patch("functions.process_repositories.Path.mkdir")
+    def test_process_repositories_parallel(self, mock_mkdir, mock_clone):
+        def fake_clone(repo, target_dir, dry_run, capture_output, options, reference):
+            self.assertTrue(capture_output)
+            status = RepoStatus.FAILED if repo.full_name.endswith("2") else RepoStatus.CLONED
+            return RepoResult(repo.full_name, status, exit_code=0)
+
+        mock_clone.side_effect = fake_clone
+        repos = [_repo(f"repo{i}") for i in range(1, 6)]
+        results = process_repositories(repos, Path("/fake/dir"), dry_run=False, jobs=3)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(
+            sorted(r.full_name for r in results if r.status is RepoStatus.FAILED),
+            ["octocat/repo2"],
+        )
+
+    @patch("functions.process_repositories.clone_or_pull_repo")
+    def test_process_repositories_skips_unchanged(self, mock_clone):
+        mock_clone.side_effect = lambda repo, target_dir, dry_run, options, reference: RepoResult(
+            repo.full_name, RepoStatus.PULLED, exit_code=0
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target_dir = Path(temp_dir)
+            (target_dir / "octocat" / "repo1").mkdir(parents=True)
+            repo = _repo("repo1", repo_id=1, pushed_at="2024-01-01T00:00:00Z")
+            with StateStore.for_output_dir(target_dir) as state:
+                first = process_repositories([repo], target_dir, False, state=state)
+                second = process_repositories([repo], target_dir, False, state=state)
+                moved = _repo("repo1", repo_id=1, pushed_at="2024-02-01T00:00:00Z")
+                third = process_repositories([moved], target_dir, False, state=state)
+
+        self.assertEqual(first[0].status, RepoStatus.PULLED)
+        self.assertEqual(second[0].status, RepoStatus.SKIPPED)
+        self.assertEqual(second[0].reason, UNCHANGED_REASON)
+        self.assertEqual(third[0].status, RepoStatus.PULLED)
+        self.assertEqual(mock_clone.call_count, 2)
+
+    @patch("functions.process_repositories.clone_or_pull_repo")
+    def test_process_repositories_keeps_recorded_clone_mode(self, mock_clone):
+        mock_clone.side_effect = lambda repo, target_dir, dry_run, options, reference: RepoResult(
+            repo.full_name, RepoStatus.CLONED, exit_code=0
+        )
+        shallow = CloneOptions(depth=1)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target_dir = Path(temp_dir)
+            repo = _repo("repo1", repo_id=1)
+            with StateStore.for_output_dir(target_dir) as state:
+                process_repositories(
+                    [repo], target_dir, False, state=state, clone_options=shallow
+                )
+                process_repositories([repo], target_dir, False, state=state)
+                self.assertEqual(state.get(1).clone_options, shallow)
+
+        self.assertEqual(mock_clone.call_args.kwargs["options"], shallow)
+
+    @patch("functions.process_repositories.clone_or_pull_repo")
+    @patch("functions.process_repositories.Path.mkdir")
+    def test_process_repository_stream_overlaps_listing(self, mock_mkdir, mock_clone):
+        first_cloned = threading.Event()
+        overlapped = []
+
+        def fake_clone(repo, target_dir, dry_run, capture_output, options):
+            first_cloned.set()
+            return RepoResult(repo.full_name, RepoStatus.CLONED, exit_code=0)
+
+        def listing():
+            yield _repo("repo1")
+            # The next "page" is only produced once the first clone has run.
+            overlapped.append(first_cloned.wait(timeout=5))
+            yield _repo("repo2")
+
+        mock_clone.side_effect = fake_clone
+        results = process_repository_stream(listing(), Path("/fake/dir"), dry_run=False)
+        self.assertEqual(overlapped, [True])
+        self.assertEqual(
+            sorted(r.full_name for r in results), ["octocat/repo1", "octocat/repo2"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
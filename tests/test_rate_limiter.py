@@ -0,0 +1,84 @@
+import threading
+import unittest
+from functions.rate_limiter import RateLimiter, SECONDARY_LIMIT_BACKOFF
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.sleeps = []
+        self.now = 1000.0
+        self.limiter = RateLimiter(sleep=self.sleeps.append, clock=lambda: self.now)
+
+    def test_no_wait_with_plenty_of_budget(self):
+        self.limiter.update(
+            {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "2000"}
+        )
+        self.limiter.wait()
+        self.assertEqual(self.sleeps, [])
+        self.assertEqual(self.limiter.budget.remaining, 4000)
+        self.assertEqual(self.limiter.budget.limit, 5000)
+
+    def test_paces_when_budget_is_low(self):
+        self.limiter.update({"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "1100"})
+        self.limiter.wait()
+        self.assertEqual(self.sleeps, [10.0])
+
+    def test_concurrent_callers_get_separate_slots(self):
+        self.limiter.update({"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "1100"})
+        start = threading.Barrier(8)
+
+        def fetcher():
+            start.wait()
+            self.limiter.wait()
+
+        threads = [threading.Thread(target=fetcher) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Each wakes one interval (100s / 10 remaining) after the previous one.
+        self.assertEqual(sorted(self.sleeps), [10.0 * n for n in range(1, 9)])
+
+    def test_waits_for_reset_when_exhausted(self):
+        self.limiter.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1100"})
+        self.limiter.wait()
+        self.assertEqual(self.sleeps, [101.0])
+
+    def test_sleeps_without_holding_the_lock(self):
+        blocked = []
+
+        def sleep(delay):
+            # Another thread must be able to record a response meanwhile.
+            other = threading.Thread(
+                target=self.limiter.update, args=({"X-RateLimit-Remaining": "4999"},)
+            )
+            other.start()
+            other.join(timeout=5)
+            blocked.append(other.is_alive())
+
+        self.limiter = RateLimiter(sleep=sleep, clock=lambda: self.now)
+        self.limiter.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1100"})
+        self.limiter.wait()
+        self.assertEqual(blocked, [False])
+        # The fresher budget recorded during the sleep is kept.
+        self.assertEqual(self.limiter.budget.remaining, 4999)
+
+    def test_backoff_retry_after(self):
+        delay = self.limiter.backoff(429, {"Retry-After": "42"}, "", attempt=0)
+        self.assertEqual(delay, 42.0)
+        self.limiter.wait()
+        self.assertEqual(self.sleeps, [42.0])
+
+    def test_backoff_secondary_rate_limit(self):
+        body = '{"message": "You have exceeded a secondary rate limit."}'
+        self.assertEqual(
+            self.limiter.backoff(403, {}, body, attempt=1), SECONDARY_LIMIT_BACKOFF * 2
+        )
+
+    def test_no_backoff_for_other_errors(self):
+        self.assertIsNone(self.limiter.backoff(403, {}, "Forbidden", attempt=0))
+        self.assertIsNone(self.limiter.backoff(404, {}, "Not Found", attempt=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
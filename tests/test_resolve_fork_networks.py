@@ -0,0 +1,52 @@
+import unittest
+from unittest.mock import Mock
+from functions.resolve_fork_networks import resolve_fork_networks
+from pytypes.repo_info import RepoInfo
+
+
+def _repo(full_name: str, fork: bool) -> RepoInfo:
+    return RepoInfo(
+        full_name=full_name,
+        clone_url=f"https://github.com/{full_name}.git",
+        stargazers_count=0,
+        owner_name=full_name.split("/")[0],
+        fork=fork,
+    )
+
+
+def _api_repo(full_name: str) -> dict:
+    return {
+        "full_name": full_name,
+        "clone_url": f"https://github.com/{full_name}.git",
+        "stargazers_count": 0,
+        "owner": {"login": full_name.split("/")[0]},
+    }
+
+
+class TestResolveForkNetworks(unittest.TestCase):
+    def test_resolve_fork_networks(self):
+        client = Mock(max_concurrent_pages=4)
+        client.get.side_effect = lambda path: Mock(
+            json=Mock(return_value={"source": _api_repo("upstream/project")})
+        )
+        repos = [
+            _repo("upstream/project", fork=False),
+            _repo("alice/project", fork=True),
+            _repo("bob/project", fork=True),
+            _repo("carol/other", fork=False),
+        ]
+
+        networks = resolve_fork_networks(repos, client)
+
+        self.assertEqual(
+            sorted(networks), ["alice/project", "bob/project", "upstream/project"]
+        )
+        self.assertEqual(
+            {root.full_name for root in networks.values()}, {"upstream/project"}
+        )
+        self.assertEqual(client.get.call_count, 2)
+        client.get.assert_any_call("/repos/alice/project")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+from pathlib import Path
+from functions.run_journal import RunJournal, JOURNAL_NAME, journal_name
+from pytypes.repo_info import RepoInfo
+from pytypes.repo_result import RepoResult, RepoStatus
+
+RUN = {"command": "star", "name": "octocat"}
+REPO = RepoInfo(
+    full_name="octocat/a",
+    clone_url="https://github.com/octocat/a.git",
+    stargazers_count=1,
+    owner_name="octocat",
+    repo_id=1,
+)
+
+
+class TestRunJournal(unittest.TestCase):
+    def test_resume_replays_pages_and_skips_finished_repos(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target_dir = Path(temp_dir)
+            journal = RunJournal.for_output_dir(target_dir, RUN)
+            journal.record_page("page-1", "[1]", '<...>; rel="last"')
+            journal.record_plan([REPO])
+            journal.record_result(RepoResult("octocat/a", RepoStatus.CLONED))
+            journal.record_result(RepoResult("octocat/b", RepoStatus.FAILED))
+            journal.close()
+            # Simulate a crash in the middle of writing an entry.
+            with open(target_dir / JOURNAL_NAME, "a", encoding="utf-8") as f:
+                f.write('{"event": "done", "repo": "octo')
+
+            resumed = RunJournal.for_output_dir(target_dir, RUN, resume=True)
+            self.assertTrue(resumed.resumed)
+            self.assertEqual(resumed.page("page-1")["body"], "[1]")
+            self.assertEqual(resumed.planned, [REPO])
+            self.assertTrue(resumed.is_done("octocat/a"))
+            self.assertFalse(resumed.is_done("octocat/b"))
+            resumed.record_result(RepoResult("octocat/c", RepoStatus.PULLED))
+            resumed.close()
+
+            again = RunJournal.for_output_dir(target_dir, RUN, resume=True)
+            self.assertEqual(again.done_count, 2)
+            again.finish()
+            self.assertFalse((target_dir / JOURNAL_NAME).exists())
+
+    def test_journal_of_another_run_is_not_resumed(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target_dir = Path(temp_dir)
+            journal = RunJournal.for_output_dir(target_dir, RUN)
+            journal.record_result(RepoResult("octocat/a", RepoStatus.CLONED))
+            journal.close()
+
+            other = RunJournal.for_output_dir(
+                target_dir, {"command": "org", "name": "github"}, resume=True
+            )
+            self.assertFalse(other.resumed)
+            self.assertFalse(other.is_done("octocat/a"))
+            other.close()
+
+    def test_shards_keep_separate_journals(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target_dir = Path(temp_dir)
+            first = RunJournal.for_output_dir(target_dir, RUN, shard=(1, 2))
+            second = RunJournal.for_output_dir(target_dir, RUN, shard=(2, 2))
+            first.record_result(RepoResult("octocat/a", RepoStatus.CLONED))
+            second.record_result(RepoResult("octocat/b", RepoStatus.CLONED))
+            second.finish()
+            first.close()
+
+            self.assertEqual(journal_name((1, 2)), ".starcloner-journal.1of2.jsonl")
+            resumed = RunJournal.for_output_dir(
+                target_dir, RUN, resume=True, shard=(1, 2)
+            )
+            self.assertTrue(resumed.resumed)
+            self.assertEqual(resumed.done_count, 1)
+            resumed.close()
+            self.assertFalse((target_dir / JOURNAL_NAME).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
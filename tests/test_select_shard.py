@@ -0,0 +1,52 @@
+import unittest
+from functions.select_shard import select_shard, shard_of
+from pytypes.repo_info import RepoInfo
+
+
+def _repos(count: int):
+    return [
+        RepoInfo(
+            full_name=f"octocat/repo{n}",
+            clone_url=f"https://github.com/octocat/repo{n}.git",
+            stargazers_count=0,
+            owner_name="octocat",
+            repo_id=n,
+        )
+        for n in range(count)
+    ]
+
+
+class TestSelectShard(unittest.TestCase):
+    def test_shards_partition_the_list(self):
+        repos = _repos(3000)
+        for mode in ("modulo", "consistent"):
+            shards = [select_shard(repos, i, 3, mode) for i in (1, 2, 3)]
+            names = sorted(r.full_name for shard in shards for r in shard)
+            self.assertEqual(names, sorted(r.full_name for r in repos))
+            for shard in shards:
+                # Roughly even: within 10% of 1000.
+                self.assertLess(abs(len(shard) - 1000), 100, mode)
+
+    def test_assignment_is_stable_across_instances(self):
+        repo = _repos(1)[0]
+        renamed = RepoInfo("octocat/renamed", repo.clone_url, 0, "octocat", repo_id=0)
+        self.assertEqual(shard_of(repo, 7), shard_of(renamed, 7))
+        self.assertEqual(
+            shard_of(repo, 7, "consistent"), shard_of(renamed, 7, "consistent")
+        )
+
+    def test_consistent_mode_moves_few_repositories_when_n_grows(self):
+        repos = _repos(4000)
+
+        def moved(mode: str) -> int:
+            return sum(
+                1 for r in repos if shard_of(r, 4, mode) != shard_of(r, 5, mode)
+            )
+
+        # Only the repositories claimed by the new shard (about 1/5) move.
+        self.assertLess(moved("consistent"), 4000 * 0.25)
+        self.assertGreater(moved("modulo"), 4000 * 0.7)
+
+
+if __name__ == "__main__":
+    unittest.main()
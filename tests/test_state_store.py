@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from pathlib import Path
+from functions.read_head import read_head
+from functions.state_store import StateStore, STATE_DB_NAME, state_db_name
+from pytypes.repo_info import RepoInfo
+from pytypes.repo_result import RepoResult, RepoStatus
+
+
+class TestStateStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.target_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_record_and_is_up_to_date(self):
+        repo = RepoInfo(
+            full_name="octocat/repo1",
+            clone_url="https://github.com/octocat/repo1.git",
+            stargazers_count=1,
+            owner_name="octocat",
+            repo_id=42,
+            pushed_at="2024-01-01T00:00:00Z",
+        )
+        local_path = self.target_dir / "octocat" / "repo1"
+        (local_path / ".git" / "refs" / "heads").mkdir(parents=True)
+        (local_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        (local_path / ".git" / "refs" / "heads" / "main").write_text("abc123\n")
+
+        with StateStore.for_output_dir(self.target_dir) as state:
+            self.assertFalse(state.is_up_to_date(repo))
+            state.record(repo, RepoResult(repo.full_name, RepoStatus.FAILED), local_path)
+            self.assertFalse(state.is_up_to_date(repo))
+            state.record(repo, RepoResult(repo.full_name, RepoStatus.CLONED), local_path)
+            self.assertTrue(state.is_up_to_date(repo))
+            self.assertEqual(state.get(42).head, "abc123")
+
+        # The database persists across runs.
+        self.assertTrue((self.target_dir / STATE_DB_NAME).is_file())
+        with StateStore.for_output_dir(self.target_dir) as state:
+            self.assertTrue(state.is_up_to_date(repo))
+
+    def test_shards_use_separate_databases(self):
+        repo = RepoInfo(
+            full_name="octocat/repo1",
+            clone_url="https://github.com/octocat/repo1.git",
+            stargazers_count=1,
+            owner_name="octocat",
+            repo_id=1,
+            pushed_at="2024-01-01T00:00:00Z",
+        )
+        with StateStore.for_output_dir(self.target_dir, shard=(1, 2)) as first:
+            first.record(repo, RepoResult(repo.full_name, RepoStatus.CLONED), Path("x"))
+        with StateStore.for_output_dir(self.target_dir, shard=(2, 2)) as second:
+            self.assertIsNone(second.get(1))
+        self.assertTrue((self.target_dir / state_db_name((1, 2))).is_file())
+        self.assertEqual(state_db_name((2, 2)), ".starcloner.2of2.db")
+        self.assertFalse((self.target_dir / STATE_DB_NAME).exists())
+
+    def test_read_head_packed_refs(self):
+        git_dir = self.target_dir / "repo.git"
+        git_dir.mkdir()
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        (git_dir / "packed-refs").write_text(
+            "# pack-refs with: peeled fully-peeled sorted\n"
+            "def456 refs/heads/main\n"
+        )
+        self.assertEqual(read_head(git_dir), "def456")
+        self.assertIsNone(read_head(self.target_dir / "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
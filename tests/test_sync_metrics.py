@@ -0,0 +1,70 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from benchmarks.fake_github import FakeGitHub, FakeGitHubConfig, repo_object
+from functions.fetch_starred_repositories import fetch_starred_repositories
+from functions.github_client import GitHubClient
+from functions.sync_metrics import SyncMetrics
+from pytypes.repo_result import RepoResult, RepoStatus
+
+
+class TestSyncMetrics(unittest.TestCase):
+    def test_client_requests_and_results_are_reported(self):
+        repos = [
+            repo_object("octocat", f"repo{n}", f"file:///repos/repo{n}.git", n)
+            for n in range(150)
+        ]
+        metrics = SyncMetrics("star")
+        with FakeGitHub(FakeGitHubConfig(rate_limit=1000)) as fake:
+            fake.add_stars("octocat", [("2024-01-01T00:00:00Z", r) for r in repos])
+            with GitHubClient(None, base_url=fake.base_url, metrics=metrics) as client:
+                with metrics.phase("fetch"):
+                    fetch_starred_repositories("octocat", client)
+        metrics.record_results(
+            [
+                RepoResult("octocat/repo0", RepoStatus.CLONED, duration=1.5),
+                RepoResult("octocat/repo1", RepoStatus.FAILED, duration=0.5),
+            ]
+        )
+
+        report = metrics.report()
+        self.assertEqual(report["api"]["requests"], 2)
+        self.assertEqual(report["api"]["statuses"], {"200": 2})
+        self.assertEqual(report["api"]["pages"], 2)
+        self.assertGreater(report["api"]["bytes"], 0)
+        self.assertEqual(report["api"]["rate_limit_limit"], 1000)
+        self.assertIn("fetch", report["phases"])
+        self.assertEqual(report["repos"]["cloned"], 1)
+        self.assertEqual(report["repos"]["failed"], 1)
+        self.assertEqual(report["git_seconds_total"], 2.0)
+
+    def test_json_report_and_textfile(self):
+        metrics = SyncMetrics("org")
+        metrics.record_request(200, 0.25, 1024)
+        metrics.record_request(304, 0.05, 0)
+        metrics.record_results([RepoResult("github/a", RepoStatus.PULLED, duration=3)])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_path = Path(temp_dir) / "report.json"
+            prom_path = Path(temp_dir) / "starcloner.prom"
+            metrics.write_json(json_path)
+            metrics.write_textfile(prom_path)
+
+            report = json.loads(json_path.read_text(encoding="utf-8"))
+            self.assertEqual(report["command"], "org")
+            self.assertEqual(report["repo_results"][0]["status"], "pulled")
+
+            lines = prom_path.read_text(encoding="utf-8").splitlines()
+            self.assertIn('starcloner_api_requests{command="org",code="200"} 1', lines)
+            self.assertIn('starcloner_api_requests{command="org",code="304"} 1', lines)
+            self.assertIn('starcloner_repos{command="org",status="pulled"} 1', lines)
+            self.assertIn("# TYPE starcloner_git_seconds gauge", lines)
+            # Written atomically: no temporary file is left behind.
+            self.assertEqual(
+                sorted(p.name for p in Path(temp_dir).iterdir()),
+                ["report.json", "starcloner.prom"],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
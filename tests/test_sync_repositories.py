@@ -0,0 +1,139 @@
+import argparse
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from functions.run_journal import JOURNAL_NAME
+from functions.sync_repositories import sync_repositories
+from pytypes.repo_info import RepoInfo
+from pytypes.repo_result import RepoResult, RepoStatus
+
+
+def _args(output_dir: str, **overrides) -> argparse.Namespace:
+    args = argparse.Namespace(
+        command="org",
+        orgname="github",
+        output_dir=output_dir,
+        token_file=None,
+        no_state=True,
+        no_cache=True,
+        dry_run=False,
+        resume=False,
+        stream=False,
+        yes=True,
+        order="listing",
+        shard=None,
+        shard_mode="modulo",
+        share_objects=False,
+        jobs=1,
+        check_upstream=False,
+        depth=None,
+        filter=None,
+        single_branch=False,
+        mirror=False,
+        metrics_json=None,
+        metrics_textfile=None,
+        trace=None,
+    )
+    for name, value in overrides.items():
+        setattr(args, name, value)
+    return args
+
+
+def _repo(name: str) -> RepoInfo:
+    return RepoInfo(
+        full_name=f"github/{name}",
+        clone_url=f"https://github.com/github/{name}.git",
+        stargazers_count=0,
+        owner_name="github",
+    )
+
+
+@patch("functions.sync_repositories.read_tokens", return_value=[])
+class TestSyncRepositories(unittest.TestCase):
+    @patch("functions.sync_repositories._sync_with_client")
+    def test_clean_exit_deletes_the_journal(self, mock_sync, _mock_tokens):
+        mock_sync.side_effect = SystemExit(0)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with self.assertRaises(SystemExit):
+                sync_repositories(_args(temp_dir))
+            self.assertFalse((Path(temp_dir) / JOURNAL_NAME).exists())
+
+    @patch("functions.sync_repositories._sync_with_client")
+    def test_error_exit_keeps_the_journal(self, mock_sync, _mock_tokens):
+        for error in (SystemExit(1), KeyboardInterrupt()):
+            mock_sync.side_effect = error
+            with tempfile.TemporaryDirectory() as temp_dir:
+                with self.assertRaises(type(error)):
+                    sync_repositories(_args(temp_dir))
+                self.assertTrue((Path(temp_dir) / JOURNAL_NAME).exists())
+
+    @patch("functions.process_repositories.clone_or_pull_repo")
+    @patch("functions.sync_repositories.fetch_repos_by_subcommand")
+    def test_resume_syncs_the_rest_of_the_plan(self, mock_fetch, mock_clone, _mock):
+        synced = []
+
+        crash_at = ["github/c"]
+
+        def clone(repo, *args, **kwargs):
+            if repo.full_name in crash_at:
+                raise KeyboardInterrupt
+            synced.append(repo.full_name)
+            return RepoResult(repo.full_name, RepoStatus.CLONED)
+
+        mock_clone.side_effect = clone
+        mock_fetch.return_value = [_repo("a"), _repo("b"), _repo("c"), _repo("d")]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with self.assertRaises(KeyboardInterrupt):
+                sync_repositories(_args(temp_dir))
+            self.assertEqual(synced, ["github/a", "github/b"])
+
+            # The listing has changed since; the resumed run keeps to its plan.
+            mock_fetch.reset_mock()
+            mock_fetch.return_value = [_repo("b"), _repo("e")]
+            synced.clear()
+            crash_at.clear()
+            sync_repositories(_args(temp_dir, resume=True))
+
+            mock_fetch.assert_not_called()
+            self.assertEqual(synced, ["github/c", "github/d"])
+            self.assertFalse((Path(temp_dir) / JOURNAL_NAME).exists())
+
+    @patch("functions.process_repositories.clone_or_pull_repo")
+    @patch("functions.sync_repositories.prepare_object_pools", return_value={})
+    @patch("functions.sync_repositories.resolve_fork_networks", return_value={})
+    @patch("functions.sync_repositories.fetch_repos_by_subcommand")
+    def test_share_objects_only_for_new_clones(
+        self, mock_fetch, mock_resolve, mock_prepare, mock_clone, _mock_tokens
+    ):
+        mock_fetch.return_value = [_repo("a"), _repo("b")]
+        mock_clone.side_effect = lambda repo, *args, **kwargs: RepoResult(
+            repo.full_name, RepoStatus.PULLED
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "github" / "a").mkdir(parents=True)
+            sync_repositories(_args(temp_dir, share_objects=True))
+            self.assertEqual(mock_resolve.call_args.args[0], [_repo("b")])
+
+            (Path(temp_dir) / "github" / "b").mkdir()
+            mock_resolve.reset_mock()
+            sync_repositories(_args(temp_dir, share_objects=True))
+            mock_resolve.assert_not_called()
+            self.assertEqual(mock_prepare.call_count, 1)
+
+    @patch("functions.sync_repositories.fetch_repos_by_subcommand")
+    def test_dry_run_leaves_output_directory_untouched(self, mock_fetch, _mock):
+        mock_fetch.return_value = [_repo("a"), _repo("b")]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir) / "out"
+            sync_repositories(_args(str(output_dir), dry_run=True, no_state=False))
+            self.assertIsNone(mock_fetch.call_args.args[2])
+            self.assertFalse(output_dir.exists())
+
+            output_dir.mkdir()
+            sync_repositories(_args(str(output_dir), dry_run=True, no_state=False))
+            self.assertEqual(list(output_dir.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+from functions.github_client import GitHubClient
+from functions.rate_limiter import RateLimiter
+from functions.read_tokens import read_tokens
+from functions.token_pool import TokenPool
+
+TOKEN_A = "ghp_aaaaaaaaaaaa1111"
+TOKEN_B = "ghp_bbbbbbbbbbbb2222"
+
+
+class TestTokenPool(unittest.TestCase):
+    def setUp(self):
+        self.sleeps = []
+        self.pool = TokenPool(
+            [TOKEN_A, TOKEN_B],
+            make_rate_limiter=lambda: RateLimiter(
+                sleep=self.sleeps.append, clock=lambda: 1000.0
+            ),
+            clock=lambda: 1000.0,
+        )
+        # Token A has 2 requests left in this window, token B plenty.
+        self.remaining = {TOKEN_A: 2, TOKEN_B: 5000}
+        self.sent_with = []
+
+    def _fake_get(self, url, params, headers):
+        token = headers["Authorization"].removeprefix("Bearer ")
+        self.sent_with.append(token)
+        response = Mock(status_code=200, text="[]", content=b"[]")
+        if self.remaining[token] <= 0:
+            response.status_code = 403
+            response.text = '{"message": "API rate limit exceeded"}'
+        else:
+            self.remaining[token] -= 1
+        response.headers = {
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": str(self.remaining[token]),
+            "X-RateLimit-Reset": "4600",
+        }
+        return response
+
+    @patch("functions.github_client.requests.Session.get")
+    def test_requests_move_on_when_a_token_runs_out(self, mock_get):
+        mock_get.side_effect = self._fake_get
+        client = GitHubClient(None, token_pool=self.pool)
+        self.assertNotIn("Authorization", client.session.headers)
+
+        for page in range(6):
+            client.get("/orgs/github/repos", {"page": page})
+
+        # Token B has the larger budget once both have answered.
+        self.assertEqual(self.sent_with[:2], [TOKEN_A, TOKEN_B])
+        self.assertTrue(all(token == TOKEN_B for token in self.sent_with[2:]))
+        self.assertEqual(self.sleeps, [])
+        usage = {u.label: u for u in self.pool.usage()}
+        self.assertEqual(set(usage), {"...1111", "...2222"})
+        self.assertEqual(usage["...1111"].requests, 1)
+        self.assertEqual(usage["...2222"].requests, 5)
+        self.assertEqual(client.rate_limit.remaining, 1 + 4995)
+
+    @patch("functions.github_client.requests.Session.get")
+    def test_rate_limited_request_is_retried_with_another_token(self, mock_get):
+        self.remaining[TOKEN_A] = 0
+        mock_get.side_effect = self._fake_get
+        client = GitHubClient(None, token_pool=self.pool)
+
+        response = client.get("/orgs/github/repos", {"page": 1})
+
+        self.assertEqual(response.text, "[]")
+        self.assertEqual(self.sent_with, [TOKEN_A, TOKEN_B])
+        self.assertEqual(self.sleeps, [])
+        usage = {u.label: u for u in self.pool.usage()}
+        self.assertEqual(usage["...1111"].rate_limited, 1)
+
+    def test_read_tokens_from_environment_and_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            token_file = Path(temp_dir) / "tokens"
+            token_file.write_text(
+                f"# service accounts\n{TOKEN_B}\n\nghp_cccc3333  # ci\n",
+                encoding="utf-8",
+            )
+            env = {"GITHUB_TOKEN": TOKEN_A, "GITHUB_TOKENS": f"{TOKEN_A}, {TOKEN_B}"}
+            with patch.dict(os.environ, env):
+                tokens = read_tokens(str(token_file))
+        self.assertEqual(tokens, [TOKEN_A, TOKEN_B, "ghp_cccc3333"])
+
+
+if __name__ == "__main__":
+    unittest.main()
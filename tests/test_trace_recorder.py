@@ -0,0 +1,54 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from benchmarks.make_repos import make_bare_repos
+from functions.process_repositories import process_repositories
+from functions.trace_recorder import start_tracing, stop_tracing, trace_span
+from pytypes.repo_info import RepoInfo
+
+
+class TestTraceRecorder(unittest.TestCase):
+    def test_sync_spans_are_written_as_chrome_trace(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bare_repos = make_bare_repos(Path(temp_dir) / "remote", 3, commits=1)
+            repos = [
+                RepoInfo(
+                    full_name=f"{path.parent.name}/{path.stem}",
+                    clone_url=path.as_uri(),
+                    stargazers_count=0,
+                    owner_name=path.parent.name,
+                )
+                for path in bare_repos
+            ]
+            tracer = start_tracing()
+            try:
+                process_repositories(
+                    repos, Path(temp_dir) / "clones", dry_run=False, jobs=2
+                )
+            finally:
+                stop_tracing()
+            trace_path = Path(temp_dir) / "trace.json"
+            tracer.write(trace_path)
+            trace = json.loads(trace_path.read_text(encoding="utf-8"))
+
+        spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        names = [e["name"] for e in spans]
+        self.assertEqual(names.count("git clone"), 3)
+        self.assertEqual(names.count("queue wait"), 3)
+        self.assertIn("skip unchanged", names)
+        clone = next(e for e in spans if e["name"] == "git clone")
+        self.assertEqual(clone["cat"], "git")
+        self.assertEqual(clone["args"]["exit_code"], 0)
+        self.assertGreater(clone["dur"], 0)
+        thread_names = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+        self.assertTrue(thread_names)
+
+    def test_spans_are_no_ops_without_recorder(self):
+        with trace_span("fetch", "phase", page=1) as span_args:
+            span_args["status"] = 200
+        self.assertEqual(span_args, {"page": 1, "status": 200})
+
+
+if __name__ == "__main__":
+    unittest.main()